@@ -1,4 +1,12 @@
-"""Entry point for the Sample Dashboard (Streamlit + Vega Altair). Run from project root: python run.py"""
+"""Entry point for the Sample Dashboard (Streamlit + Vega Altair). Run from project root: python run.py
+
+``python run.py api [--port N]`` serves the same metrics as a local HTTP/JSON API instead;
+``python run.py loadtest [--sessions N]`` drives simulated sessions headlessly and reports
+rerun latency and memory.
+
+``python run.py --preload [--ready-file PATH]`` (or DASHBOARD_PRELOAD=1) parses the default
+workbook and warms every cache before the server starts listening; see src/serve.py.
+"""
 
 import os
 import subprocess
@@ -8,19 +16,22 @@ import sys
 def main() -> None:
     root = os.path.dirname(os.path.abspath(__file__))
     src_dir = os.path.join(root, "src")
-    app_path = os.path.join(src_dir, "app.py")
+    args = sys.argv[1:]
+    tool = args.pop(0) if args[:1] in (["api"], ["loadtest"]) else None
+    if tool is None and ("--preload" in args or os.environ.get("DASHBOARD_PRELOAD") == "1"):
+        tool = "serve"
+        args = [a for a in args if a != "--preload"]
+    app_path = os.path.join(src_dir, f"{tool}.py" if tool else "app.py")
     if not os.path.isfile(app_path):
         print(f"Error: app not found at {app_path}", file=sys.stderr)
         sys.exit(1)
     env = os.environ.copy()
     env["PYTHONPATH"] = src_dir + os.pathsep + env.get("PYTHONPATH", "")
-    sys.exit(
-        subprocess.run(
-            [sys.executable, "-m", "streamlit", "run", app_path, *sys.argv[1:]],
-            cwd=root,
-            env=env,
-        ).returncode
-    )
+    if tool:
+        command = [sys.executable, app_path, *args]
+    else:
+        command = [sys.executable, "-m", "streamlit", "run", app_path, *args]
+    sys.exit(subprocess.run(command, cwd=root, env=env).returncode)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,227 @@
+"""Local HTTP/JSON API serving the dashboard metrics without Streamlit.
+
+Endpoints:
+    GET  /health                       dataset fingerprint and row count
+    GET  /metrics                      available metric names
+    GET  /cache                        result cache and persistent store counters
+    GET  /query?keyword=PAL|Philippine Airlines&keyword=Cebu Pacific&metric=reach
+         [&start=YYYY-MM-DD&end=...&source=...&sentiment=...&unique_stories=1]
+    GET  /export?format=csv|parquet|xlsx[&start=...&end=...&source=...&sentiment=...]
+                                       filtered article rows as a file download
+    POST /query  {"keywords": [...], "metrics": [...], "filters": {...}}
+    POST /batch  {"queries": [{...}, ...]}
+
+Query responses carry an ETag and honour If-None-Match with 304 Not Modified.
+Exports restore the article text one chunk at a time, outside the service
+lock; CSV is streamed chunk by chunk, while Parquet and XLSX are spooled to a
+temporary file first since their writers need the finished layout. Unexpected
+errors are answered with a JSON 500.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import traceback
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+if _script_dir not in sys.path:
+    sys.path.insert(0, _script_dir)
+
+from modules.constants import API_HOST, API_PORT, DEFAULT_DATA_PATH, DEFAULT_SHEET_NAME
+from modules.export import EXPORT_FORMATS, export_to_file, iter_csv
+from modules.metrics_service import METRICS, MetricsService
+from modules.reader import open_result_store
+
+
+def _filters_from_params(params: dict[str, list[str]]) -> dict[str, Any]:
+    return {
+        "start": params.get("start", [None])[0],
+        "end": params.get("end", [None])[0],
+        "sources": params.get("source"),
+        "sentiments": params.get("sentiment"),
+        "unique_stories": params.get("unique_stories", ["0"])[0].lower() in ("1", "true", "yes"),
+    }
+
+
+def _query_from_params(params: dict[str, list[str]]) -> dict[str, Any]:
+    """Translate GET parameters into the JSON query form ("|" separates a term group)."""
+    return {
+        "keywords": [k.split("|") for k in params.get("keyword", [])],
+        "metrics": params.get("metric"),
+        "filters": _filters_from_params(params),
+    }
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    """Route API requests to the shared MetricsService."""
+
+    service: MetricsService
+    _responded = False
+
+    def do_GET(self) -> None:
+        self._handle(self._get)
+
+    def do_POST(self) -> None:
+        self._handle(self._post)
+
+    def send_response(self, code: int, message: str | None = None) -> None:
+        self._responded = True
+        super().send_response(code, message)
+
+    def _handle(self, route: Callable[[], None]) -> None:
+        """Run one request's route, answering a JSON 500 if it fails unexpectedly."""
+        self._responded = False
+        try:
+            route()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+        except Exception as e:
+            self.log_error("%s %s failed: %r", self.command, self.path, e)
+            traceback.print_exc()
+            if self._responded:
+                # Part of the response is already sent; all we can do is cut it short.
+                self.close_connection = True
+                return
+            self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"internal error: {e!s}")
+
+    def _get(self) -> None:
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            fingerprint = self.service.fingerprint()
+            rows = len(self.service.handler.full_dataframe)
+            self._send_json({"status": "ok", "fingerprint": fingerprint, "rows": rows})
+        elif url.path == "/metrics":
+            self._send_json({"metrics": list(METRICS)})
+        elif url.path == "/cache":
+            store = self.service.store
+            handler = self.service.handler
+            stats = {
+                **self.service.cache.stats(),
+                "store": store.stats() if store else None,
+                "memo": handler.memo.stats() if handler else None,
+            }
+            self._send_json(stats)
+        elif url.path == "/query":
+            self._answer([_query_from_params(parse_qs(url.query))], single=True)
+        elif url.path == "/export":
+            self._export(parse_qs(url.query))
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"unknown endpoint: {url.path}")
+
+    def _post(self) -> None:
+        url = urlsplit(self.path)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, f"invalid JSON body: {e!s}")
+            return
+        if not isinstance(body, dict):
+            self._send_error(HTTPStatus.BAD_REQUEST, "request body must be a JSON object")
+        elif url.path == "/query":
+            self._answer([body], single=True)
+        elif url.path == "/batch":
+            queries = body.get("queries") or []
+            if not isinstance(queries, list):
+                self._send_error(HTTPStatus.BAD_REQUEST, "queries must be a list of query objects")
+                return
+            self._answer(queries, single=False)
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, f"unknown endpoint: {url.path}")
+
+    def _answer(self, queries: list[dict[str, Any]], single: bool) -> None:
+        try:
+            normalized = [self.service.normalize(q) for q in queries]
+        except (TypeError, ValueError) as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        etag = self.service.etag(normalized)
+        if etag in (t.strip() for t in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        results = self.service.batch(normalized)
+        self._send_json(results[0] if single else {"queries": results}, etag)
+
+    def _export(self, params: dict[str, list[str]]) -> None:
+        fmt = params.get("format", ["csv"])[0].lower()
+        if fmt not in EXPORT_FORMATS:
+            self._send_error(HTTPStatus.BAD_REQUEST, f"unknown export format: {fmt}")
+            return
+        try:
+            view = self.service.articles(_filters_from_params(params))
+            rows, restore = view.dataframe, view.with_text
+            spooled = None if fmt == "csv" else export_to_file(rows, fmt, restore=restore)
+        except ValueError as e:
+            self._send_error(HTTPStatus.BAD_REQUEST, str(e))
+            return
+        mime, ext = EXPORT_FORMATS[fmt]
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", mime)
+        self.send_header("Content-Disposition", f'attachment; filename="articles{ext}"')
+        if spooled is None:
+            # No Content-Length: the body ends when the connection closes.
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for part in iter_csv(rows, restore=restore):
+                self.wfile.write(part)
+            return
+        with spooled:
+            size = spooled.seek(0, os.SEEK_END)
+            spooled.seek(0)
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            shutil.copyfileobj(spooled, self.wfile)
+
+    def _send_json(self, payload: Any, etag: str | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        body = json.dumps({"error": message}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Serve the metrics API until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", default=DEFAULT_DATA_PATH, help="Excel dataset to serve")
+    parser.add_argument("--sheet", default=DEFAULT_SHEET_NAME)
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args(argv)
+
+    MetricsRequestHandler.service = MetricsService(
+        args.file, args.sheet, store=open_result_store()
+    )
+    MetricsRequestHandler.service.fingerprint()
+    server = ThreadingHTTPServer((args.host, args.port), MetricsRequestHandler)
+    print(f"Serving metrics for {args.file} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,55 +3,67 @@
 import json
 import os
 import sys
+import time
 
 # Ensure src is on path for Streamlit Cloud (repo root is cwd; script is src/app.py)
 _script_dir = os.path.dirname(os.path.abspath(__file__))
 if _script_dir not in sys.path:
     sys.path.insert(0, _script_dir)
 
-import pandas as pd
+from typing import Any
+
 import streamlit as st
 
 from modules.constants import (
-    DATE_FORMAT_READ,
+    APPROX_REFRESH_SECONDS,
+    APPROXIMATE_MODE_DEFAULT,
     DASHBOARD_CSS_PATH,
     DEFAULT_DATA_PATH,
     DEFAULT_SHEET_NAME,
     EXECUTIVE_SUMMARY_JSON_PATH,
     EXECUTIVE_SUMMARY_PATH,
+    MEMORY_TRACE_DEFAULT,
     REQUIRED_FIELDS_NOTE,
+    SENTIMENT_VALUES,
+    SHARED_DATASET_DIR,
     UPLOAD_FILE_TYPES,
+    WATCH_DATA_DIR,
 )
 from modules.display_components import (
+    TOP_TERMS_RANKINGS,
     display_airline_metrics,
     display_airlines_overview,
+    display_anomaly_alerts,
     display_brand_comparison,
+    display_brand_cooccurrence,
     display_daily_trendline,
+    display_download_menu,
+    display_estimated_totals,
+    display_media_type_breakdown,
+    display_memory_report,
     display_pie_to_pie_analysis,
     display_prominence_score_df,
     display_prominence_score_extra,
+    display_reach_ave_density,
+    display_reach_ave_distribution,
     display_sentiment_analysis,
+    display_share_of_voice,
     display_top_publications_authors,
+    display_top_terms,
+)
+from modules.deferred_sections import DeferredSections
+from modules.reader import (
+    BackgroundLoad,
+    Brand,
+    DatasetFilter,
+    ExcelFileHandler,
+    ProgressiveEstimate,
+    get_brands,
+    open_result_store,
 )
-from modules.reader import ExcelFileHandler, get_keywords
-
-
-def _build_keyword_vars() -> tuple[
-    str | None, str | None, str | None, str | None, str | None, str | None,
-    list[str], list[str], list[str], list[str],
-]:
-    kw = get_keywords()
-    k1 = kw[0] if len(kw) > 0 else None
-    k2 = kw[1] if len(kw) > 1 else None
-    k3 = kw[2] if len(kw) > 2 else None
-    k4 = kw[3] if len(kw) > 3 else None
-    k5 = kw[4] if len(kw) > 4 else None
-    k6 = kw[5] if len(kw) > 5 else None
-    overview = [k for k in [k1, k3, k4] if k]
-    combined = [k1, k2] if k1 and k2 else (([k1] if k1 else []) + ([k2] if k2 else []))
-    combined1 = [k3, k5] if k3 and k5 else (([k3] if k3 else []) + ([k5] if k5 else []))
-    combined2 = [k4, k6] if k4 and k6 else (([k4] if k4 else []) + ([k6] if k6 else []))
-    return k1, k2, k3, k4, k5, k6, overview, combined, combined1, combined2
+from modules.data_watcher import ActiveDataset, DatasetWatcher
+from modules.utils import DiskCache, MemoryTracer
+from modules.warm_start import preloaded_handler
 
 
 def _inject_dashboard_css() -> None:
@@ -72,18 +84,7 @@ def main() -> None:
     )
     _inject_dashboard_css()
     st.title("Sample Dashboard using Streamlit and Vega Altair")
-    (
-        kw1,
-        kw2,
-        kw3,
-        kw4,
-        kw5,
-        kw6,
-        overview_keywords,
-        combined_keywords,
-        combined_keywords1,
-        combined_keywords2,
-    ) = _build_keyword_vars()
+    brands = get_brands()
 
     with st.sidebar:
         st.header("Data Source")
@@ -93,9 +94,50 @@ def main() -> None:
             help=REQUIRED_FIELDS_NOTE,
         )
         st.caption("Use default data or upload your own dataset.")
+        watcher = _data_watcher()
+        active = watcher.active() if watcher is not None else None
+        if active is not None and uploaded_file is None:
+            st.caption(
+                f"Watched data: **{os.path.basename(active.path)}** (loaded "
+                f"{time.strftime('%b %d %H:%M', time.localtime(active.activated_at))})"
+            )
+        trace_memory = st.checkbox(
+            "Trace memory usage",
+            value=MEMORY_TRACE_DEFAULT,
+            help="Record peak and retained allocations per step (slows the page down).",
+        )
+        approximate = st.checkbox(
+            "Approximate mode",
+            value=APPROXIMATE_MODE_DEFAULT,
+            help=(
+                "Show brand totals estimated from samples first when the aggregate "
+                "cube cannot answer them; the full dashboard loads once they are exact."
+            ),
+        )
+    tracer = MemoryTracer(enabled=trace_memory)
+    if tracer.busy:
+        st.sidebar.caption("Memory tracing is in use by another session; this run is not traced.")
+    try:
+        _render_dashboard(uploaded_file, active, brands, approximate, tracer)
+    finally:
+        # Also after early returns, errors and st.rerun(), so tracing never outlives the run.
+        tracer.finish()
 
+
+def _render_dashboard(
+    uploaded_file: object | None,
+    active: ActiveDataset | None,
+    brands: list[Brand],
+    approximate: bool,
+    tracer: MemoryTracer,
+) -> None:
+    """Load the selected dataset and render the KPI row, tabs and memory report."""
     if uploaded_file is not None:
         data_source: str | object = uploaded_file
+    elif active is not None:
+        # The watcher has already parsed and indexed it; a newer version changes
+        # the load key, so the session switches on its next rerun.
+        data_source = active.path
     else:
         if not os.path.isfile(DEFAULT_DATA_PATH):
             st.error(f"Default data file not found: {DEFAULT_DATA_PATH}")
@@ -103,68 +145,199 @@ def main() -> None:
         data_source = DEFAULT_DATA_PATH
 
     try:
-        handler = ExcelFileHandler(data_source, DEFAULT_SHEET_NAME)
-        df = handler.open_excel_file()
+        with tracer.step("ExcelFileHandler.open_excel_file()"):
+            loaded = _load_dataset(data_source, active)
     except Exception as e:
+        st.session_state.pop("dataset_load", None)
         st.error(f"Error: {e!s}")
         return
+    # Sections get a view fixed to this run's filter; sections of the previous
+    # run that are still computing keep theirs.
+    view = loaded.filtered(_sidebar_filters(loaded))
+    handler = tracer.instrument(view)
+    df = view.dataframe
+    tracer.record_dataframe(df)
+    # Heavy sections run on a thread pool; the tracer's step stack is per-thread,
+    # so they are computed inline while tracing.
+    deferred = DeferredSections(enabled=not tracer.enabled)
 
     # Dashboard summary KPIs
     m1, m2, m3, m4 = st.columns(4)
     with m1:
         st.metric("Total articles", len(df))
     with m2:
-        date_col = "Date"
-        if date_col in df.columns:
-            try:
-                d = pd.to_datetime(df[date_col], format=DATE_FORMAT_READ, errors="coerce")
-                valid = d.dropna()
-                st.metric("Date range", f"{valid.min().strftime('%b %d')} – {valid.max().strftime('%b %d')}" if len(valid) else "—")
-            except Exception:
-                st.metric("Date range", "—")
-        else:
-            st.metric("Date range", "—")
+        bounds = view.date_range()
+        st.metric("Date range", f"{bounds[0].strftime('%b %d')} – {bounds[1].strftime('%b %d')}" if bounds else "—")
     with m3:
         st.metric("Keywords", df["Keywords"].nunique() if "Keywords" in df.columns else "—")
     with m4:
         st.metric("Sources", df["Source"].nunique() if "Source" in df.columns else "—")
     st.divider()
 
-    tab_overview, tab_pal, tab_cebu, tab_airasia = st.tabs([
-        "Overview",
-        "Philippine Airlines",
-        "Cebu Pacific",
-        "AirAsia",
-    ])
+    if df.empty:
+        st.info("No articles match the current filters.")
+        return
+    # The aggregate cube answers brand totals exactly and at once; sample
+    # estimates are only worth showing for a view without one.
+    if approximate and view.cube is None and not _approximate_totals(view, brands):
+        return
+
+    # One pass labels every row with its brands; tabs read their totals from it.
+    summary = tracer.call(handler.brand_summary, brands)
+    # Every brand's daily counts are scored for spikes together (Overview alerts,
+    # annotated trendlines).
+    daily_scores, trends = tracer.call(handler.brand_anomalies, brands)
+    tab_overview, *brand_tabs = st.tabs(["Overview", *[b.name for b in brands]])
 
     with tab_overview:
         st.header("Overview")
         display_general_overview(
-            handler,
-            df,
-            overview_keywords=overview_keywords,
-            brand_keywords=[kw1, kw3, kw4] if kw1 and kw3 and kw4 else overview_keywords[:3],
-            prominence_groups=[combined_keywords, combined_keywords1, combined_keywords2],
+            handler, df, brands, summary, (daily_scores, trends), tracer=tracer, deferred=deferred
         )
 
-    with tab_pal:
-        st.header("Philippine Airlines Analysis")
-        if kw1 and kw2:
-            display_pal_analysis(handler, kw1, kw2, "selected_keyword1_color")
+    for tab, brand, (_, totals) in zip(brand_tabs, brands, summary.iterrows()):
+        with tab:
+            st.header(f"{brand.name} Analysis")
+            scores = daily_scores[daily_scores["Brand"] == brand.name]
+            display_brand_analysis(handler, brand, totals, scores, tracer, deferred)
+
+    deferred.render_all()
+
+    if tracer.enabled:
+        tracer.finish()
+        st.divider()
+        display_memory_report(tracer, loaded.memo.stats())
+
+
+@st.cache_resource
+def _result_store() -> DiskCache | None:
+    """Return the persistent results store shared by every session of this process."""
+    return open_result_store()
+
+
+@st.cache_resource
+def _data_watcher() -> DatasetWatcher | None:
+    """Start the process-wide watcher of DASHBOARD_WATCH_DIR (None when unset)."""
+    if not WATCH_DATA_DIR:
+        return None
+    watcher = DatasetWatcher(WATCH_DATA_DIR, DEFAULT_SHEET_NAME)
+    watcher.start()
+    return watcher
+
+
+def _data_source_key(
+    data_source: str | object, active: ActiveDataset | None = None
+) -> tuple[Any, ...]:
+    """Identify a data source so a finished load can be reused across reruns.
+
+    A watched file is identified by the version the watcher activated, not by
+    its current mtime: a file overwritten in place is picked up when the watcher
+    has ingested it, not parsed again by every open session.
+    """
+    if active is not None and data_source == active.path:
+        return ("watched", active.path, active.mtime, active.activated_at)
+    if isinstance(data_source, str):
+        return ("path", data_source, os.path.getmtime(data_source))
+    return ("upload", getattr(data_source, "file_id", id(data_source)))
 
-    with tab_cebu:
-        st.header("Cebu Pacific Analysis")
-        if kw3 and kw5:
-            display_competitor_analysis(
-                handler, kw3, kw5, "selected_keyword3_color"
-            )
 
-    with tab_airasia:
-        st.header("AirAsia Analysis")
-        if kw4 and kw6:
-            display_competitor_analysis(
-                handler, kw4, kw6, "selected_keyword4_color"
+def _load_dataset(
+    data_source: str | object, active: ActiveDataset | None = None
+) -> ExcelFileHandler:
+    """Parse the dataset on a worker thread, showing progress; reuse it on reruns."""
+    key = _data_source_key(data_source, active)
+    cached = st.session_state.get("dataset_load")
+    if cached is None or cached[0] != key:
+        # With run.py --preload or a watched directory, the workbook is already
+        # loaded and indexed.
+        preloaded = None
+        if key[0] == "watched":
+            preloaded = preloaded_handler(data_source, DEFAULT_SHEET_NAME, active.mtime)
+        elif key[0] == "path":
+            preloaded = preloaded_handler(data_source, DEFAULT_SHEET_NAME, key[2])
+        handler = preloaded or ExcelFileHandler(
+            data_source, DEFAULT_SHEET_NAME, store=_result_store(), shared_dir=SHARED_DATASET_DIR
+        )
+        cached = (key, BackgroundLoad(handler))
+        st.session_state["dataset_load"] = cached
+    load = cached[1]
+    if not load.done():
+        bar = st.progress(0.0, text="Parsing workbook…")
+        while not load.done():
+            bar.progress(load.progress, text=f"Parsing workbook… {load.progress:.0%}")
+            time.sleep(0.1)
+        bar.empty()
+    load.result()
+    return load.handler
+
+
+def _approximate_totals(handler: ExcelFileHandler, brands: list[Brand]) -> bool:
+    """Render sample estimates of the brand totals until exact ones are ready.
+
+    Returns True once the estimates are exact (or failed), i.e. when the full
+    dashboard should render instead; the estimates refresh in a fragment, which
+    reruns the page when the last step finishes.
+    """
+    key = (id(handler), handler.filters, tuple(brands))
+    cached = st.session_state.get("approximate_totals")
+    if cached is None or cached[0] != key:
+        cached = (key, ProgressiveEstimate(handler, brands))
+        st.session_state["approximate_totals"] = cached
+    estimate = cached[1]
+    while estimate.latest is None and not estimate.done():
+        time.sleep(0.05)
+    if estimate.done():
+        return True
+
+    @st.fragment(run_every=APPROX_REFRESH_SECONDS)
+    def refresh() -> None:
+        if estimate.done():
+            st.rerun()
+        display_estimated_totals(*estimate.latest)
+
+    refresh()
+    st.caption("The full dashboard loads once the totals are exact.")
+    return False
+
+
+def _sidebar_filters(handler: ExcelFileHandler) -> DatasetFilter:
+    """Render the dashboard-wide filters in the sidebar and return the selection."""
+    index = handler.time_index
+    start = end = None
+    with st.sidebar:
+        st.header("Filters")
+        bounds = index.date_bounds()
+        if bounds:
+            picked = st.date_input(
+                "Date range",
+                value=bounds,
+                min_value=bounds[0],
+                max_value=bounds[1],
+                help="Applies to every section of the dashboard.",
             )
+            if isinstance(picked, (list, tuple)) and len(picked) == 2 and tuple(picked) != bounds:
+                start, end = picked
+        sources = st.multiselect(
+            "Sources", list(index.sources), help="Leave empty to include all sources."
+        )
+        sentiments = st.multiselect(
+            "Sentiment", list(SENTIMENT_VALUES), help="Leave empty to include all sentiments."
+        )
+        counting = st.radio(
+            "Count",
+            ["All placements", "Unique stories"],
+            help=(
+                "Unique stories counts each syndicated story once (its first placement); "
+                "copies are matched on near-identical Headline and Opening Text."
+            ),
+        )
+    return DatasetFilter(
+        start,
+        end,
+        tuple(sources) or None,
+        tuple(sentiments) or None,
+        unique_stories=counting == "Unique stories",
+    )
 
 
 def _load_executive_summary() -> str:
@@ -185,11 +358,15 @@ def _load_executive_summary() -> str:
 def display_general_overview(
     handler: ExcelFileHandler,
     df,
-    overview_keywords: list[str],
-    brand_keywords: list[str],
-    prominence_groups: list[list[str]],
+    brands: list[Brand],
+    summary: Any = None,
+    anomalies: tuple[Any, Any] | None = None,
+    tracer: MemoryTracer | None = None,
+    deferred: DeferredSections | None = None,
 ) -> None:
     """Render overview tab: display content from executive_summary.txt or executive_summary.json."""
+    tracer = tracer or MemoryTracer(enabled=False)
+    deferred = deferred or DeferredSections(enabled=False)
     st.subheader("Executive Summary")
     display_text = _load_executive_summary()
     if not display_text.strip():
@@ -211,38 +388,94 @@ def display_general_overview(
     )
     st.divider()
     st.subheader("Data Overview")
-    st.dataframe(df)
-    display_brand_comparison(handler, brand_keywords)
-    display_pie_to_pie_analysis(handler, overview_keywords)
-    display_airlines_overview(handler, overview_keywords)
-    display_prominence_score_extra(handler, prominence_groups)
-    display_prominence_score_df(handler, prominence_groups)
+    rows = df
+    if st.checkbox(
+        "Show article text",
+        key="overview_article_text",
+        help="Opening Text and Hit Sentence are only loaded when shown.",
+    ):
+        df = tracer.call(handler.with_text, df)
+    with tracer.step("st.dataframe(df)"):
+        st.dataframe(df)
+    # Downloads always carry the text columns, restored chunk by chunk.
+    display_download_menu(rows, "filtered articles", restore=handler.with_text)
+    overview_keywords = [b.keyword for b in brands]
+    prominence_groups = [b.terms for b in brands]
+    colors = [b.color for b in brands]
+    mentions = None if summary is None else summary["Mentions"].tolist()
+    tracer.call(display_brand_comparison, handler, overview_keywords, colors, mentions)
+    tracer.call(display_share_of_voice, handler, brands)
+    tracer.call(display_brand_cooccurrence, handler, brands)
+    tracer.call(display_anomaly_alerts, *(anomalies or handler.brand_anomalies(brands)), colors)
+    tracer.call(display_media_type_breakdown, handler, prominence_groups)
+    tracer.call(display_reach_ave_distribution, handler, prominence_groups, colors)
+    tracer.call(display_reach_ave_density, handler, prominence_groups, colors)
+    tracer.call(display_pie_to_pie_analysis, handler, overview_keywords, colors)
+    tracer.call(display_airlines_overview, handler, overview_keywords)
+    deferred.add(
+        "prominence summary",
+        lambda: handler.prominence_score_extra(prominence_groups[0], *prominence_groups[1:]),
+        lambda extra: tracer.call(
+            display_prominence_score_extra, handler, prominence_groups, extra, colors
+        ),
+    )
+    deferred.add(
+        "article-level prominence",
+        lambda: handler.prominence_score(prominence_groups[0], *prominence_groups[1:]),
+        lambda scores: tracer.call(
+            display_prominence_score_df, handler, prominence_groups, scores
+        ),
+    )
 
 
-def display_pal_analysis(
+def display_brand_analysis(
     handler: ExcelFileHandler,
-    keyword: str,
-    secondary_keyword: str,
-    color_key: str,
+    brand: Brand,
+    totals: Any = None,
+    scores: Any = None,
+    tracer: MemoryTracer | None = None,
+    deferred: DeferredSections | None = None,
 ) -> None:
-    """Render Philippine Airlines metrics, sentiment, trendline, and top publications/authors."""
-    display_airline_metrics(handler, keyword, secondary_keyword)
-    display_sentiment_analysis(handler, keyword)
-    display_daily_trendline(handler, keyword, color_key)
-    display_top_publications_authors(handler, keyword, color_key)
+    """Render one brand's metrics, sentiment, trendline, and top publications/authors.
 
+    scores are the brand's rows of ``brand_anomalies`` (queried if None); the
+    trendline plots their counts, so its line and spike markers agree.
+    """
+    tracer = tracer or MemoryTracer(enabled=False)
+    deferred = deferred or DeferredSections(enabled=False)
+    keyword = brand.keyword
+    counts = None if totals is None else {s: int(totals[s]) for s in SENTIMENT_VALUES}
+    tracer.call(display_airline_metrics, handler, keyword, *brand.aliases, totals=totals)
+    tracer.call(display_sentiment_analysis, handler, keyword, counts)
 
-def display_competitor_analysis(
-    handler: ExcelFileHandler,
-    keyword: str,
-    secondary_keyword: str,
-    color_key: str,
-) -> None:
-    """Render competitor airline metrics, sentiment, trendline, and top publications/authors."""
-    display_airline_metrics(handler, keyword, secondary_keyword)
-    display_sentiment_analysis(handler, keyword)
-    display_daily_trendline(handler, keyword, color_key)
-    display_top_publications_authors(handler, keyword, color_key)
+    def trendline() -> tuple[Any, Any]:
+        days = scores if scores is not None else handler.brand_anomalies([brand])[0]
+        # Days with articles, ordered as count_daily_trendline orders them.
+        daily = days.loc[days["Count"] > 0, ["Date", "Count"]].sort_values("Date")
+        return daily.reset_index(drop=True), days[days["Spike"]]
+
+    deferred.add(
+        f"{keyword} trendline",
+        trendline,
+        lambda result: tracer.call(
+            display_daily_trendline, handler, keyword, brand.color, *result
+        ),
+    )
+    deferred.add(
+        f"{keyword} top publications and authors",
+        lambda: (handler.get_top_publications(keyword), handler.get_top_authors(keyword)),
+        lambda tops: tracer.call(
+            display_top_publications_authors, handler, keyword, brand.color, *tops
+        ),
+    )
+    deferred.add(
+        f"{keyword} top terms",
+        lambda: {
+            by: handler.top_terms(keyword, *brand.aliases, by=by)
+            for by in TOP_TERMS_RANKINGS.values()
+        },
+        lambda ranked: tracer.call(display_top_terms, handler, brand, ranked),
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,313 @@
+"""Headless load test: N simulated dashboard sessions driven through Streamlit's AppTest.
+
+Every session runs in its own process with its own copy of the app (AppTest
+keeps process-global runtime state, so sessions cannot share a process) and
+repeats a scripted visit: initial load, upload of a workbook, a sidebar filter
+change, and time window and smoothing changes on every trendline. A barrier
+keeps the sessions' visits in step, so each iteration runs them concurrently.
+Tabs render on every rerun and switch in the browser, so visiting them is
+checked but not timed. The report merges the sessions' own reports: rerun
+latency percentiles, throughput and resident memory summed over the session
+processes (sampled from /proc, so RSS figures need Linux).
+
+    python run.py loadtest --sessions 8 --iterations 5 [--upload data.xlsx] [--json out.json]
+"""
+
+import argparse
+import json
+import os
+import queue
+import resource
+import sys
+import threading
+import time
+from multiprocessing import get_context
+from typing import Any, Callable
+
+import numpy as np
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+if _script_dir not in sys.path:
+    sys.path.insert(0, _script_dir)
+
+from streamlit.testing.v1 import AppTest
+
+from modules.constants import DEFAULT_DATA_PATH
+
+APP_PATH = os.path.join(_script_dir, "app.py")
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def rss_bytes() -> int:
+    """Return this process's resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RssSampler(threading.Thread):
+    """Sample RSS on a fixed interval until stopped; keeps every sample."""
+
+    def __init__(self, interval: float = 0.2) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples: list[int] = [rss_bytes()]
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.samples.append(rss_bytes())
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+        self.samples.append(rss_bytes())
+
+
+class Session:
+    """One simulated analyst: an AppTest instance plus its timed reruns."""
+
+    def __init__(self, index: int, upload: tuple[str, bytes] | None, timeout: float) -> None:
+        self.index = index
+        self.upload = upload
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.latencies: list[tuple[str, float]] = []
+        self.errors: list[str] = []
+        self.tab_visits = 0
+
+    def _rerun(self, step: str, interact: Callable[[AppTest], Any] | None = None) -> None:
+        start = time.perf_counter()
+        try:
+            if interact is not None:
+                interact(self.app)
+            self.app.run()
+        except Exception as e:  # a failed rerun is reported, not fatal to the run
+            self.errors.append(f"{step}: {e!s}")
+            return
+        finally:
+            self.latencies.append((step, time.perf_counter() - start))
+        self.errors.extend(f"{step}: {e.value}" for e in self.app.exception)
+        self.errors.extend(f"{step}: {e.value}" for e in self.app.error)
+
+    def _widgets(self, kind: str, prefix: str) -> list[Any]:
+        return [w for w in getattr(self.app, kind) if (w.key or "").startswith(prefix)]
+
+    def visit(self, iteration: int) -> None:
+        """Run one scripted visit; option choices rotate with the iteration."""
+        if iteration == 0:
+            self._rerun("load")
+            if self.upload is not None:
+                name, content = self.upload
+                self._rerun(
+                    "upload",
+                    lambda at: at.sidebar.file_uploader[0].set_value((name, content, XLSX_MIME)),
+                )
+        labels = [w.label for w in self.app.sidebar.multiselect]
+        if "Sentiment" in labels:
+            i, choice = labels.index("Sentiment"), ["Positive", "Negative"][: iteration % 3]
+            self._rerun("filter", lambda at: at.sidebar.multiselect[i].set_value(choice))
+        for tab in self.app.tabs:
+            self.tab_visits += bool(tab.children)
+        for widget in self._widgets("selectbox", "trendline_window_"):
+            option = (iteration + 1) % len(widget.options)
+            self._rerun(
+                "trendline window",
+                lambda at, k=widget.key, o=option: at.selectbox(key=k).set_value(o),
+            )
+        for widget in self._widgets("selectbox", "trendline_smooth_"):
+            option = widget.options[(iteration + 1) % len(widget.options)]
+            self._rerun(
+                "smoothing", lambda at, k=widget.key, o=option: at.selectbox(key=k).set_value(o)
+            )
+
+
+def _run_session(
+    index: int,
+    upload: tuple[str, bytes] | None,
+    timeout: float,
+    iterations: int,
+    barrier: Any,
+    reports: Any,
+) -> None:
+    """Process entry point: run one session's visits in step with the others and report."""
+    sampler = RssSampler()
+    sampler.start()
+    rss_per_iteration = []
+    session = None
+    errors = []
+    try:
+        session = Session(index, upload, timeout)
+        for iteration in range(iterations):
+            barrier.wait()
+            session.visit(iteration)
+            rss_per_iteration.append(rss_bytes())
+            barrier.wait()
+    except threading.BrokenBarrierError:
+        errors.append(f"session {index}: stopped after another session failed")
+    except Exception as e:  # reported with the results so far; the others stop too
+        errors.append(f"session {index}: {type(e).__name__}: {e!s}")
+        barrier.abort()
+    finally:
+        sampler.stop()
+        reports.put(
+            {
+                "index": index,
+                "latencies": session.latencies if session else [],
+                "errors": (session.errors if session else []) + errors,
+                "tab_visits": session.tab_visits if session else 0,
+                "rss": {"samples": sampler.samples, "per_iteration": rss_per_iteration},
+            }
+        )
+
+
+def run_load_test(
+    sessions: int,
+    iterations: int,
+    upload_path: str | None = None,
+    timeout: float = 300.0,
+) -> dict[str, Any]:
+    """Drive the sessions concurrently, one process each, and return the merged report."""
+    upload = None
+    if upload_path:
+        with open(upload_path, "rb") as f:
+            upload = (os.path.basename(upload_path), f.read())
+    # spawn: a fresh interpreter per session, as AppTest needs, on every platform.
+    ctx = get_context("spawn")
+    # The parent joins the barrier too, so elapsed time excludes process start-up.
+    barrier = ctx.Barrier(sessions + 1)
+    reports = ctx.Queue()
+    processes = [
+        ctx.Process(
+            target=_run_session, args=(i, upload, timeout, iterations, barrier, reports)
+        )
+        for i in range(sessions)
+    ]
+    for p in processes:
+        p.start()
+    started = time.perf_counter()
+    try:
+        for iteration in range(iterations):
+            barrier.wait()
+            if iteration == 0:
+                started = time.perf_counter()
+            barrier.wait()
+    except threading.BrokenBarrierError:
+        pass  # a session failed; its report says why
+    elapsed = time.perf_counter() - started
+
+    pool: list[dict[str, Any]] = []
+    while len(pool) < sessions:
+        try:
+            pool.append(reports.get(timeout=1.0))
+        except queue.Empty:
+            if all(not p.is_alive() for p in processes):
+                break
+    for p in processes:
+        p.join()
+    reported = {r["index"] for r in pool}
+    lost = [
+        f"session {i}: exited with code {p.exitcode} without a report"
+        for i, p in enumerate(processes)
+        if i not in reported
+    ]
+    pool.sort(key=lambda r: r["index"])
+
+    latencies = [seconds for s in pool for _, seconds in s["latencies"]]
+    by_step: dict[str, list[float]] = {}
+    for s in pool:
+        for step, seconds in s["latencies"]:
+            by_step.setdefault(step, []).append(seconds)
+
+    def percentiles(values: list[float]) -> dict[str, float]:
+        if not values:
+            return {}
+        p50, p95, p99 = np.percentile(values, [50, 95, 99]).tolist()
+        return {"p50": p50, "p95": p95, "p99": p99, "max": max(values)}
+
+    mib = 1 << 20
+    rss = [s["rss"] for s in pool]
+    # Totals over the session processes; peaks are summed, an upper bound.
+    rss_per_iteration = [
+        sum(r["per_iteration"][i] for r in rss)
+        for i in range(min((len(r["per_iteration"]) for r in rss), default=0))
+    ]
+    # Growth between the end of the first and the last iteration (the first
+    # includes loading and warming caches); a steady climb suggests a leak.
+    growth = rss_per_iteration[-1] - rss_per_iteration[0] if rss_per_iteration else 0
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "reruns": len(latencies),
+        "errors": [e for s in pool for e in s["errors"]] + lost,
+        "tab_visits": sum(s["tab_visits"] for s in pool),
+        "elapsed_s": elapsed,
+        "throughput_reruns_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_s": percentiles(latencies),
+        "latency_by_step_s": {step: percentiles(v) for step, v in by_step.items()},
+        "rss_mib": {
+            "start": sum(r["samples"][0] for r in rss) / mib,
+            "peak": sum(max(r["samples"]) for r in rss) / mib,
+            "end": sum(r["samples"][-1] for r in rss) / mib,
+            "per_session_peak": [max(r["samples"]) / mib for r in rss],
+            "per_iteration": [r / mib for r in rss_per_iteration],
+            "growth_after_first_iteration": growth / mib,
+        },
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    """Print the report as a short text summary."""
+
+    def row(label: str, stats: dict[str, float]) -> str:
+        if not stats:
+            return f"  {label:<18} -"
+        return f"  {label:<18} " + "  ".join(f"{k} {v * 1000:8.1f} ms" for k, v in stats.items())
+
+    rss = report["rss_mib"]
+    print(
+        f"{report['sessions']} sessions × {report['iterations']} iterations: "
+        f"{report['reruns']} reruns in {report['elapsed_s']:.1f} s "
+        f"({report['throughput_reruns_per_s']:.2f} reruns/s), {len(report['errors'])} errors"
+    )
+    print("Rerun latency")
+    print(row("all", report["latency_s"]))
+    for step, stats in report["latency_by_step_s"].items():
+        print(row(step, stats))
+    print(
+        f"RSS (MiB): start {rss['start']:.0f}, peak {rss['peak']:.0f}, end {rss['end']:.0f}; "
+        f"growth after first iteration {rss['growth_after_first_iteration']:+.1f}"
+    )
+    print("  per iteration: " + ", ".join(f"{r:.0f}" for r in rss["per_iteration"]))
+    for error in report["errors"][:10]:
+        print(f"  error: {error}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the load test from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="scripted visits per session")
+    parser.add_argument(
+        "--upload",
+        default=DEFAULT_DATA_PATH,
+        help="workbook each session uploads ('' to stay on the default dataset)",
+    )
+    parser.add_argument("--timeout", type=float, default=300.0, help="seconds per rerun")
+    parser.add_argument("--json", help="also write the full report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_load_test(args.sessions, args.iterations, args.upload or None, args.timeout)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    sys.exit(1 if report["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,14 +6,46 @@ import matplotlib.pyplot as plt
 from matplotlib.patches import ConnectionPatch
 
 import altair as alt
+import numpy as np
 import pandas as pd
 
 from .constants import (
     COLOR_MAPPING,
-    PIE_AIRLINE_COLORS,
+    MEDIA_TYPE_COLORS,
     PIE_SENTIMENT_COLORS,
     PIE_SENTIMENT_COLORS_MATPLOTLIB,
+    SERVER_SIDE_TRANSFORMS,
 )
+from .utils.helpers import brand_palette, format_number
+
+
+# Name of the point selection on Reach vs AVE heatmap cells (read back by the UI).
+REACH_AVE_SELECTION = "reach_ave_cell"
+
+
+def _chart_data(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Project a chart dataset to its encoded columns so nothing else is shipped."""
+    if not SERVER_SIDE_TRANSFORMS:
+        return df
+    return df[[c for c in columns if c in df.columns]]
+
+
+def _resolve_color(color_key: str) -> str:
+    """Return the color for a COLOR_MAPPING key, or the key itself if it is a hex color."""
+    if color_key in COLOR_MAPPING:
+        return COLOR_MAPPING[color_key]
+    return color_key if color_key.startswith("#") else "#001F60"
+
+
+def _stack_segments(
+    df: pd.DataFrame, group: str, series: str, order: list[str], value: str
+) -> pd.DataFrame:
+    """Add Start/End columns stacking value within each group, series in the given order."""
+    rank = {name: i for i, name in enumerate(order)}
+    out = df.assign(_order=df[series].map(rank)).sort_values([group, "_order"], kind="stable")
+    out["End"] = out.groupby(group)[value].cumsum()
+    out["Start"] = out["End"] - out[value]
+    return out.drop(columns="_order")
 
 
 class ChartCreator:
@@ -26,7 +58,7 @@ class ChartCreator:
         colors: list[str] | None = None,
     ) -> alt.Chart:
         """Build an Altair pie chart for airline mention counts."""
-        colors = colors or PIE_AIRLINE_COLORS[: len(labels)]
+        colors = colors or brand_palette(len(labels))
         df = pd.DataFrame({"category": labels, "value": sizes})
         return (
             alt.Chart(df)
@@ -73,30 +105,36 @@ class ChartCreator:
         airlines_data: list[int | float],
         sentiment_data: list[int | float],
         airline_labels: list[str],
+        airline_colors: list[str] | None = None,
     ) -> plt.Figure:
-        """Build a Matplotlib figure with airline and sentiment pie charts side by side."""
+        """Build a Matplotlib figure with airline and sentiment pie charts side by side.
+
+        sentiment_data holds the airline values followed by the Positive, Neutral
+        and Negative counts (the summary table's Value column).
+        """
         fig = plt.figure(figsize=(12, 6))
         ax1 = fig.add_subplot(121)
         ax2 = fig.add_subplot(122)
         fig.subplots_adjust(wspace=0)
         sentiment_labels = ["Positive", "Neutral", "Negative"]
-        airline_colors = PIE_AIRLINE_COLORS[: len(airline_labels)]
+        n = len(airline_labels)
+        airline_colors = airline_colors or brand_palette(n)
         sentiment_colors = PIE_SENTIMENT_COLORS_MATPLOTLIB
-        total_air = sum(airlines_data[:3]) or 1
+        total_air = sum(airlines_data[:n]) or 1
         angle = -180 * airlines_data[0] / total_air
 
         wedges1, _, _ = ax1.pie(
-            airlines_data[:3],
+            airlines_data[:n],
             labels=airline_labels,
             colors=airline_colors,
             autopct="%1.1f%%",
             startangle=angle,
             pctdistance=0.85,
-            explode=[0, 0, 0],
+            explode=[0] * n,
             textprops={"color": "black", "size": 8},
         )
         wedges2, _, _ = ax2.pie(
-            sentiment_data[3:6],
+            sentiment_data[n : n + 3],
             labels=sentiment_labels,
             colors=sentiment_colors,
             autopct="%1.1f%%",
@@ -133,16 +171,21 @@ class ChartCreator:
         color_key: str,
         smoothed_series: pd.Series | None = None,
         trend_series: pd.Series | None = None,
+        spikes: pd.DataFrame | None = None,
     ) -> alt.Chart:
-        """Build an Altair line chart for daily counts with optional smoothing and trend line."""
-        color = COLOR_MAPPING.get(color_key, "#001F60")
+        """Build an Altair line chart for daily counts with optional smoothing and trend line.
+
+        spikes (Date, Baseline, Score) marks flagged days that appear in daily_counts.
+        """
+        color = _resolve_color(color_key)
         df = daily_counts.copy()
         if smoothed_series is not None:
             df = df.assign(Smoothed=smoothed_series.values)
         if trend_series is not None:
             df = df.assign(Trend=trend_series.values)
 
-        top_3 = df.nlargest(3, "Count")
+        df = _chart_data(df, ["Date", "Count", "Smoothed", "Trend"])
+        top_3 = df.nlargest(3, "Count")[["Date", "Count"]]
         base = alt.Chart(df).encode(
             x=alt.X("Date:N", axis=alt.Axis(labelAngle=45, title=None)),
             y=alt.Y("Count:Q", axis=alt.Axis(title="Article count")),
@@ -173,6 +216,34 @@ class ChartCreator:
                 color="#f59e0b", strokeWidth=2.5, strokeDash=[4, 2]
             )
 
+        if spikes is not None and not spikes.empty:
+            flagged = df[["Date", "Count"]].merge(
+                _chart_data(spikes, ["Date", "Baseline", "Score"]), on="Date"
+            )
+            spike_base = alt.Chart(flagged).encode(
+                x=alt.X("Date:N"),
+                y=alt.Y("Count:Q"),
+                tooltip=[
+                    alt.Tooltip("Date:N"),
+                    alt.Tooltip("Count:Q"),
+                    alt.Tooltip("Baseline:Q", format=".1f"),
+                    alt.Tooltip("Score:Q", format=".1f"),
+                ],
+            )
+            layer = (
+                layer
+                + spike_base.mark_point(color="#dc2626", size=260, strokeWidth=2.5)
+                + spike_base.mark_text(
+                    align="right",
+                    baseline="bottom",
+                    dx=-6,
+                    dy=-10,
+                    fontSize=11,
+                    fontWeight="bold",
+                    color="#dc2626",
+                ).encode(text=alt.value("Spike"))
+            )
+
         if "Trend" in df.columns:
             trend_base = alt.Chart(df).encode(
                 x=alt.X("Date:N"),
@@ -191,12 +262,127 @@ class ChartCreator:
             .interactive()
         )
 
+    @staticmethod
+    def create_alerts_chart(daily: pd.DataFrame, colors: list[str] | None = None) -> alt.Chart:
+        """Build a multi-brand daily count line chart with flagged spikes circled.
+
+        daily is ``brand_anomalies`` output (Date, Brand, Count, Baseline, Score, Spike).
+        """
+        df = _chart_data(daily, ["Date", "Brand", "Count", "Baseline", "Score", "Spike"])
+        names = list(dict.fromkeys(df["Brand"]))
+        palette = colors if colors and len(colors) == len(names) else brand_palette(len(names))
+        color = alt.Color(
+            "Brand:N", scale=alt.Scale(domain=names, range=palette), legend=alt.Legend(title=None)
+        )
+        base = alt.Chart(df).encode(
+            x=alt.X("Date:N", sort=None, axis=alt.Axis(labelAngle=45, title=None)),
+            y=alt.Y("Count:Q", axis=alt.Axis(title="Article count")),
+            color=color,
+        )
+        spikes = base.transform_filter(alt.datum.Spike).mark_point(size=220, strokeWidth=2.5)
+        return (
+            (
+                base.mark_line(strokeWidth=2)
+                + spikes.encode(
+                    tooltip=[
+                        alt.Tooltip("Brand:N"),
+                        alt.Tooltip("Date:N"),
+                        alt.Tooltip("Count:Q"),
+                        alt.Tooltip("Baseline:Q", format=".1f"),
+                        alt.Tooltip("Score:Q", format=".1f"),
+                    ]
+                )
+            )
+            .properties(width=700, height=320)
+            .configure_axis(grid=True, gridColor="#EAEAEA")
+            .configure_view(strokeWidth=0)
+            .configure_legend(orient="bottom")
+        )
+
+    @staticmethod
+    def create_share_of_voice_area_chart(
+        daily: pd.DataFrame, colors: list[str] | None = None
+    ) -> alt.Chart:
+        """Build a 100% stacked area chart of each brand's daily share of voice.
+
+        daily is the second ``share_of_voice`` frame (Date, Brand, Value, Share).
+        """
+        df = _chart_data(daily, ["Date", "Brand", "Value", "Share"])
+        names = list(dict.fromkeys(df["Brand"]))
+        dates = list(dict.fromkeys(df["Date"]))
+        palette = colors if colors and len(colors) == len(names) else brand_palette(len(names))
+        color = alt.Color(
+            "Brand:N", scale=alt.Scale(domain=names, range=palette), legend=alt.Legend(title=None)
+        )
+        x = alt.X("Date:N", sort=dates, axis=alt.Axis(labelAngle=45, title=None))
+        tooltip = [
+            alt.Tooltip("Brand:N"),
+            alt.Tooltip("Date:N"),
+            alt.Tooltip("Value:Q", format=",.2f"),
+            alt.Tooltip("Share:Q", format=".1%"),
+        ]
+        if not SERVER_SIDE_TRANSFORMS:
+            chart = alt.Chart(df).mark_area().encode(
+                x=x,
+                y=alt.Y("Share:Q", stack="normalize", axis=alt.Axis(format="%", title=None)),
+                color=color,
+                order=alt.Order("Brand", sort="descending"),
+                tooltip=tooltip,
+            )
+        else:
+            # Stack on the server: each band carries its own [Start, End) span per day.
+            df = _stack_segments(df, "Date", "Brand", names, "Share")
+            chart = alt.Chart(df).mark_area().encode(
+                x=x,
+                y=alt.Y(
+                    "Start:Q",
+                    scale=alt.Scale(domain=[0, 1]),
+                    axis=alt.Axis(format="%", title=None),
+                ),
+                y2="End:Q",
+                color=color,
+                tooltip=tooltip,
+            )
+        return (
+            chart.properties(width=700, height=320)
+            .configure_axis(grid=True, gridColor="#EAEAEA")
+            .configure_view(strokeWidth=0)
+            .configure_legend(orient="bottom")
+        )
+
+    @staticmethod
+    def create_share_of_voice_pie_chart(
+        totals: pd.DataFrame, colors: list[str] | None = None
+    ) -> alt.Chart:
+        """Build a pie chart of each brand's share of the weighted total."""
+        df = _chart_data(totals, ["Brand", "Value", "Share"])
+        names = df["Brand"].tolist()
+        palette = colors if colors and len(colors) == len(names) else brand_palette(len(names))
+        return (
+            alt.Chart(df)
+            .mark_arc()
+            .encode(
+                theta=alt.Theta("Value:Q"),
+                color=alt.Color(
+                    "Brand:N",
+                    scale=alt.Scale(domain=names, range=palette),
+                    legend=alt.Legend(title=None, orient="bottom"),
+                ),
+                tooltip=[
+                    alt.Tooltip("Brand:N"),
+                    alt.Tooltip("Value:Q", format=",.2f"),
+                    alt.Tooltip("Share:Q", format=".1%"),
+                ],
+            )
+            .properties(width=320, height=320)
+        )
+
     @staticmethod
     def create_publications_horizontal_bar(df: pd.DataFrame, color_key: str) -> alt.Chart:
         """Build a horizontal bar chart for publication/source volume."""
-        color = COLOR_MAPPING.get(color_key, "#001F60")
+        color = _resolve_color(color_key)
         return (
-            alt.Chart(df)
+            alt.Chart(_chart_data(df, ["Source", "Volume"]))
             .mark_bar()
             .encode(
                 y=alt.Y("Source:N", sort="-x", title=None),
@@ -211,9 +397,9 @@ class ChartCreator:
     @staticmethod
     def create_get_top_authors(df: pd.DataFrame, color_key: str) -> alt.Chart:
         """Build a horizontal bar chart for top authors/influencers."""
-        color = COLOR_MAPPING.get(color_key, "#001F60")
+        color = _resolve_color(color_key)
         return (
-            alt.Chart(df)
+            alt.Chart(_chart_data(df, ["Influencer", "Volume"]))
             .mark_bar()
             .encode(
                 y=alt.Y("Influencer:N", sort="-x", title=None),
@@ -225,62 +411,297 @@ class ChartCreator:
             .configure_axis(labelFontSize=12, titleFontSize=14)
         )
 
+    @staticmethod
+    def create_top_terms_chart(
+        df: pd.DataFrame, color_key: str, value: str = "Articles"
+    ) -> alt.Chart:
+        """Build a horizontal bar chart of top terms by value (Articles or Lift)."""
+        color = _resolve_color(color_key)
+        return (
+            alt.Chart(_chart_data(df, ["Term", "Articles", "Mentions", "Share", "Lift"]))
+            .mark_bar()
+            .encode(
+                y=alt.Y("Term:N", sort="-x", title=None),
+                x=alt.X(f"{value}:Q", title=value),
+                color=alt.value(color),
+                tooltip=[
+                    "Term",
+                    "Articles",
+                    "Mentions",
+                    alt.Tooltip("Share:Q", format=".1%"),
+                    alt.Tooltip("Lift:Q", format=".2f"),
+                ],
+            )
+            .properties(width=600, height=400)
+            .configure_axis(labelFontSize=12, titleFontSize=14)
+        )
+
     @staticmethod
     def create_airlines_sentiment_overview(
         df: pd.DataFrame,
         keyword_order: list[str] | None = None,
     ) -> alt.Chart:
         """Build a 100% stacked bar chart of sentiment per keyword."""
+        sentiment_order = ["Positive", "Neutral", "Negative"]
         melted = df.melt(
             id_vars=["Keyword"],
-            value_vars=["Positive", "Neutral", "Negative"],
+            value_vars=sentiment_order,
             var_name="Sentiment",
             value_name="Count",
         )
         melted["Count"] = pd.to_numeric(melted["Count"])
-        melted["Percentage"] = melted.groupby("Keyword")["Count"].transform(
-            lambda x: x / x.sum() * 100
-        )
+        totals = melted.groupby("Keyword")["Count"].transform("sum")
+        melted["Percentage"] = (melted["Count"] / totals.where(totals > 0) * 100).fillna(0.0)
         keyword_order = keyword_order or list(melted["Keyword"].unique())
-        sentiment_order = ["Positive", "Neutral", "Negative"]
+        color = alt.Color(
+            "Sentiment:N",
+            scale=alt.Scale(
+                domain=sentiment_order,
+                range=PIE_SENTIMENT_COLORS,
+            ),
+        )
+        tooltip = [
+            alt.Tooltip("Keyword:N"),
+            alt.Tooltip("Sentiment:N"),
+            alt.Tooltip("Percentage:Q", format=".1f", title="Percentage"),
+            alt.Tooltip("Count:Q", title="Number of Articles"),
+        ]
+        y = alt.Y("Keyword:N", title=None, sort=keyword_order)
+        if not SERVER_SIDE_TRANSFORMS:
+            return (
+                alt.Chart(melted)
+                .mark_bar()
+                .encode(
+                    y=y,
+                    x=alt.X(
+                        "Percentage:Q",
+                        title=None,
+                        stack="normalize",
+                        axis=alt.Axis(format="%"),
+                    ),
+                    color=color,
+                    order=alt.Order("Sentiment", sort="descending"),
+                    tooltip=tooltip,
+                )
+                .properties(width=1000, height=400)
+            )
+
+        # Stack on the server: each bar segment carries its own [Start, End) span.
+        melted["Fraction"] = melted["Percentage"] / 100
+        melted = _stack_segments(melted, "Keyword", "Sentiment", sentiment_order, "Fraction")
         return (
-            alt.Chart(melted)
+            alt.Chart(
+                melted[["Keyword", "Sentiment", "Count", "Percentage", "Start", "End"]]
+            )
             .mark_bar()
             .encode(
-                y=alt.Y("Keyword:N", title=None, sort=keyword_order),
+                y=y,
                 x=alt.X(
-                    "Percentage:Q",
+                    "Start:Q",
                     title=None,
-                    stack="normalize",
+                    scale=alt.Scale(domain=[0, 1]),
                     axis=alt.Axis(format="%"),
                 ),
+                x2="End:Q",
+                color=color,
+                tooltip=tooltip,
+            )
+            .properties(width=1000, height=400)
+        )
+
+    @staticmethod
+    def create_media_type_breakdown_chart(
+        df: pd.DataFrame,
+        keyword_order: list[str] | None = None,
+    ) -> alt.Chart:
+        """Build a stacked bar chart of article counts per media type for each keyword."""
+        media_order = list(dict.fromkeys([*MEDIA_TYPE_COLORS, *df["Media Type"].unique()]))
+        keyword_order = keyword_order or list(df["Keyword"].unique())
+        color = alt.Color(
+            "Media Type:N",
+            scale=alt.Scale(
+                domain=media_order,
+                range=[MEDIA_TYPE_COLORS.get(m, "#94a3b8") for m in media_order],
+            ),
+            legend=alt.Legend(title="Media type", orient="right"),
+        )
+        tooltip = [
+            alt.Tooltip("Keyword:N"),
+            alt.Tooltip("Media Type:N"),
+            alt.Tooltip("Count:Q", title="Number of Articles"),
+            alt.Tooltip("Reach:Q", format=",.0f"),
+            alt.Tooltip("AVE:Q", format=",.2f"),
+        ]
+        y = alt.Y("Keyword:N", title=None, sort=keyword_order)
+        if not SERVER_SIDE_TRANSFORMS:
+            return (
+                alt.Chart(df)
+                .mark_bar()
+                .encode(y=y, x=alt.X("Count:Q", title="Articles"), color=color, tooltip=tooltip)
+                .properties(width=1000, height=300)
+            )
+        stacked = _stack_segments(df, "Keyword", "Media Type", media_order, "Count")
+        return (
+            alt.Chart(
+                stacked[["Keyword", "Media Type", "Count", "Reach", "AVE", "Start", "End"]]
+            )
+            .mark_bar()
+            .encode(
+                y=y,
+                x=alt.X("Start:Q", title="Articles"),
+                x2="End:Q",
+                color=color,
+                tooltip=tooltip,
+            )
+            .properties(width=1000, height=300)
+        )
+
+    @staticmethod
+    def create_distribution_histogram(
+        df: pd.DataFrame,
+        measure: str,
+        colors: list[str] | None = None,
+    ) -> alt.Chart:
+        """Build a grouped bar histogram of pre-binned counts (log-spaced bins) per keyword."""
+        # A single-valued range comes as one [low, low] bin, labelled by its value.
+        labels = [
+            f"{format_number(start)}–{format_number(end)}" if end > start else format_number(start)
+            for start, end in zip(df["Bin Start"], df["Bin End"])
+        ]
+        df = df.assign(Bin=pd.Series(labels, index=df.index, dtype=object))
+        bin_order = list(dict.fromkeys(df["Bin"]))
+        keywords = list(dict.fromkeys(df["Keyword"]))
+        colors = colors or brand_palette(len(keywords))
+        return (
+            alt.Chart(_chart_data(df, ["Keyword", "Bin", "Count"]))
+            .mark_bar()
+            .encode(
+                x=alt.X(
+                    "Bin:O",
+                    sort=bin_order,
+                    title=f"{measure} (log-spaced bins)",
+                    axis=alt.Axis(labelAngle=45),
+                ),
+                xOffset=alt.XOffset("Keyword:N", sort=keywords),
+                y=alt.Y("Count:Q", title="Articles"),
                 color=alt.Color(
-                    "Sentiment:N",
-                    scale=alt.Scale(
-                        domain=sentiment_order,
-                        range=PIE_SENTIMENT_COLORS,
-                    ),
+                    "Keyword:N",
+                    scale=alt.Scale(domain=keywords, range=colors),
+                    legend=alt.Legend(title="Keywords", orient="bottom"),
                 ),
-                order=alt.Order("Sentiment", sort="descending"),
                 tooltip=[
                     alt.Tooltip("Keyword:N"),
-                    alt.Tooltip("Sentiment:N"),
-                    alt.Tooltip("Percentage:Q", format=".1f", title="Percentage"),
-                    alt.Tooltip("Count:Q", title="Number of Articles"),
+                    alt.Tooltip("Bin:O", title=measure),
+                    alt.Tooltip("Count:Q", title="Articles (approx.)"),
                 ],
             )
-            .properties(width=1000, height=400)
+            .properties(width=1000, height=320)
+        )
+
+    @staticmethod
+    def create_cooccurrence_heatmap(matrix: pd.DataFrame) -> alt.LayerChart:
+        """Build a brand × brand heatmap of co-mention counts (diagonal left out).
+
+        matrix is ``brand_cooccurrence`` output; the tooltip adds each count as
+        a share of the row brand's mentions.
+        """
+        names = list(matrix.columns)
+        totals = pd.Series(np.diag(matrix.to_numpy()), index=matrix.index)
+        long = matrix.rename_axis(index="Brand", columns="With").stack().rename("Count")
+        long = long.reset_index()
+        long = long[long["Brand"] != long["With"]]
+        long["Share"] = long["Count"] / long["Brand"].map(totals).where(lambda t: t > 0)
+        threshold = long["Count"].max() / 2 if len(long) else 0
+        base = alt.Chart(_chart_data(long, ["Brand", "With", "Count", "Share"])).encode(
+            x=alt.X("With:N", sort=names, scale=alt.Scale(domain=names), title="Also mentions"),
+            y=alt.Y("Brand:N", sort=names, scale=alt.Scale(domain=names), title=None),
+        )
+        cells = base.mark_rect().encode(
+            color=alt.Color(
+                "Count:Q",
+                scale=alt.Scale(scheme="blues"),
+                legend=alt.Legend(title="Articles"),
+            ),
+            tooltip=[
+                alt.Tooltip("Brand:N"),
+                alt.Tooltip("With:N", title="Also mentions"),
+                alt.Tooltip("Count:Q", title="Articles"),
+                alt.Tooltip("Share:Q", title="Share of brand's mentions", format=".1%"),
+            ],
+        )
+        labels = base.mark_text(baseline="middle").encode(
+            text=alt.Text("Count:Q"),
+            color=alt.condition(
+                alt.datum.Count > threshold, alt.value("white"), alt.value("black")
+            ),
+        )
+        size = max(40 * len(names), 160)
+        return (cells + labels).properties(width=size, height=size)
+
+    @staticmethod
+    def create_reach_ave_heatmap(df: pd.DataFrame, color: str | None = None) -> alt.Chart:
+        """Build a Reach × AVE heatmap from pre-binned cells of one keyword group.
+
+        Only non-empty cells are shipped; axis domains still list every bin. A
+        click selects a cell (REACH_AVE_SELECTION, fields Reach Bin / AVE Bin).
+        """
+
+        def labels(prefix: str) -> pd.Series:
+            return df[f"{prefix} Start"].map(format_number) + "–" + df[f"{prefix} End"].map(
+                format_number
+            )
+
+        df = df.assign(Reach=labels("Reach"), AVE=labels("AVE"))
+        reach_order = list(df.sort_values("Reach Bin")["Reach"].drop_duplicates())
+        ave_order = list(df.sort_values("AVE Bin", ascending=False)["AVE"].drop_duplicates())
+        shown = df[df["Count"] > 0]
+        cell = alt.selection_point(name=REACH_AVE_SELECTION, fields=["Reach Bin", "AVE Bin"])
+        return (
+            alt.Chart(_chart_data(shown, ["Reach Bin", "AVE Bin", "Reach", "AVE", "Count"]))
+            .mark_rect()
+            .encode(
+                x=alt.X(
+                    "Reach:O",
+                    sort=reach_order,
+                    scale=alt.Scale(domain=reach_order),
+                    title="Reach (log-spaced bins)",
+                    axis=alt.Axis(labelAngle=45),
+                ),
+                y=alt.Y(
+                    "AVE:O",
+                    sort=ave_order,
+                    scale=alt.Scale(domain=ave_order),
+                    title="AVE (log-spaced bins)",
+                ),
+                color=alt.Color(
+                    "Count:Q",
+                    scale=alt.Scale(type="log", range=["#e8edf3", _resolve_color(color or "")]),
+                    legend=alt.Legend(title="Articles"),
+                ),
+                opacity=alt.condition(cell, alt.value(1.0), alt.value(0.35)),
+                tooltip=[
+                    alt.Tooltip("Reach:O"),
+                    alt.Tooltip("AVE:O"),
+                    alt.Tooltip("Count:Q", title="Articles"),
+                ],
+            )
+            .add_params(cell)
+            .properties(width=1000, height=420)
         )
 
     @staticmethod
-    def create_prominence_score_chart_extra(df: pd.DataFrame) -> alt.Chart:
-        """Build a bar chart of total prominence with average line overlay."""
+    def create_prominence_score_chart_extra(
+        df: pd.DataFrame, colors: list[str] | None = None
+    ) -> alt.Chart:
+        """Build a bar chart of total prominence with average line overlay (colors by row)."""
+        df = _chart_data(df, ["Keyword", "Total Prominence", "Average Prominence"])
+        colors = colors or brand_palette(len(df))
         base_bars = alt.Chart(df).encode(
             x=alt.X("Keyword:N", sort=None, title=None, axis=alt.Axis(labelAngle=0)),
             y=alt.Y("Total Prominence:Q", title=None),
             color=alt.Color(
                 "Keyword:N",
-                scale=alt.Scale(range=["#ff0000", "#039482", "#001F60"]),
+                scale=alt.Scale(domain=list(df["Keyword"]), range=colors),
                 legend=alt.Legend(title="Keywords"),
             ),
         )
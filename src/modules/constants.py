@@ -28,12 +28,15 @@ COLUMN_SOURCE = "Source"
 COLUMN_INFLUENCER = "Influencer"
 COLUMN_OPENING_TEXT = "Opening Text"
 COLUMN_HIT_SENTENCE = "Hit Sentence"
+COLUMN_URL = "URL"
+COLUMN_MEDIA_TYPE = "Media Type"
 
 DATE_FORMAT_READ = "%d-%b-%Y %I:%M%p"
 DATE_FORMAT_DISPLAY_TREND = "%b-%d"
 DATE_FORMAT_DISPLAY_PROMINENCE = "%Y-%m-%d"
 
 SENTIMENT_VALUES = ("Positive", "Neutral", "Negative")
+MEDIA_TYPE_UNCLASSIFIED = "unclassified"
 
 COLOR_KEYWORD_1 = "#001F60"
 COLOR_KEYWORD_3 = "#039482"
@@ -44,9 +47,38 @@ COLOR_MAPPING = {
     "selected_keyword4_color": COLOR_KEYWORD_4,
 }
 
-PIE_AIRLINE_COLORS = [COLOR_KEYWORD_1, "#FFD700", "#EE2A29"]
+# Colors for brands without a "color" in config (extended by utils.helpers.brand_palette).
+BRAND_PALETTE = [
+    COLOR_KEYWORD_1,
+    COLOR_KEYWORD_3,
+    COLOR_KEYWORD_4,
+    "#FFD700",
+    "#7c3aed",
+    "#ea580c",
+    "#0284c7",
+    "#65a30d",
+    "#db2777",
+    "#475569",
+    "#b45309",
+    "#0d9488",
+    "#9333ea",
+    "#dc2626",
+    "#2563eb",
+    "#16a34a",
+    "#c026d3",
+    "#ca8a04",
+    "#0891b2",
+    "#78716c",
+]
 PIE_SENTIMENT_COLORS = ["#2ecc71", "#95a5a6", "#e74c3c"]
 PIE_SENTIMENT_COLORS_MATPLOTLIB = ["#3b7d23", "#7f7f7f", "#c00000"]
+MEDIA_TYPE_COLORS = {
+    "blog": "#f59e0b",
+    "broadcast": "#6366f1",
+    "print": "#0f766e",
+    "social media": "#ec4899",
+    MEDIA_TYPE_UNCLASSIFIED: "#cbd5e1",
+}
 
 REQUIRED_FIELDS_NOTE = """
 **Required columns in your Excel (sheet \"1. Dataset\") for the analysis to work:**
@@ -62,6 +94,145 @@ REQUIRED_FIELDS_NOTE = """
 - **Hit Sentence** — quoted or key sentence
 """.strip()
 
+# Pre-evaluate Vega-Lite transforms (stacking, percentages, column projection) in
+# pandas so charts only ship their final marks. Set DASHBOARD_SERVER_TRANSFORMS=0
+# to let the browser evaluate them instead.
+SERVER_SIDE_TRANSFORMS = os.environ.get("DASHBOARD_SERVER_TRANSFORMS", "1").lower() not in (
+    "0",
+    "false",
+    "no",
+)
+
+# Start with memory tracing enabled (can also be toggled from the sidebar).
+MEMORY_TRACE_DEFAULT = os.environ.get("DASHBOARD_MEMORY_TRACE", "0").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Threads used to compute heavy sections (prominence, trendlines, top-K) in parallel.
+SECTION_WORKERS = int(os.environ.get("DASHBOARD_SECTION_WORKERS", "4"))
+
+# Rows per chunk when streaming values into quantile sketches.
+SKETCH_CHUNK_ROWS = 100_000
+DISTRIBUTION_QUANTILES = (0.5, 0.9, 0.99)
+
+# Reach vs AVE density: cells per axis (log-spaced) and outlets listed per cell.
+REACH_AVE_BINS = 20
+REACH_AVE_TOP_OUTLETS = 10
+
+# Spike detection on daily brand counts: each day is scored against the
+# previous ANOMALY_WINDOW days ("mad": median / scaled MAD, "zscore": mean /
+# standard deviation) once at least ANOMALY_MIN_PERIODS of them exist, and
+# flagged at ANOMALY_THRESHOLD with at least ANOMALY_MIN_COUNT articles.
+ANOMALY_METHOD = "mad"
+ANOMALY_WINDOW = 14
+ANOMALY_MIN_PERIODS = 7
+ANOMALY_THRESHOLD = 3.5
+ANOMALY_MIN_COUNT = 3
+
+# Top terms per brand: terms listed, minimum brand articles for a term to be
+# ranked by lift, hash buckets (2**bits) for words and word pairs, and rows
+# tokenized per block.
+TOP_TERMS_COUNT = 15
+TOP_TERMS_MIN_ARTICLES = 3
+TOP_TERMS_HASH_BITS = 24
+TOP_TERMS_BLOCK_ROWS = 50_000
+
+# Near-duplicate story detection (MinHash + LSH). bands must divide num_perm;
+# with 16 bands of 4 rows, pairs above ~0.5 Jaccard become candidates and are
+# kept when their estimated similarity reaches the threshold.
+DEDUP_NUM_PERM = 64
+DEDUP_BANDS = 16
+DEDUP_THRESHOLD = 0.7
+DEDUP_SHINGLE_SIZE = 3
+DEDUP_BLOCK_ROWS = 50_000
+COLUMN_CLUSTER_SIZE = "Cluster Size"
+
+# Prominence weights for a keyword found in the Headline, Opening Text or Hit Sentence.
+PROMINENCE_WEIGHTS = (1.0, 0.7, 0.1)
+
+# Text scoring (prominence, headline mentions) runs on a process pool once the
+# filtered dataset reaches PARALLEL_SCORING_MIN_ROWS; DASHBOARD_SCORING_WORKERS=1
+# keeps it in-process.
+SCORING_WORKERS = int(os.environ.get("DASHBOARD_SCORING_WORKERS", str(os.cpu_count() or 1)))
+PARALLEL_SCORING_MIN_ROWS = 200_000
+SCORING_CHUNK_ROWS = 50_000
+
+# Headless metrics API (python run.py api): bind address and result cache size.
+API_HOST = os.environ.get("DASHBOARD_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("DASHBOARD_API_PORT", "8600"))
+API_CACHE_ENTRIES = 4096
+FINGERPRINT_CHUNK_BYTES = 1 << 20
+
+# Persistent results store for warm restarts, shared by app and API processes. It lives
+# in the user's cache directory, outside the checkout; DASHBOARD_RESULT_STORE="" disables
+# it. Bump RESULT_STORE_VERSION when a result's shape changes without a change to the
+# reader sources (their hash is keyed too).
+USER_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "media-dashboard",
+)
+RESULT_STORE_DIR = os.environ.get(
+    "DASHBOARD_RESULT_STORE", os.path.join(USER_CACHE_DIR, "results")
+)
+RESULT_STORE_MAX_BYTES = int(os.environ.get("DASHBOARD_RESULT_STORE_MB", "512")) << 20
+RESULT_STORE_VERSION = 1
+
+# In-memory memo in front of it, per handler (sessions start from a copy of the
+# preloaded handler's): most recently used query results kept per dataset load.
+RESULT_MEMO_ENTRIES = int(os.environ.get("DASHBOARD_RESULT_MEMO_ENTRIES", "512"))
+
+# Directory for memory-mapped Arrow copies of parsed datasets, shared read-only by
+# every worker process on the host (DASHBOARD_SHARED_DATASET; unset keeps a private
+# pandas copy per process). Only datasets loaded from a file path are shared.
+SHARED_DATASET_DIR = os.environ.get("DASHBOARD_SHARED_DATASET") or None
+
+# Watched data directory (DASHBOARD_WATCH_DIR, e.g. data/; unset disables it):
+# the newest workbook there becomes the default dataset once it has been
+# parsed off the request path. The directory is polled every
+# WATCH_POLL_SECONDS; a file must keep the same size and mtime for one poll
+# before it is parsed. Parsed copies go to the shared dataset directory or,
+# without one, to WATCH_INGEST_DIR.
+WATCH_DATA_DIR = os.environ.get("DASHBOARD_WATCH_DIR") or None
+WATCH_POLL_SECONDS = float(os.environ.get("DASHBOARD_WATCH_POLL_SECONDS", "10"))
+WATCH_INGEST_DIR = SHARED_DATASET_DIR or os.path.join(PROJECT_ROOT, ".cache", "datasets")
+
+# Opening Text and Hit Sentence hold most of a dataset's bytes, but only text
+# scoring, story clustering and article-level views read them. They are kept out
+# of the resident dataframe, in an Arrow file mapped on demand: the shared dataset
+# copy when there is one, else a spill file in DEFERRED_TEXT_DIR (default: the
+# system temporary directory). DASHBOARD_DEFER_TEXT=0 keeps them in the dataframe.
+DEFER_TEXT_COLUMNS = os.environ.get("DASHBOARD_DEFER_TEXT", "1").lower() not in (
+    "0",
+    "false",
+    "no",
+)
+DEFERRED_TEXT_COLUMNS = (COLUMN_OPENING_TEXT, COLUMN_HIT_SENTENCE)
+DEFERRED_TEXT_DIR = os.environ.get("DASHBOARD_DEFERRED_TEXT_DIR") or None
+
+# Approximate mode (sidebar toggle; DASHBOARD_APPROXIMATE=1 starts with it on):
+# brand totals are first estimated from stratified samples of the filtered rows
+# (strata: day × the APPROX_STRATA_SOURCES largest sources, the rest pooled),
+# growing through APPROX_SAMPLE_FRACTIONS in the background; the full dashboard
+# replaces the estimates once the last (exact) fraction is done. Intervals use
+# the normal quantile APPROX_CONFIDENCE_Z (95%).
+APPROXIMATE_MODE_DEFAULT = os.environ.get("DASHBOARD_APPROXIMATE", "0").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+APPROX_SAMPLE_FRACTIONS = (0.01, 0.05, 0.25, 1.0)
+APPROX_STRATA_SOURCES = 50
+APPROX_CONFIDENCE_Z = 1.96
+APPROX_SAMPLE_SEED = 0
+APPROX_REFRESH_SECONDS = 1.0
+
+# Downloads are written EXPORT_CHUNK_ROWS rows at a time; finished files are kept
+# in memory up to EXPORT_SPOOL_BYTES and spooled to a temporary file beyond it.
+EXPORT_CHUNK_ROWS = 50_000
+EXPORT_SPOOL_BYTES = 16 << 20
+
 DATAFRAME_DISPLAY_WIDTH = 400
 CHART_HEIGHT = 300
 COLUMN_RATIO = [1, 2]
@@ -0,0 +1,139 @@
+"""Background ingestion of the newest workbook in a watched data directory.
+
+A daemon thread polls the directory. When a workbook is new or changed (and
+has stopped changing), a separate process parses it into the shared Arrow
+form (``shared_dataset``), so the openpyxl parse never competes with request
+threads for the interpreter. The thread then maps that copy, builds indexes
+and warms queries through ``warm_start.preload``, and only then swaps the
+active dataset. Sessions pick the new version up on their next rerun.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Any, Callable, NamedTuple
+
+from .constants import DEFAULT_SHEET_NAME, UPLOAD_FILE_TYPES, WATCH_INGEST_DIR, WATCH_POLL_SECONDS
+from .reader import ExcelFileHandler
+from .warm_start import forget_preloaded, preload
+
+
+class ActiveDataset(NamedTuple):
+    """The workbook currently served and when it became active."""
+
+    path: str
+    mtime: float
+    activated_at: float
+
+
+def _publish_workbook(path: str, sheet_name: str, shared_dir: str) -> None:
+    """Child process task: parse a workbook and publish its shared copy."""
+    ExcelFileHandler(path, sheet_name, shared_dir=shared_dir).open_excel_file()
+
+
+class DatasetWatcher(threading.Thread):
+    """Poll a directory and keep the newest parsed workbook as the active dataset.
+
+    ``active()`` returns the current ``ActiveDataset`` (None until the first
+    workbook is ready); the swap is a single reference assignment. A workbook
+    that fails to parse is skipped until it changes again, and the previous
+    dataset stays active. Excel lock files (``~$…``) and hidden files are ignored.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        sheet_name: str = DEFAULT_SHEET_NAME,
+        ingest_dir: str = WATCH_INGEST_DIR,
+        poll_seconds: float = WATCH_POLL_SECONDS,
+        log: Callable[[str], Any] = print,
+    ) -> None:
+        super().__init__(daemon=True, name="dataset-watcher")
+        self.directory = directory
+        self.sheet_name = sheet_name
+        self.ingest_dir = ingest_dir
+        self.poll_seconds = poll_seconds
+        self.log = log
+        self._failed: dict[str, float] = {}
+        self._active: ActiveDataset | None = None
+        self._seen: dict[str, tuple[float, int]] = {}
+        self._stop_event = threading.Event()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def active(self) -> ActiveDataset | None:
+        """Return the dataset sessions should use, or None if none is ready yet."""
+        return self._active
+
+    def stop(self) -> None:
+        """Stop polling and shut the parse process down."""
+        self._stop_event.set()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.poll()
+            except Exception as e:  # keep watching; the next poll retries
+                self.log(f"watcher: poll failed: {e!s}")
+            self._stop_event.wait(self.poll_seconds)
+
+    def _candidates(self) -> list[tuple[float, int, str]]:
+        """Return (mtime, size, path) of every workbook in the directory."""
+        suffixes = tuple(f".{ext}" for ext in UPLOAD_FILE_TYPES)
+        found = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith(("~$", ".")) or not name.lower().endswith(suffixes):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.is_file():
+                    found.append((stat.st_mtime, stat.st_size, entry.path))
+        return found
+
+    def poll(self) -> ActiveDataset | None:
+        """Check the directory once; ingest and activate the newest stable workbook."""
+        candidates = self._candidates()
+        seen, self._seen = self._seen, {path: (mtime, size) for mtime, size, path in candidates}
+        settled = time.time() - self.poll_seconds
+        for mtime, size, path in sorted(candidates, reverse=True):
+            if seen.get(path) != (mtime, size) and mtime > settled:
+                continue  # possibly still being written: wait one more poll
+            active = self._active
+            if active is not None and (active.path, active.mtime) == (path, mtime):
+                return active
+            if self._failed.get(path) == mtime:
+                continue
+            if self._ingest(path, mtime):
+                return self._active
+        return self._active
+
+    def _ingest(self, path: str, mtime: float) -> bool:
+        self.log(f"watcher: ingesting {os.path.basename(path)}")
+        start = time.perf_counter()
+        try:
+            if self._pool is None:
+                # spawn: forking a process that runs Streamlit's threads is unsafe.
+                self._pool = ProcessPoolExecutor(1, mp_context=get_context("spawn"))
+            self._pool.submit(_publish_workbook, path, self.sheet_name, self.ingest_dir).result()
+            preload(path, self.sheet_name, shared_dir=self.ingest_dir, log=self.log, mtime=mtime)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                self._pool = None  # start a fresh process next time
+            self._failed[path] = mtime
+            self.log(f"watcher: could not ingest {os.path.basename(path)}: {e!s}")
+            return False
+        previous, self._active = self._active, ActiveDataset(path, mtime, time.time())
+        if previous is not None and previous.path != path:
+            forget_preloaded(previous.path, self.sheet_name)
+        self.log(
+            f"watcher: {os.path.basename(path)} active after {time.perf_counter() - start:.2f} s"
+        )
+        return True
@@ -0,0 +1,50 @@
+"""Progressive rendering of heavy dashboard sections computed on a thread pool."""
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Any, Callable
+
+import streamlit as st
+
+from .constants import SECTION_WORKERS
+
+_SECTION_EXECUTOR = ThreadPoolExecutor(
+    max_workers=SECTION_WORKERS, thread_name_prefix="dashboard-section"
+)
+
+
+class DeferredSections:
+    """Reserve a slot for each heavy section, compute it off-thread, render when ready.
+
+    Computations must not call Streamlit; rendering always happens on the script
+    thread in ``render_all``. When disabled, sections are computed and rendered
+    inline in the order they were added.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._pending: dict[Future, tuple[Any, Callable[[Any], None]]] = {}
+
+    def add(
+        self,
+        label: str,
+        compute: Callable[[], Any],
+        render: Callable[[Any], None],
+    ) -> None:
+        """Add a section at the current position of the page."""
+        if not self.enabled:
+            render(compute())
+            return
+        placeholder = st.empty()
+        placeholder.caption(f"Computing {label}…")
+        self._pending[_SECTION_EXECUTOR.submit(compute)] = (placeholder, render)
+
+    def render_all(self) -> None:
+        """Fill in each reserved slot as its computation completes."""
+        pending, self._pending = self._pending, {}
+        for future in as_completed(pending):
+            placeholder, render = pending[future]
+            with placeholder.container():
+                try:
+                    render(future.result())
+                except Exception as e:
+                    st.error(f"Error: {e!s}")
@@ -1,48 +1,102 @@
 """Streamlit UI components for data overview and airline analysis."""
 
+import hashlib
+import re
+
 import numpy as np
 import pandas as pd
 import streamlit as st
 
-from .chart_creator import ChartCreator
-from .constants import COLUMN_RATIO, DATAFRAME_DISPLAY_WIDTH
+from .chart_creator import REACH_AVE_SELECTION, ChartCreator
+from .constants import (
+    ANOMALY_THRESHOLD,
+    ANOMALY_WINDOW,
+    COLUMN_AVE,
+    COLUMN_RATIO,
+    COLUMN_REACH,
+    DATAFRAME_DISPLAY_WIDTH,
+    SENTIMENT_VALUES,
+)
+from .export import EXPORT_FORMATS, Restore, export_to_file
+from .reader.anomalies import linear_trends
+from .reader.brands import Brand
 from .reader.excel_handler import ExcelFileHandler
 from .utils.helpers import format_number
+from .utils.memory_trace import MemoryTracer
+
+
+def _widget_key(prefix: str, name: str) -> str:
+    """Return a widget key for name: a readable slug plus a hash of the exact name.
+
+    Names differing only in case or punctuation ("AirAsia", "airasia") share a
+    slug, so the hash keeps their keys apart.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+    return f"{prefix}_{slug}_{hashlib.sha1(name.encode('utf-8')).hexdigest()[:8]}"
+
+
+def display_download_menu(
+    table: pd.DataFrame, name: str, restore: Restore | None = None
+) -> None:
+    """Render a Download popover offering table as CSV, Parquet or XLSX.
+
+    Files are only written when a button is clicked, on Streamlit's download
+    thread, so large exports do not hold up the page script. ``restore`` (e.g.
+    a handler's ``with_text``) adds columns kept out of table chunk by chunk.
+    """
+    slug = re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "table"
+    with st.popover("Download"):
+        for fmt, (mime, ext) in EXPORT_FORMATS.items():
+            st.download_button(
+                fmt.upper(),
+                data=lambda fmt=fmt: export_to_file(table, fmt, restore=restore),
+                file_name=f"{slug}{ext}",
+                mime=mime,
+                key=_widget_key(f"download_{fmt}", name),
+                on_click="ignore",
+            )
 
 
 def display_airline_metrics(
     handler: ExcelFileHandler,
     keyword: str,
-    secondary_keyword: str,
+    *aliases: str,
+    totals: pd.Series | None = None,
 ) -> None:
-    """Render metrics (coverage, headline presence, reach, AVE) for one airline."""
+    """Render metrics (coverage, headline presence, reach, AVE) for one airline.
+
+    totals is the brand's ``brand_summary`` row; without it the metrics are queried.
+    """
+    if totals is None:
+        totals = pd.Series(
+            {
+                "Mentions": handler.get_total_articles_keywords(keyword),
+                "Headline Mentions": handler.count_mentions_headlines(keyword, *aliases),
+                "Reach": handler.get_reach_sum(keyword),
+                "AVE": handler.get_ave_sum(keyword),
+            }
+        )
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric(
-            f"Media Coverage Volume {keyword}",
-            handler.get_total_articles_keywords(keyword),
-        )
+        st.metric(f"Media Coverage Volume {keyword}", int(totals["Mentions"]))
     with col2:
-        st.metric(
-            f"Headline Presence {keyword}",
-            handler.count_mentions_headlines(keyword, secondary_keyword),
-        )
+        st.metric(f"Headline Presence {keyword}", int(totals["Headline Mentions"]))
     with col3:
-        st.metric(
-            f"{keyword} Reach Metrics",
-            format_number(handler.get_reach_sum(keyword)),
-        )
+        st.metric(f"{keyword} Reach Metrics", format_number(totals["Reach"]))
     with col4:
-        st.metric(
-            f"{keyword} AVE Metrics",
-            format_number(handler.get_ave_sum(keyword)),
-        )
+        st.metric(f"{keyword} AVE Metrics", format_number(totals["AVE"]))
 
 
-def display_sentiment_analysis(handler: ExcelFileHandler, keyword: str) -> None:
+def display_sentiment_analysis(
+    handler: ExcelFileHandler, keyword: str, counts: dict[str, int] | None = None
+) -> None:
     """Render sentiment counts and pie chart for one keyword."""
     st.subheader("Sentiment Analysis")
-    counts = handler.get_sentiment_counts(keyword)
+    if counts is None:
+        counts = handler.get_sentiment_counts(keyword)
+    if not any(counts.values()):
+        st.info(f"No {keyword} articles for the current filters.")
+        return
     sentiment_df = pd.DataFrame(
         {
             "Sentiment": ["Positive", "Neutral", "Negative"],
@@ -60,17 +114,24 @@ def display_sentiment_analysis(handler: ExcelFileHandler, keyword: str) -> None:
 
 
 def display_daily_trendline(
-    handler: ExcelFileHandler, keyword: str, color_key: str
+    handler: ExcelFileHandler,
+    keyword: str,
+    color_key: str,
+    daily: pd.DataFrame | None = None,
+    spikes: pd.DataFrame | None = None,
 ) -> None:
-    """Render daily trendline with slider (time window), smoothing, and trend line."""
+    """Render daily trendline with slider (time window), smoothing, and trend line.
+
+    spikes (Date, Baseline, Score rows from ``brand_anomalies``) are marked on the chart.
+    """
     st.subheader("Daily Trendline")
-    daily = handler.count_daily_trendline(keyword)
+    if daily is None:
+        daily = handler.count_daily_trendline(keyword)
     n_total = len(daily)
     if n_total == 0:
         st.warning("No daily data for this keyword.")
         return
 
-    key_suffix = keyword.replace(" ", "_").replace(".", "_") if keyword else "trend"
     with st.expander("Trendline controls", expanded=True):
         c1, c2, c3 = st.columns(3)
         with c1:
@@ -86,7 +147,7 @@ def display_daily_trendline(
                 range(len(window_options)),
                 format_func=lambda i: window_labels[i],
                 help="Limit the range of dates shown on the chart.",
-                key=f"trendline_window_{key_suffix}",
+                key=_widget_key("trendline_window", keyword),
             )
             n_show = window_options[window_idx][1]
         with c2:
@@ -95,14 +156,14 @@ def display_daily_trendline(
                 "Smoothing",
                 smooth_options,
                 help="Overlay a moving average to reduce noise.",
-                key=f"trendline_smooth_{key_suffix}",
+                key=_widget_key("trendline_smooth", keyword),
             )
         with c3:
             show_trend = st.checkbox(
                 "Show trend line (linear fit)",
                 value=False,
                 help="Display a linear regression trend line.",
-                key=f"trendline_show_trend_{key_suffix}",
+                key=_widget_key("trendline_show_trend", keyword),
             )
 
     # Apply time window (last n points)
@@ -119,18 +180,16 @@ def display_daily_trendline(
         s = daily["Count"].rolling(window=window, min_periods=1).mean()
         smoothed_series = s.tail(n_show).reset_index(drop=True)
 
+    slope = None
     if show_trend and len(daily_view) >= 2:
-        x = np.arange(len(daily_view))
-        y = daily_view["Count"].values
-        coeffs = np.polyfit(x, y, 1)
-        trend_series = pd.Series(np.polyval(coeffs, x))
+        slope, intercept = linear_trends(daily_view["Count"].to_numpy())
+        trend_series = pd.Series(intercept + slope * np.arange(len(daily_view)))
 
     col1, col2 = st.columns(COLUMN_RATIO)
     with col1:
         st.caption("Data (filtered by time window)")
         st.dataframe(daily_view, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
-        if show_trend and trend_series is not None and len(daily_view) >= 2:
-            slope = np.polyfit(np.arange(len(daily_view)), daily_view["Count"], 1)[0]
+        if slope is not None:
             st.caption(f"Trend slope: **{slope:+.2f}** articles/day")
     with col2:
         chart = ChartCreator.create_daily_trendline_chart(
@@ -138,8 +197,11 @@ def display_daily_trendline(
             color_key,
             smoothed_series=smoothed_series,
             trend_series=trend_series,
+            spikes=spikes,
         )
         st.altair_chart(chart, use_container_width=True, theme=None)
+        if spikes is not None and daily_view["Date"].isin(spikes["Date"]).any():
+            st.caption("Red circles: spikes (unusually high days for this brand)")
         if smoothed_series is not None or trend_series is not None:
             parts = []
             if smoothed_series is not None:
@@ -150,14 +212,23 @@ def display_daily_trendline(
 
 
 def display_top_publications_authors(
-    handler: ExcelFileHandler, keyword: str, color_key: str
+    handler: ExcelFileHandler,
+    keyword: str,
+    color_key: str,
+    top_pub: pd.DataFrame | None = None,
+    top_auth: pd.DataFrame | None = None,
 ) -> None:
     """Render top publications and top authors for one keyword."""
     st.subheader(f"{keyword} Top Publications")
-    top_pub = handler.get_top_publications(keyword)
+    if top_pub is None:
+        top_pub = handler.get_top_publications(keyword)
+    if top_pub.empty:
+        st.info(f"No {keyword} articles for the current filters.")
+        return
     col1, col2 = st.columns(COLUMN_RATIO)
     with col1:
         st.dataframe(top_pub, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+        display_download_menu(top_pub, f"{keyword} top publications")
     with col2:
         st.altair_chart(
             ChartCreator.create_publications_horizontal_bar(top_pub, color_key),
@@ -165,10 +236,12 @@ def display_top_publications_authors(
             theme=None,
         )
     st.subheader(f"{keyword} Top Authors")
-    top_auth = handler.get_top_authors(keyword)
+    if top_auth is None:
+        top_auth = handler.get_top_authors(keyword)
     col1, col2 = st.columns(COLUMN_RATIO)
     with col1:
         st.dataframe(top_auth, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+        display_download_menu(top_auth, f"{keyword} top authors")
     with col2:
         st.altair_chart(
             ChartCreator.create_get_top_authors(top_auth, color_key),
@@ -177,36 +250,320 @@ def display_top_publications_authors(
         )
 
 
+def display_estimated_totals(
+    estimates: pd.DataFrame, fraction: float, rows: int
+) -> None:
+    """Render sample-based brand totals as "value ± margin" with the sample size."""
+    st.subheader("Brand Totals (estimated)")
+    st.caption(
+        f"Estimated from a {fraction:.0%} stratified sample ({rows:,} articles, by day "
+        "and source) with 95% confidence intervals; refining in the background."
+    )
+    table = pd.DataFrame({"Brand": estimates["Brand"]})
+    table["Mentions"] = [
+        f"{v:,.0f} ± {m:,.0f}" for v, m in zip(estimates["Mentions"], estimates["Mentions ±"])
+    ]
+    for name in ("Reach", "AVE"):
+        table[name] = [
+            f"{format_number(v)} ± {format_number(m)}"
+            for v, m in zip(estimates[name], estimates[f"{name} ±"])
+        ]
+    for name in SENTIMENT_VALUES:
+        table[name] = [
+            f"{v:.1%} ± {m:.1%}"
+            for v, m in zip(estimates[f"{name} share"], estimates[f"{name} share ±"])
+        ]
+    st.dataframe(table, hide_index=True)
+    display_download_menu(estimates, "estimated brand totals")
+
+
+def display_anomaly_alerts(
+    daily: pd.DataFrame, trends: pd.DataFrame, colors: list[str] | None = None
+) -> None:
+    """Render the cross-brand spike alerts table and daily counts with spikes circled."""
+    st.subheader("Alerts")
+    st.caption(
+        f"Days whose mentions stand out from the previous {ANOMALY_WINDOW} days "
+        f"(Score of at least {ANOMALY_THRESHOLD:g} spreads above the Baseline); Slope "
+        "is each brand's linear trend in articles/day over the selected dates."
+    )
+    alerts = daily[daily["Spike"]].merge(trends[["Brand", "Slope"]], on="Brand")
+    alerts = alerts.sort_values("Score", ascending=False)[
+        ["Date", "Brand", "Count", "Baseline", "Score", "Slope"]
+    ]
+    col1, col2 = st.columns(COLUMN_RATIO)
+    with col1:
+        if alerts.empty:
+            st.info("No spikes for the current filters.")
+        else:
+            st.dataframe(alerts, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+            display_download_menu(alerts, "alerts")
+        st.dataframe(trends, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+    with col2:
+        if not daily.empty:
+            st.altair_chart(
+                ChartCreator.create_alerts_chart(daily, colors),
+                use_container_width=True,
+                theme=None,
+            )
+
+
+TOP_TERMS_RANKINGS = {"Most frequent": "articles", "Most distinctive": "lift"}
+
+
+def display_top_terms(
+    handler: ExcelFileHandler,
+    brand: Brand,
+    ranked: dict[str, pd.DataFrame] | None = None,
+) -> None:
+    """Render a brand's top words and word pairs, by frequency or by lift.
+
+    ranked maps each ``TOP_TERMS_RANKINGS`` value to its ``top_terms`` table;
+    without it the chosen ranking is queried.
+    """
+    st.subheader(f"{brand.name} Top Terms")
+    choice = st.radio(
+        "Rank by",
+        list(TOP_TERMS_RANKINGS),
+        horizontal=True,
+        key=f"top_terms_rank_{brand.keyword}",
+        help="Distinctive terms appear far more often with this brand than in other coverage.",
+    )
+    by = TOP_TERMS_RANKINGS[choice]
+    terms = (ranked or {}).get(by)
+    if terms is None:
+        terms = handler.top_terms(brand.keyword, *brand.aliases, by=by)
+    if terms.empty:
+        st.caption("No terms for the current filters.")
+        return
+    st.caption("Words and word pairs in Headline and Hit Sentence of the brand's articles.")
+    col1, col2 = st.columns(COLUMN_RATIO)
+    with col1:
+        st.dataframe(terms, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+        display_download_menu(terms, f"{brand.name} top terms")
+    with col2:
+        st.altair_chart(
+            ChartCreator.create_top_terms_chart(
+                terms, brand.color, "Lift" if by == "lift" else "Articles"
+            ),
+            use_container_width=True,
+            theme=None,
+        )
+
+
 def display_brand_comparison(
-    handler: ExcelFileHandler, airlines: list[str]
+    handler: ExcelFileHandler,
+    airlines: list[str],
+    colors: list[str] | None = None,
+    mentions: list[int] | None = None,
 ) -> None:
     """Render brand comparison table and pie chart."""
     st.subheader("Brand Comparison")
-    mentions = [handler.get_total_articles_keywords(kw) for kw in airlines]
+    if mentions is None:
+        mentions = [handler.get_total_articles_keywords(kw) for kw in airlines]
+    if not any(mentions):
+        st.info("No brand mentions for the current filters.")
+        return
     df = pd.DataFrame({"Airline": airlines, "Mentions": mentions})
     col1, col2 = st.columns(COLUMN_RATIO)
     with col1:
         st.dataframe(df, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+        display_download_menu(df, "brand comparison")
     with col2:
-        chart = ChartCreator.create_airline_mentions_pie_chart(mentions, airlines)
+        chart = ChartCreator.create_airline_mentions_pie_chart(mentions, airlines, colors)
         st.altair_chart(chart, use_container_width=True, theme=None)
 
 
+SHARE_OF_VOICE_WEIGHTINGS = {
+    "Articles": "count",
+    "Reach": "reach",
+    "AVE": "ave",
+    "Prominence": "prominence",
+}
+
+
+def display_share_of_voice(handler: ExcelFileHandler, brands: list[Brand]) -> None:
+    """Render each brand's share of voice, weighted and split by sentiment, and its daily trend."""
+    st.subheader("Share of Voice")
+    col1, col2 = st.columns(2)
+    with col1:
+        choice = st.radio(
+            "Weight by",
+            list(SHARE_OF_VOICE_WEIGHTINGS),
+            horizontal=True,
+            key="sov_weight",
+            help="Prominence weights each article by how prominently the brand features in it.",
+        )
+    with col2:
+        sentiment = st.radio(
+            "Sentiment", ["All", *SENTIMENT_VALUES], horizontal=True, key="sov_sentiment"
+        )
+    totals, daily = handler.share_of_voice(
+        brands, SHARE_OF_VOICE_WEIGHTINGS[choice], None if sentiment == "All" else sentiment
+    )
+    if not totals["Value"].any():
+        st.info("No brand coverage for the current filters.")
+        return
+    colors = [b.color for b in brands]
+    col1, col2 = st.columns(COLUMN_RATIO)
+    with col1:
+        st.dataframe(totals, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+        display_download_menu(totals, f"share of voice by {choice.lower()}")
+    with col2:
+        st.altair_chart(
+            ChartCreator.create_share_of_voice_pie_chart(totals, colors),
+            use_container_width=True,
+            theme=None,
+        )
+    if not daily.empty:
+        st.altair_chart(
+            ChartCreator.create_share_of_voice_area_chart(daily, colors),
+            use_container_width=True,
+            theme=None,
+        )
+
+
+def display_media_type_breakdown(
+    handler: ExcelFileHandler, keyword_groups: list[str | list[str]]
+) -> None:
+    """Render per-brand article counts by media type (table and stacked bar chart)."""
+    st.subheader("Media Type Breakdown")
+    breakdown = handler.media_type_breakdown(keyword_groups)
+    if breakdown.empty:
+        st.caption("No media type data.")
+        return
+    table = breakdown.pivot_table(
+        index="Keyword", columns="Media Type", values="Count", fill_value=0, sort=False
+    ).reset_index()
+    table.columns.name = None
+    col1, col2 = st.columns(COLUMN_RATIO)
+    with col1:
+        st.dataframe(table, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+    with col2:
+        chart = ChartCreator.create_media_type_breakdown_chart(breakdown)
+        st.altair_chart(chart, use_container_width=True, theme=None)
+
+
+def display_reach_ave_distribution(
+    handler: ExcelFileHandler,
+    keyword_groups: list[str | list[str]],
+    colors: list[str] | None = None,
+) -> None:
+    """Render per-brand Reach/AVE quantiles (p50/p90/p99/max) and histograms."""
+    st.subheader("Reach and AVE Distribution")
+    stats = handler.distribution_stats(keyword_groups)
+    if stats.empty or not stats["Count"].any():
+        st.caption("No Reach/AVE data.")
+        return
+    shown = stats.copy()
+    for col in ["p50", "p90", "p99", "Max"]:
+        shown[col] = shown[col].map(lambda v: "—" if pd.isna(v) else format_number(v))
+    st.caption("Quantiles are approximate (streaming KLL sketch); counts and maxima are exact.")
+    measure = st.radio(
+        "Histogram measure",
+        [COLUMN_REACH, COLUMN_AVE],
+        horizontal=True,
+        key="distribution_measure",
+    )
+    col1, col2 = st.columns(COLUMN_RATIO)
+    with col1:
+        st.dataframe(shown, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+    with col2:
+        hist = handler.distribution_histogram(keyword_groups, measure)
+        chart = ChartCreator.create_distribution_histogram(hist, measure, colors)
+        st.altair_chart(chart, use_container_width=True, theme=None)
+
+
+def display_brand_cooccurrence(handler: ExcelFileHandler, brands: list[Brand]) -> None:
+    """Render the brand × brand co-mention matrix, optionally for one sentiment."""
+    st.subheader("Brand Co-occurrence")
+    if len(brands) < 2:
+        st.caption("Configure at least two brands to compare co-mentions.")
+        return
+    choice = st.radio(
+        "Sentiment", ["All", *SENTIMENT_VALUES], horizontal=True, key="cooccurrence_sentiment"
+    )
+    matrix = handler.brand_cooccurrence(brands, None if choice == "All" else choice)
+    st.caption(
+        "Articles mentioning both brands; the diagonal is each brand's own mentions. "
+        "Hover a cell for the share of the row brand's mentions."
+    )
+    col1, col2 = st.columns(COLUMN_RATIO)
+    with col1:
+        st.dataframe(matrix)
+        display_download_menu(matrix.reset_index(), "brand cooccurrence")
+    with col2:
+        st.altair_chart(
+            ChartCreator.create_cooccurrence_heatmap(matrix),
+            use_container_width=True,
+            theme=None,
+        )
+
+
+def display_reach_ave_density(
+    handler: ExcelFileHandler,
+    keyword_groups: list[str | list[str]],
+    colors: list[str] | None = None,
+) -> None:
+    """Render a brand's Reach vs AVE heatmap and the top outlets of a clicked cell."""
+    st.subheader("Reach vs AVE")
+    density = handler.reach_ave_density(keyword_groups)
+    if density.empty or not density["Count"].any():
+        st.caption("No Reach/AVE data.")
+        return
+    names = list(dict.fromkeys(density["Keyword"]))
+    name = st.radio("Brand", names, horizontal=True, key="reach_ave_brand")
+    color = colors[names.index(name)] if colors and len(colors) == len(names) else None
+    cells = density[density["Keyword"] == name]
+    st.caption(
+        "Articles per cell of log-spaced Reach and AVE bins (binned on the server). "
+        "Click a cell to list its top outlets; cells off the diagonal band have AVE "
+        "out of line with their reach."
+    )
+    event = st.altair_chart(
+        ChartCreator.create_reach_ave_heatmap(cells, color),
+        use_container_width=True,
+        theme=None,
+        on_select="rerun",
+        key=f"reach_ave_density_{name}",
+    )
+    picked = event.selection.get(REACH_AVE_SELECTION) if event else None
+    if not picked:
+        return
+    reach_bin, ave_bin = int(picked[0]["Reach Bin"]), int(picked[0]["AVE Bin"])
+    cell = cells[(cells["Reach Bin"] == reach_bin) & (cells["AVE Bin"] == ave_bin)].iloc[0]
+    st.markdown(
+        f"**Top outlets for {name}** with Reach {format_number(cell['Reach Start'])}–"
+        f"{format_number(cell['Reach End'])} and AVE {format_number(cell['AVE Start'])}–"
+        f"{format_number(cell['AVE End'])}"
+    )
+    outlets = handler.reach_ave_cell_outlets(keyword_groups, name, reach_bin, ave_bin)
+    st.dataframe(outlets, hide_index=True)
+    display_download_menu(outlets, f"{name} reach ave outlets")
+
+
 def display_pie_to_pie_analysis(
-    handler: ExcelFileHandler, overview_keywords: list[str]
+    handler: ExcelFileHandler,
+    overview_keywords: list[str],
+    colors: list[str] | None = None,
 ) -> None:
     """Render summary table and side-by-side airline/sentiment pie charts."""
     st.subheader("Pie to Pie Analysis")
     summary_df = handler.create_summary_dataframe(overview_keywords)
     values = summary_df["Value"].tolist()
-    airline_data = values[:3]
+    n = len(overview_keywords)
+    if not any(values[:n]) or not any(values[n:]):
+        # The sentiment pie is the first brand's; both pies need a non-zero total.
+        st.info("No brand mentions for the current filters.")
+        return
+    airline_data = values[:n]
     sentiment_data = values
     col1, col2 = st.columns(COLUMN_RATIO)
     with col1:
         st.dataframe(summary_df, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
     with col2:
         fig = ChartCreator.create_side_by_side_pie_charts(
-            airline_data, sentiment_data, overview_keywords[:3]
+            airline_data, sentiment_data, overview_keywords, colors
         )
         st.pyplot(fig)
 
@@ -217,12 +574,16 @@ def display_airlines_overview(
     """Render sentiment overview table and stacked bar chart."""
     st.subheader("Airlines Sentiment Overview")
     sentiment_df = handler.sentiment_overview(overview_keywords)
+    if not sentiment_df[list(SENTIMENT_VALUES)].to_numpy().any():
+        st.info("No brand mentions for the current filters.")
+        return
     col1, col2 = st.columns(COLUMN_RATIO)
     with col1:
         st.dataframe(sentiment_df, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+        display_download_menu(sentiment_df, "sentiment overview")
     with col2:
         chart = ChartCreator.create_airlines_sentiment_overview(
-            sentiment_df, keyword_order=overview_keywords[:3]
+            sentiment_df, keyword_order=overview_keywords
         )
         st.altair_chart(chart, use_container_width=True, theme=None)
 
@@ -230,27 +591,70 @@ def display_airlines_overview(
 def display_prominence_score_df(
     handler: ExcelFileHandler,
     keyword_groups: list[list[str] | tuple[str, ...]],
+    df: pd.DataFrame | None = None,
 ) -> None:
     """Render prominence score table for multiple keyword groups (article-level detail)."""
-    df = handler.prominence_score(keyword_groups[0], *keyword_groups[1:])
+    if df is None:
+        df = handler.prominence_score(keyword_groups[0], *keyword_groups[1:])
     if df.empty:
         st.caption("No prominence score data.")
         return
     with st.expander("Article-level prominence scores (detail)", expanded=False):
         st.caption("One row per article with prominence score per keyword set.")
         st.dataframe(df, hide_index=True)
+        display_download_menu(df, "article prominence scores")
 
 
 def display_prominence_score_extra(
     handler: ExcelFileHandler,
     keyword_groups: list[list[str] | tuple[str, ...]],
+    extra: pd.DataFrame | None = None,
+    colors: list[str] | None = None,
 ) -> None:
     """Render prominence totals/averages and chart for keyword groups."""
     st.subheader("Prominence Summary")
+    if extra is None:
+        extra = handler.prominence_score_extra(keyword_groups[0], *keyword_groups[1:])
+    if not extra["Total Prominence"].any():
+        st.info("No brand mentions in headlines or text for the current filters.")
+        return
     col1, col2 = st.columns(COLUMN_RATIO)
     with col1:
-        extra = handler.prominence_score_extra(keyword_groups[0], *keyword_groups[1:])
         st.dataframe(extra, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+        display_download_menu(extra, "prominence summary")
     with col2:
-        chart = ChartCreator.create_prominence_score_chart_extra(extra)
+        chart = ChartCreator.create_prominence_score_chart_extra(extra, colors)
         st.altair_chart(chart, use_container_width=True, theme=None)
+
+
+def display_memory_report(
+    tracer: MemoryTracer, memo_stats: dict[str, int] | None = None
+) -> None:
+    """Render the memory-tracing report (per-step peaks, per-column usage) with JSON export."""
+    st.subheader("Memory Report")
+    if memo_stats is not None:
+        st.caption(
+            f"Query result memo: {memo_stats['hits']:,} hits, {memo_stats['misses']:,} misses, "
+            f"{memo_stats['entries']:,}/{memo_stats['max_entries']:,} entries."
+        )
+    steps = tracer.steps_dataframe()
+    if steps.empty:
+        st.caption("No steps were traced.")
+        return
+    steps["peak"] = steps["peak_bytes"].map(format_number)
+    steps["retained"] = steps["retained_bytes"].map(format_number)
+    st.caption("Peak and retained bytes per step; depth > 0 marks steps nested in another step.")
+    st.dataframe(
+        steps.sort_values("peak_bytes", ascending=False),
+        hide_index=True,
+    )
+    columns = tracer.columns_dataframe()
+    if not columns.empty:
+        st.caption(f"Dataframe deep memory usage: **{format_number(columns['bytes'].sum())}B**")
+        st.dataframe(columns, hide_index=True, width=DATAFRAME_DISPLAY_WIDTH)
+    st.download_button(
+        "Download memory report (JSON)",
+        tracer.to_json(),
+        file_name="memory_report.json",
+        mime="application/json",
+    )
@@ -0,0 +1,146 @@
+"""Streaming CSV / Parquet / XLSX export of tables in bounded memory.
+
+Rows are written in fixed-size chunks, so the only full-size copy is the
+output file itself; ``export_to_file`` spools that to disk past a small
+in-memory threshold. A ``restore`` callable, applied to each chunk (and to an
+empty one for the header), adds columns held elsewhere, e.g. a handler's
+deferred text, so they are only ever materialized a chunk at a time.
+"""
+
+import tempfile
+from typing import IO, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+from .constants import EXPORT_CHUNK_ROWS, EXPORT_SPOOL_BYTES
+
+# Format -> (MIME type, file extension).
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", ".xlsx"),
+}
+XLSX_MAX_ROWS = 1_048_575  # sheet limit minus the header row
+
+Restore = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def _chunks(
+    df: pd.DataFrame, chunk_rows: int, restore: Restore | None = None
+) -> Iterator[pd.DataFrame]:
+    for lo in range(0, len(df), chunk_rows):
+        chunk = df.iloc[lo : lo + chunk_rows]
+        yield chunk if restore is None else restore(chunk)
+
+
+def _head(df: pd.DataFrame, restore: Restore | None) -> pd.DataFrame:
+    """Return df's zero-row frame with the columns of the exported table."""
+    return df.iloc[:0] if restore is None else restore(df.iloc[:0])
+
+
+def iter_csv(
+    df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS, restore: Restore | None = None
+) -> Iterator[bytes]:
+    """Yield a UTF-8 CSV of df (header first) one chunk of rows at a time."""
+    yield _head(df, restore).to_csv(index=False).encode("utf-8")
+    for chunk in _chunks(df, chunk_rows, restore):
+        yield chunk.to_csv(index=False, header=False).encode("utf-8")
+
+
+def write_csv(
+    df: pd.DataFrame,
+    out: IO[bytes],
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    restore: Restore | None = None,
+) -> None:
+    """Write df to a binary stream as CSV."""
+    for part in iter_csv(df, chunk_rows, restore):
+        out.write(part)
+
+
+def write_parquet(
+    df: pd.DataFrame,
+    out: IO[bytes],
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    restore: Restore | None = None,
+) -> None:
+    """Write df to a binary stream as Parquet, one row group per chunk."""
+    schema = pa.Schema.from_pandas(
+        df if restore is None else _head(df, restore), preserve_index=False
+    )
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in _chunks(df, chunk_rows, restore):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        if df.empty:
+            writer.write_table(schema.empty_table())
+
+
+def _xlsx_cell(value: object) -> object:
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.tz_localize(None).to_pydatetime() if value.tzinfo else value.to_pydatetime()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def write_xlsx(
+    df: pd.DataFrame,
+    out: IO[bytes],
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    restore: Restore | None = None,
+    sheet_name: str = "Data",
+) -> None:
+    """Write df to a binary stream as XLSX using openpyxl's write-only (streaming) mode."""
+    if len(df) > XLSX_MAX_ROWS:
+        raise ValueError(f"{len(df):,} rows exceed the XLSX sheet limit of {XLSX_MAX_ROWS:,}")
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    sheet.append([str(c) for c in _head(df, restore).columns])
+    for chunk in _chunks(df, chunk_rows, restore):
+        for row in chunk.itertuples(index=False, name=None):
+            sheet.append([_xlsx_cell(v) for v in row])
+    workbook.save(out)
+
+
+_WRITERS = {"csv": write_csv, "parquet": write_parquet, "xlsx": write_xlsx}
+
+
+def write_table(
+    df: pd.DataFrame,
+    fmt: str,
+    out: IO[bytes],
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    restore: Restore | None = None,
+) -> None:
+    """Write df to out in one of EXPORT_FORMATS."""
+    if fmt not in _WRITERS:
+        raise ValueError(f"unknown export format: {fmt}")
+    _WRITERS[fmt](df, out, chunk_rows, restore)
+
+
+def export_to_file(
+    df: pd.DataFrame,
+    fmt: str,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    restore: Restore | None = None,
+) -> IO[bytes]:
+    """Return a rewound temporary file holding df in the given format.
+
+    The file stays in memory up to EXPORT_SPOOL_BYTES and moves to disk beyond it.
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES)
+    try:
+        write_table(df, fmt, out, chunk_rows, restore)
+    except Exception:
+        out.close()
+        raise
+    out.seek(0)
+    return out
@@ -0,0 +1,183 @@
+"""Headless access to the dashboard metrics with fingerprinted result caching."""
+
+import hashlib
+import json
+import os
+import threading
+from datetime import date
+from typing import Any, Callable
+
+from .constants import (
+    API_CACHE_ENTRIES,
+    DEFAULT_DATA_PATH,
+    DEFAULT_SHEET_NAME,
+    FINGERPRINT_CHUNK_BYTES,
+    SHARED_DATASET_DIR,
+)
+from .reader import DatasetFilter, ExcelFileHandler
+from .utils import DiskCache, LRUCache, file_fingerprint
+
+
+def _records(df: Any) -> list[dict[str, Any]]:
+    return json.loads(df.to_json(orient="records"))
+
+
+def _prominence(handler: ExcelFileHandler, kws: list[str]) -> dict[str, float]:
+    row = handler.prominence_score_extra([kws]).iloc[0]
+    return {"total": float(row["Total Prominence"]), "average": float(row["Average Prominence"])}
+
+
+METRICS: dict[str, Callable[[ExcelFileHandler, list[str]], Any]] = {
+    "mentions": lambda h, kws: h.get_total_articles_keywords(kws),
+    "headline_mentions": lambda h, kws: h.count_mentions_headlines(kws),
+    "sentiment": lambda h, kws: h.get_sentiment_counts(kws),
+    "reach": lambda h, kws: h.get_reach_sum(kws),
+    "ave": lambda h, kws: h.get_ave_sum(kws),
+    "daily": lambda h, kws: _records(h.count_daily_trendline(kws, case_sensitive=False)),
+    "top_sources": lambda h, kws: _records(h.get_top_publications(*kws, case_sensitive=False)),
+    "top_authors": lambda h, kws: _records(h.get_top_authors(kws, case_sensitive=False)),
+    "prominence": _prominence,
+}
+DEFAULT_METRICS = ("mentions", "sentiment", "reach", "ave")
+
+
+def parse_filter(spec: dict[str, Any] | None) -> DatasetFilter:
+    """Build a DatasetFilter from its JSON form (ISO dates, lists of names)."""
+    spec = spec or {}
+    if not isinstance(spec, dict):
+        raise ValueError("filters must be a JSON object")
+
+    def day(value: str | None) -> date | None:
+        return date.fromisoformat(value) if value else None
+
+    def names(value: list[str] | str | None) -> tuple[str, ...] | None:
+        if not value:
+            return None
+        return (value,) if isinstance(value, str) else tuple(value)
+
+    return DatasetFilter(
+        day(spec.get("start")),
+        day(spec.get("end")),
+        names(spec.get("sources")),
+        names(spec.get("sentiments")),
+        unique_stories=bool(spec.get("unique_stories", False)),
+    )
+
+
+class MetricsService:
+    """Answer metric queries for many keywords against one dataset file.
+
+    Each (dataset fingerprint, filter, keyword set, metric) result is cached in
+    an LRU, so repeated and overlapping queries are served without touching the
+    dataset. The fingerprint is the content hash of the file, re-checked when
+    its size or mtime changes; a new fingerprint reloads the dataset and old
+    entries simply age out. ETags are derived from the fingerprint and the
+    normalized query, so a matching If-None-Match needs no computation. With a
+    ``store``, LRU misses fall through to the persistent results store, so a
+    restarted service answers warm.
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_DATA_PATH,
+        sheet_name: str = DEFAULT_SHEET_NAME,
+        cache_entries: int = API_CACHE_ENTRIES,
+        store: DiskCache | None = None,
+    ) -> None:
+        self.path = path
+        self.sheet_name = sheet_name
+        self.cache = LRUCache(cache_entries)
+        self.store = store
+        self.handler: ExcelFileHandler | None = None
+        self._fingerprint: str | None = None
+        self._stamp: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def fingerprint(self) -> str:
+        """Return the dataset fingerprint, reloading the dataset if the file changed."""
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> str:
+        stat = os.stat(self.path)
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if stamp != self._stamp:
+            fingerprint = file_fingerprint(self.path, FINGERPRINT_CHUNK_BYTES)
+            if fingerprint != self._fingerprint:
+                handler = ExcelFileHandler(
+                    self.path, self.sheet_name, self.store, shared_dir=SHARED_DATASET_DIR
+                )
+                handler.build_indexes()
+                self.handler, self._fingerprint = handler, fingerprint
+            self._stamp = stamp
+        return self._fingerprint
+
+    @staticmethod
+    def normalize(query: dict[str, Any]) -> dict[str, Any]:
+        """Return the canonical form of a query; raise ValueError if it is malformed."""
+        if not isinstance(query, dict):
+            raise ValueError("each query must be a JSON object")
+        keywords = query.get("keywords") or []
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        specs = [[k] if isinstance(k, str) else list(k) for k in keywords]
+        if not specs or not all(spec and all(isinstance(k, str) for k in spec) for spec in specs):
+            raise ValueError("keywords must be a non-empty list of terms or term groups")
+        metrics = query.get("metrics") or list(DEFAULT_METRICS)
+        if isinstance(metrics, str):
+            metrics = [metrics]
+        unknown = sorted(set(metrics) - set(METRICS))
+        if unknown:
+            raise ValueError(f"unknown metrics: {', '.join(unknown)}")
+        flt = parse_filter(query.get("filters"))
+        filters = {
+            "start": flt.start.isoformat() if flt.start else None,
+            "end": flt.end.isoformat() if flt.end else None,
+            "sources": sorted(flt.sources) if flt.sources else None,
+            "sentiments": sorted(flt.sentiments) if flt.sentiments else None,
+            "unique_stories": flt.unique_stories,
+        }
+        return {"keywords": specs, "metrics": list(dict.fromkeys(metrics)), "filters": filters}
+
+    def etag(self, queries: list[dict[str, Any]]) -> str:
+        """Return the ETag for a list of normalized queries against the current dataset."""
+        body = json.dumps([self.fingerprint(), queries], sort_keys=True, separators=(",", ":"))
+        return '"' + hashlib.sha256(body.encode()).hexdigest()[:32] + '"'
+
+    def query(self, query: dict[str, Any]) -> dict[str, Any]:
+        """Return metrics per keyword set for one query (see ``normalize``)."""
+        return self.batch([query])[0]
+
+    def batch(self, queries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Answer several queries; the filtered view is only rebuilt when the filter changes."""
+        normalized = [self.normalize(q) for q in queries]
+        with self._lock:
+            fingerprint = self._refresh()
+            results = []
+            for q in normalized:
+                flt = parse_filter(q["filters"])
+                rows = []
+                for spec in q["keywords"]:
+                    values = {}
+                    for metric in q["metrics"]:
+                        key = (fingerprint, flt, tuple(spec), metric)
+                        values[metric] = self.cache.get_or_compute(
+                            key, lambda m=metric, s=spec: self._compute(flt, m, s)
+                        )
+                    rows.append({"keywords": spec, "metrics": values})
+                results.append({"filters": q["filters"], "results": rows})
+        return results
+
+    def articles(self, filters: dict[str, Any] | None = None) -> ExcelFileHandler:
+        """Return the filtered view of the current dataset for an article export.
+
+        Only the view is taken under the service lock; its text columns are
+        restored by the caller (``view.with_text``) chunk by chunk, outside it.
+        """
+        flt = parse_filter(filters)
+        with self._lock:
+            self._refresh()
+            return self.handler.filtered(flt)
+
+    def _compute(self, flt: DatasetFilter, metric: str, keywords: list[str]) -> Any:
+        return METRICS[metric](self.handler.filtered(flt), keywords)
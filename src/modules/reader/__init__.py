@@ -1,11 +1,40 @@
 """Readers for configuration and Excel data."""
 
-from .config_loader import get_keywords, get_sites_by_type, load_config
-from .excel_handler import ExcelFileHandler
+from .anomalies import AnomalyScores, linear_trends, score_anomalies
+from .background import BackgroundLoad, ProgressiveEstimate
+from .brands import Brand
+from .config_loader import get_brands, get_keywords, get_sites_by_type, load_config
+from .cube import AggregateCube
+from .dedup import StoryClusters, find_story_clusters
+from .excel_handler import ExcelFileHandler, open_result_store
+from .filters import DatasetFilter, TimeIndex
+from .media_types import MediaTypeClassifier
+from .sampling import Estimate, Sample, SampleDesign, estimate_ratios, estimate_totals
+from .terms import TermMatrix
 
 __all__ = [
+    "AggregateCube",
+    "AnomalyScores",
+    "BackgroundLoad",
+    "Brand",
+    "DatasetFilter",
+    "Estimate",
     "ExcelFileHandler",
+    "MediaTypeClassifier",
+    "ProgressiveEstimate",
+    "Sample",
+    "SampleDesign",
+    "StoryClusters",
+    "TermMatrix",
+    "TimeIndex",
+    "estimate_ratios",
+    "estimate_totals",
+    "find_story_clusters",
+    "get_brands",
     "get_keywords",
     "get_sites_by_type",
+    "linear_trends",
     "load_config",
+    "open_result_store",
+    "score_anomalies",
 ]
@@ -0,0 +1,93 @@
+"""Vectorized spike detection and linear trends over day × series count matrices.
+
+Every series (column) is scored in the same array operations: each day is
+compared with a trailing window of the days before it, either by z-score
+(mean and standard deviation) or by a robust score (median and scaled MAD).
+"""
+
+import warnings
+from typing import NamedTuple
+
+import numpy as np
+
+from ..constants import (
+    ANOMALY_METHOD,
+    ANOMALY_MIN_COUNT,
+    ANOMALY_MIN_PERIODS,
+    ANOMALY_THRESHOLD,
+    ANOMALY_WINDOW,
+)
+
+ANOMALY_METHODS = ("mad", "zscore")
+
+# Scales the MAD to a standard deviation for normally distributed data.
+_MAD_SCALE = 1.4826
+
+
+class AnomalyScores(NamedTuple):
+    """Per-day scores ([days × series]; NaN without enough history) and per-series trends."""
+
+    baseline: np.ndarray
+    spread: np.ndarray
+    score: np.ndarray
+    spikes: np.ndarray
+    slope: np.ndarray
+    intercept: np.ndarray
+
+
+def linear_trends(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Return least-squares (slope, intercept) per column of values against 0..n-1.
+
+    Equivalent to ``np.polyfit(x, column, 1)`` for every column at once (a 1-D
+    input gives 0-d results). Fewer than two rows give slope 0.
+    """
+    y = np.asarray(values, dtype=np.float64)
+    n = len(y)
+    x = np.arange(n, dtype=np.float64)
+    mean_y = y.mean(axis=0) if n else np.zeros(y.shape[1:])
+    if n < 2:
+        return np.zeros_like(mean_y), mean_y
+    dx = x - x.mean()
+    slope = np.tensordot(dx, y - mean_y, axes=(0, 0)) / (dx @ dx)
+    return slope, mean_y - slope * x.mean()
+
+
+def score_anomalies(
+    counts: np.ndarray,
+    method: str = ANOMALY_METHOD,
+    window: int = ANOMALY_WINDOW,
+    threshold: float = ANOMALY_THRESHOLD,
+    min_periods: int = ANOMALY_MIN_PERIODS,
+    min_count: float = ANOMALY_MIN_COUNT,
+) -> AnomalyScores:
+    """Score every day of every series against its trailing window of earlier days.
+
+    counts is [days × series] on a gap-free calendar. A day is a spike when its
+    score reaches threshold and its count reaches min_count; days with fewer
+    than min_periods earlier days have no score. The spread is floored at 1 so
+    a flat history does not turn a one-article change into a spike.
+    """
+    if method not in ANOMALY_METHODS:
+        raise ValueError(f"unknown anomaly method: {method}")
+    counts = np.asarray(counts, dtype=np.float64)
+    days = len(counts)
+    padded = np.vstack([np.full((window, counts.shape[1]), np.nan), counts])
+    # history[i] holds days i - window .. i - 1 (NaN before the first day).
+    history = np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)[:days]
+    enough = (~np.isnan(history)).sum(axis=-1) >= min_periods
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN windows
+        if method == "mad":
+            baseline = np.nanmedian(history, axis=-1)
+            deviation = np.abs(history - baseline[..., None])
+            spread = np.nanmedian(deviation, axis=-1) * _MAD_SCALE
+        else:
+            baseline = np.nanmean(history, axis=-1)
+            # Sample std (ddof=1), as pandas' rolling().std().
+            spread = np.nanstd(history, axis=-1, ddof=1)
+    baseline = np.where(enough, baseline, np.nan)
+    spread = np.where(enough, np.maximum(spread, 1.0), np.nan)
+    score = (counts - baseline) / spread
+    spikes = (np.nan_to_num(score) >= threshold) & (counts >= min_count)
+    slope, intercept = linear_trends(counts)
+    return AnomalyScores(baseline, spread, score, spikes, slope, intercept)
@@ -0,0 +1,78 @@
+"""Background dataset loading with parse progress, and progressively refined estimates."""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import pandas as pd
+
+from ..constants import APPROX_SAMPLE_FRACTIONS
+from .brands import Brand
+from .excel_handler import ExcelFileHandler
+
+_LOAD_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dataset-load")
+
+
+class BackgroundLoad:
+    """Parse a handler's workbook on a worker thread and expose its progress.
+
+    A handler that is already loaded (e.g. a fork of a preloaded one) is done at once.
+    """
+
+    def __init__(self, handler: ExcelFileHandler) -> None:
+        self.handler = handler
+        if handler.full_dataframe is not None:
+            self.progress = 1.0
+            self._future: Future = Future()
+            self._future.set_result(handler.full_dataframe)
+            return
+        self.progress = 0.0
+        self._future = _LOAD_EXECUTOR.submit(self._run)
+
+    def _run(self) -> pd.DataFrame:
+        df = self.handler.open_excel_file(self._set_progress)
+        self.handler.build_indexes()
+        return df
+
+    def _set_progress(self, fraction: float) -> None:
+        self.progress = fraction
+
+    def done(self) -> bool:
+        """Return True once parsing has finished (successfully or not)."""
+        return self._future.done()
+
+    def result(self, timeout: float | None = None) -> pd.DataFrame:
+        """Return the loaded dataframe, re-raising any parse error."""
+        return self._future.result(timeout)
+
+
+class ProgressiveEstimate:
+    """Estimate brand totals on ever larger samples on a worker thread.
+
+    Works on a filtered view, which later filter changes in the session do not
+    affect. ``latest`` holds (estimates, fraction, sampled rows) of the last
+    finished step; the last fraction (1.0) gives exact values.
+    """
+
+    def __init__(
+        self,
+        handler: ExcelFileHandler,
+        brands: list[Brand],
+        fractions: tuple[float, ...] = APPROX_SAMPLE_FRACTIONS,
+    ) -> None:
+        self.handler = handler
+        self.brands = brands
+        self.fractions = fractions
+        self.latest: tuple[pd.DataFrame, float, int] | None = None
+        self._future = _LOAD_EXECUTOR.submit(self._run)
+
+    def _run(self) -> None:
+        for fraction in self.fractions:
+            table, rows = self.handler.estimate_brand_totals(self.brands, fraction)
+            self.latest = (table, fraction, rows)
+
+    def done(self) -> bool:
+        """Return True once every step has finished (or one failed)."""
+        return self._future.done()
+
+    def result(self, timeout: float | None = None) -> None:
+        """Wait for the last step, re-raising any error."""
+        self._future.result(timeout)
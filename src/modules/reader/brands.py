@@ -0,0 +1,48 @@
+"""Tracked brands (name, Keywords term, aliases, color) read from config."""
+
+from typing import Any, NamedTuple
+
+from ..utils.helpers import brand_palette
+
+
+class Brand(NamedTuple):
+    """A tracked brand.
+
+    ``keyword`` is matched against the Keywords column (volume, reach, AVE,
+    sentiment); ``aliases`` extend it for headline and prominence matching.
+    """
+
+    name: str
+    keyword: str
+    aliases: tuple[str, ...] = ()
+    color: str | None = None
+
+    @property
+    def terms(self) -> list[str]:
+        """Return the keyword followed by its aliases."""
+        return [self.keyword, *self.aliases]
+
+
+def brands_from_config(config: dict[str, Any]) -> list[Brand]:
+    """Build brands from a config's ``brands`` list (one brand per keyword if absent).
+
+    Brands without a color take the next unused palette color.
+    """
+    entries = config.get("brands") or [{"keyword": k} for k in config.get("keywords", [])]
+    brands = []
+    for entry in entries:
+        keyword = entry.get("keyword") or entry.get("name")
+        if not keyword:
+            continue
+        brands.append(
+            Brand(
+                name=entry.get("name") or keyword,
+                keyword=keyword,
+                aliases=tuple(a for a in entry.get("aliases", []) if a and a != keyword),
+                color=entry.get("color"),
+            )
+        )
+    used = {b.color for b in brands if b.color}
+    spare = iter(c for c in brand_palette(len(brands) + len(used)) if c not in used)
+    return [b if b.color else b._replace(color=next(spare)) for b in brands]
+
@@ -5,6 +5,7 @@ import os
 from typing import Any
 
 from ..constants import CONFIG_PATH
+from .brands import Brand, brands_from_config
 
 
 def load_config(config_path: str | None = None) -> dict[str, Any]:
@@ -20,6 +21,11 @@ def get_keywords() -> list[str]:
     return config.get("keywords", [])
 
 
+def get_brands() -> list[Brand]:
+    """Return the tracked brands from the config file (one per keyword if not configured)."""
+    return brands_from_config(load_config())
+
+
 def get_keyword_media() -> dict[str, Any]:
     """Return the mapping of keywords to media sources."""
     config = load_config()
@@ -0,0 +1,335 @@
+"""Pre-aggregated day × keyword × sentiment × source × media-type × story cube."""
+
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from ..constants import (
+    COLUMN_AVE,
+    COLUMN_DATE,
+    COLUMN_KEYWORDS,
+    COLUMN_REACH,
+    COLUMN_SENTIMENT,
+    COLUMN_SOURCE,
+    DATE_FORMAT_READ,
+    SENTIMENT_VALUES,
+)
+from .filters import DatasetFilter
+
+CUBE_DIMENSIONS = ("day", "keyword", "sentiment", "source", "media_type", "representative")
+CUBE_MEASURES = ("count", "reach", "ave")
+
+
+def _aggregate(frame: pd.DataFrame) -> pd.DataFrame:
+    """Return per-row codes and measures summed into one row per cell."""
+    return (
+        frame.groupby(list(CUBE_DIMENSIONS), sort=False)
+        .agg(count=("reach", "size"), reach=("reach", "sum"), ave=("ave", "sum"))
+        .reset_index()
+    )
+
+
+class AggregateCube:
+    """Sparse table of counts and Reach/AVE sums per cell of the cube dimensions.
+
+    The keyword dimension holds every distinct raw ``Keywords`` value, so any
+    "Keywords contains one of these terms" predicate is evaluated once per
+    distinct value and answered by summing the matching cells. Missing values
+    get their own code (-1 for undated rows) so totals still include them.
+    ``rows`` keeps each row's codes and measures (full cube only), so a cube
+    over any subset of rows can be aggregated in the same code space.
+    """
+
+    def __init__(
+        self,
+        cells: pd.DataFrame,
+        days: pd.DatetimeIndex,
+        keyword_values: pd.Index,
+        sentiments: pd.Index,
+        sources: pd.Index,
+        media_types: pd.Index,
+        rows: pd.DataFrame | None = None,
+    ) -> None:
+        self.cells = cells
+        self.rows = rows
+        self.days = days
+        self.keyword_values = keyword_values
+        self.sentiments = sentiments
+        self.sources = sources
+        self.media_types = media_types
+        self._keyword_text = [str(v) for v in keyword_values]
+        self._keyword_text_lower = [t.lower() for t in self._keyword_text]
+
+    @classmethod
+    def build(
+        cls,
+        df: pd.DataFrame,
+        media_types: pd.Categorical | None = None,
+        representative: np.ndarray | None = None,
+    ) -> "AggregateCube":
+        """Aggregate the dataset in one grouped pass.
+
+        media_types holds per-row labels; representative flags the first
+        placement of each story (every row counts as one when omitted).
+        """
+        dates = pd.to_datetime(df[COLUMN_DATE], format=DATE_FORMAT_READ, errors="coerce")
+        day_codes, days = pd.factorize(dates.dt.normalize(), sort=True)
+        kw_codes, keyword_values = pd.factorize(df[COLUMN_KEYWORDS], use_na_sentinel=False)
+        sent_codes, sentiments = pd.factorize(df[COLUMN_SENTIMENT], use_na_sentinel=False)
+        src_codes, sources = pd.factorize(df[COLUMN_SOURCE], sort=True)
+        if media_types is None:
+            media_types = pd.Categorical.from_codes(np.full(len(df), -1), categories=[])
+        frame = pd.DataFrame(
+            {
+                "day": day_codes.astype(np.int32),
+                "keyword": kw_codes.astype(np.int32),
+                "sentiment": sent_codes.astype(np.int32),
+                "source": src_codes.astype(np.int32),
+                "media_type": np.asarray(media_types.codes, dtype=np.int32),
+                "representative": (
+                    np.ones(len(df), dtype=np.int8)
+                    if representative is None
+                    else np.asarray(representative, dtype=np.int8)
+                ),
+                "reach": pd.to_numeric(df[COLUMN_REACH], errors="coerce").to_numpy(),
+                "ave": pd.to_numeric(df[COLUMN_AVE], errors="coerce").to_numpy(),
+            }
+        )
+        return cls(
+            _aggregate(frame),
+            pd.DatetimeIndex(days),
+            keyword_values,
+            sentiments,
+            sources,
+            pd.Index(media_types.categories),
+            frame,
+        )
+
+    def _with_cells(self, cells: pd.DataFrame) -> "AggregateCube":
+        return AggregateCube(
+            cells,
+            self.days,
+            self.keyword_values,
+            self.sentiments,
+            self.sources,
+            self.media_types,
+        )
+
+    def restrict(self, flt: DatasetFilter | None) -> "AggregateCube":
+        """Return a cube over the cells kept by a dashboard filter (self if none).
+
+        Unique stories keep the cells of each story's first placement in the
+        whole dataset; combined with other filters that placement may be
+        filtered out, so use ``over_rows`` with the view's representatives.
+        """
+        if flt is None or not flt.is_active():
+            return self
+        cells = self.cells
+        if flt.start is not None or flt.end is not None:
+            lo = 0 if flt.start is None else self.days.searchsorted(pd.Timestamp(flt.start))
+            hi = (
+                len(self.days)
+                if flt.end is None
+                else self.days.searchsorted(pd.Timestamp(flt.end + timedelta(days=1)))
+            )
+            cells = cells[(cells["day"] >= lo) & (cells["day"] < hi)]
+        if flt.sources is not None:
+            codes = self.sources.get_indexer(list(flt.sources))
+            cells = cells[cells["source"].isin(codes[codes >= 0])]
+        if flt.sentiments is not None:
+            codes = self.sentiments.get_indexer(list(flt.sentiments))
+            cells = cells[cells["sentiment"].isin(codes[codes >= 0])]
+        if flt.unique_stories:
+            cells = cells[cells["representative"] == 1]
+        return self._with_cells(cells)
+
+    def over_rows(self, positions: np.ndarray) -> "AggregateCube":
+        """Return a cube over the given row positions, each counted as its own story."""
+        frame = self.rows.take(positions).assign(representative=np.int8(1))
+        return self._with_cells(_aggregate(frame))
+
+    def keyword_codes(self, keywords: list[str], case_sensitive: bool = False) -> np.ndarray:
+        """Return codes of Keywords values containing any of the given terms."""
+        texts = self._keyword_text if case_sensitive else self._keyword_text_lower
+        return np.array(
+            [i for i, t in enumerate(texts) if any(k in t for k in keywords)],
+            dtype=np.int32,
+        )
+
+    def select(self, keywords: list[str], case_sensitive: bool = False) -> pd.DataFrame:
+        """Return the cells whose Keywords value matches any of the given terms."""
+        codes = self.keyword_codes(keywords, case_sensitive)
+        return self.cells[self.cells["keyword"].isin(codes)]
+
+    def total(
+        self, keywords: list[str], measure: str = "count", case_sensitive: bool = False
+    ) -> float:
+        """Return the sum of a measure over matching rows."""
+        return self.select(keywords, case_sensitive)[measure].sum()
+
+    def sentiment_counts(
+        self, keywords: list[str], case_sensitive: bool = False
+    ) -> pd.Series:
+        """Return matching row counts indexed by sentiment label."""
+        cells = self.select(keywords, case_sensitive)
+        counts = cells.groupby("sentiment")["count"].sum()
+        return pd.Series(counts.to_numpy(), index=self.sentiments.take(counts.index))
+
+    def daily_counts(
+        self, keywords: list[str], case_sensitive: bool = False
+    ) -> pd.Series:
+        """Return matching row counts per dated day, indexed by day."""
+        cells = self.select(keywords, case_sensitive)
+        cells = cells[cells["day"] >= 0]
+        counts = cells.groupby("day")["count"].sum()
+        return pd.Series(counts.to_numpy(), index=self.days.take(counts.index))
+
+    def source_totals(
+        self, keywords: list[str], case_sensitive: bool = False
+    ) -> pd.DataFrame:
+        """Return count and AVE per source (sorted by source name) for matching rows."""
+        cells = self.select(keywords, case_sensitive)
+        cells = cells[cells["source"] >= 0]
+        totals = cells.groupby("source")[["count", "ave"]].sum()
+        totals.index = self.sources.take(totals.index)
+        return totals
+
+    def media_type_totals(
+        self, keyword_groups: dict[str, list[str]], case_sensitive: bool = False
+    ) -> pd.DataFrame:
+        """Return count, Reach and AVE per (group, media type) in one grouped pass.
+
+        Cells matching several groups are counted once for each of them.
+        """
+        parts = []
+        for name, keywords in keyword_groups.items():
+            codes = self.keyword_codes(keywords, case_sensitive)
+            part = self.cells.loc[
+                self.cells["keyword"].isin(codes), ["media_type", *CUBE_MEASURES]
+            ]
+            parts.append(part.assign(group=name))
+        if not parts:
+            return pd.DataFrame(columns=["group", "media_type", *CUBE_MEASURES])
+        totals = (
+            pd.concat(parts, ignore_index=True)
+            .groupby(["group", "media_type"], sort=False)[list(CUBE_MEASURES)]
+            .sum()
+            .reset_index()
+        )
+        totals = totals[totals["media_type"] >= 0]
+        totals["media_type"] = self.media_types.take(totals["media_type"].to_numpy())
+        return totals
+
+    def keyword_membership(
+        self, keyword_groups: list[list[str]], case_sensitive: bool = False
+    ) -> np.ndarray:
+        """Return a [Keywords value × group] boolean matrix of group matches."""
+        bits = np.zeros((len(self.keyword_values), len(keyword_groups)), dtype=bool)
+        for j, keywords in enumerate(keyword_groups):
+            bits[self.keyword_codes(keywords, case_sensitive), j] = True
+        return bits
+
+    def membership_cooccurrence(
+        self, membership: np.ndarray, sentiment: str | None = None
+    ) -> np.ndarray:
+        """Return the [group × group] count of rows belonging to both groups.
+
+        Rows sharing a Keywords value share memberships, so with ``n`` rows per
+        value this is ``Mᵀ · diag(n) · M``: the same as AND-ing per-group row
+        bitmaps and counting bits, at the cost of the distinct values only. The
+        diagonal holds each group's total. ``sentiment`` counts only those rows.
+        """
+        cells = self.cells
+        if sentiment is not None:
+            code = self.sentiments.get_indexer([sentiment])[0]
+            cells = cells[cells["sentiment"] == code]
+        rows = np.bincount(
+            cells["keyword"].to_numpy(),
+            weights=cells["count"].to_numpy(dtype=np.float64),
+            minlength=len(membership),
+        )
+        member = membership.astype(np.float64)
+        return np.rint((member.T * rows) @ member).astype(np.int64)
+
+    def membership_daily(self, membership: np.ndarray) -> pd.DataFrame:
+        """Return dated row counts per [calendar day × group] in one pass.
+
+        Days run without gaps (zero-filled) from the first to the last day with
+        rows; undated rows are left out. Columns are group positions.
+        """
+        cells = self.cells[self.cells["day"] >= 0]
+        groups = membership.shape[1]
+        if cells.empty:
+            return pd.DataFrame(np.zeros((0, groups)), index=pd.DatetimeIndex([]))
+        day = cells["day"].to_numpy(dtype=np.int64)
+        pair = day * len(self.keyword_values) + cells["keyword"].to_numpy()
+        pairs, inverse = np.unique(pair, return_inverse=True)
+        counts = np.bincount(inverse, weights=cells["count"].to_numpy(dtype=np.float64))
+        pair_day, pair_keyword = np.divmod(pairs, len(self.keyword_values))
+        # pairs are sorted by day, so each day's rows are one contiguous run.
+        days, starts = np.unique(pair_day, return_index=True)
+        per_day = np.add.reduceat(membership[pair_keyword] * counts[:, None], starts, axis=0)
+        dates = self.days.take(days)
+        calendar = pd.date_range(dates[0], dates[-1], freq="D")
+        out = np.zeros((len(calendar), groups))
+        out[(dates - dates[0]).days] = per_day
+        return pd.DataFrame(out, index=calendar)
+
+    def membership_sentiment_daily(
+        self, membership: np.ndarray, measure: str = "count"
+    ) -> tuple[pd.DatetimeIndex, np.ndarray]:
+        """Return a measure per [calendar day × sentiment × group] in one grouped pass.
+
+        Days run without gaps as in ``membership_daily`` (undated rows are left
+        out); sentiments follow SENTIMENT_VALUES, plus a last slot for rows with
+        any other or no label. Returns (calendar, values).
+        """
+        groups = membership.shape[1]
+        slots = len(SENTIMENT_VALUES) + 1
+        cells = self.cells[self.cells["day"] >= 0]
+        if cells.empty:
+            return pd.DatetimeIndex([]), np.zeros((0, slots, groups))
+        codes = self.sentiments.get_indexer(list(SENTIMENT_VALUES))
+        slot_of = np.full(len(self.sentiments), slots - 1)
+        slot_of[codes[codes >= 0]] = np.flatnonzero(codes >= 0)
+        day = cells["day"].to_numpy(dtype=np.int64)
+        # (day, sentiment slot, Keywords value) triples, summed before labelling.
+        pair = (day * slots + slot_of[cells["sentiment"].to_numpy()]) * len(
+            self.keyword_values
+        ) + cells["keyword"].to_numpy()
+        pairs, inverse = np.unique(pair, return_inverse=True)
+        values = np.bincount(
+            inverse, weights=np.nan_to_num(cells[measure].to_numpy(dtype=np.float64))
+        )
+        bucket, pair_keyword = np.divmod(pairs, len(self.keyword_values))
+        buckets, starts = np.unique(bucket, return_index=True)
+        per_bucket = np.add.reduceat(membership[pair_keyword] * values[:, None], starts, axis=0)
+        bucket_day, bucket_slot = np.divmod(buckets, slots)
+        dates = self.days.take(bucket_day)
+        calendar = pd.date_range(dates.min(), dates.max(), freq="D")
+        out = np.zeros((len(calendar), slots, groups))
+        out[(dates - calendar[0]).days, bucket_slot] = per_bucket
+        return calendar, out
+
+    def membership_totals(self, membership: np.ndarray) -> pd.DataFrame:
+        """Return count, Reach, AVE and per-sentiment counts per group in one pass.
+
+        ``membership`` comes from ``keyword_membership``; a cell counts towards
+        every group its Keywords value belongs to.
+        """
+        member = membership[self.cells["keyword"].to_numpy()].astype(np.float64)
+        count = self.cells["count"].to_numpy(dtype=np.float64)
+        codes = self.sentiments.get_indexer(list(SENTIMENT_VALUES))
+        sentiment = self.cells["sentiment"].to_numpy()
+        values = np.column_stack(
+            [
+                count,
+                self.cells["reach"].to_numpy(dtype=np.float64),
+                self.cells["ave"].to_numpy(dtype=np.float64),
+                *[np.where(sentiment == code, count, 0.0) for code in codes],
+            ]
+        )
+        return pd.DataFrame(
+            member.T @ values, columns=[*CUBE_MEASURES, *SENTIMENT_VALUES]
+        )
@@ -0,0 +1,152 @@
+"""Near-duplicate (syndicated) story detection with MinHash signatures and LSH banding."""
+
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from ..constants import (
+    COLUMN_HEADLINE,
+    COLUMN_OPENING_TEXT,
+    DEDUP_BANDS,
+    DEDUP_BLOCK_ROWS,
+    DEDUP_NUM_PERM,
+    DEDUP_SHINGLE_SIZE,
+    DEDUP_THRESHOLD,
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+_EMPTY = np.iinfo(np.uint32).max
+
+
+class StoryClusters(NamedTuple):
+    """Per-row story assignment; a cluster is labelled by its first row position."""
+
+    labels: np.ndarray
+    sizes: np.ndarray
+    representative: np.ndarray
+
+
+def _shingle_hashes(
+    texts: list[str], vocab: dict[str, int], size: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return hashed word shingles (flat) and the shingle count per text."""
+    ids: list[int] = []
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    for i, text in enumerate(texts):
+        tokens = _TOKEN.findall(text.lower())
+        ids.extend(vocab.setdefault(t, len(vocab)) for t in tokens)
+        lengths[i] = len(tokens)
+    token_ids = np.asarray(ids, dtype=np.uint64) + np.uint64(1)
+    if token_ids.size == 0:
+        return np.empty(0, dtype=np.uint64), np.zeros(len(texts), dtype=np.int64)
+    starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    pos = np.arange(token_ids.size) - starts
+    doc_len = np.repeat(lengths, lengths)
+    # Texts shorter than the shingle size contribute one shingle of all their tokens.
+    n_shingles = np.where(
+        lengths >= size, lengths - size + 1, (lengths > 0).astype(np.int64)
+    )
+    keep = pos < np.repeat(n_shingles, lengths)
+    hashes = np.zeros(token_ids.size, dtype=np.uint64)
+    last = token_ids.size - 1
+    index = np.arange(token_ids.size)
+    for j in range(size):
+        comp = np.where(pos + j < doc_len, token_ids[np.minimum(index + j, last)], 0)
+        hashes = (hashes ^ comp.astype(np.uint64)) * _MIX
+    return hashes[keep], n_shingles
+
+
+def minhash_signatures(
+    texts: pd.Series,
+    num_perm: int = DEDUP_NUM_PERM,
+    shingle_size: int = DEDUP_SHINGLE_SIZE,
+    block_rows: int = DEDUP_BLOCK_ROWS,
+    seed: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return (signatures [n × num_perm] uint32, has_shingles mask), built block by block."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+    values = texts.fillna("").astype(str).tolist()
+    signatures = np.full((len(values), num_perm), _EMPTY, dtype=np.uint32)
+    has_shingles = np.zeros(len(values), dtype=bool)
+    vocab: dict[str, int] = {}
+    for start in range(0, len(values), block_rows):
+        hashes, counts = _shingle_hashes(values[start : start + block_rows], vocab, shingle_size)
+        docs = np.flatnonzero(counts > 0)
+        if docs.size == 0:
+            continue
+        offsets = (np.cumsum(counts) - counts)[docs]
+        rows = start + docs
+        has_shingles[rows] = True
+        for k in range(num_perm):
+            permuted = ((a[k] * hashes + b[k]) >> np.uint64(32)).astype(np.uint32)
+            signatures[rows, k] = np.minimum.reduceat(permuted, offsets)
+    return signatures, has_shingles
+
+
+def _candidate_pairs(signatures: np.ndarray, rows: np.ndarray, bands: int) -> np.ndarray:
+    """Return unique (first, other) row pairs sharing at least one LSH band bucket."""
+    per_band = signatures.shape[1] // bands
+    pairs = []
+    for band in range(bands):
+        block = signatures[rows, band * per_band : (band + 1) * per_band].astype(np.uint64)
+        key = np.zeros(len(rows), dtype=np.uint64)
+        for col in range(block.shape[1]):
+            key = (key ^ block[:, col]) * _MIX
+        order = np.argsort(key, kind="stable")
+        sorted_key = key[order]
+        new_run = np.r_[True, sorted_key[1:] != sorted_key[:-1]]
+        run_first = np.maximum.accumulate(np.where(new_run, np.arange(len(order)), 0))
+        dup = ~new_run
+        if dup.any():
+            pairs.append(np.stack([rows[order[run_first[dup]]], rows[order[dup]]], axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def _connected_labels(n: int, pairs: np.ndarray) -> np.ndarray:
+    """Label connected components by their smallest member (array-based union-find)."""
+    labels = np.arange(n)
+    if pairs.size == 0:
+        return labels
+    u, v = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(labels[u], labels[v])
+        before = labels.copy()
+        np.minimum.at(labels, u, low)
+        np.minimum.at(labels, v, low)
+        labels = labels[labels]
+        if np.array_equal(labels, before):
+            return labels
+
+
+def find_story_clusters(
+    df: pd.DataFrame,
+    threshold: float = DEDUP_THRESHOLD,
+    bands: int = DEDUP_BANDS,
+) -> StoryClusters:
+    """Cluster rows whose Headline + Opening Text are near-duplicates.
+
+    Candidates come from LSH banding of MinHash signatures (near-linear in the
+    number of rows) and are kept when their estimated Jaccard similarity is at
+    least ``threshold``. Rows without any text are never clustered.
+    """
+    texts = (
+        df[COLUMN_HEADLINE].fillna("").astype(str)
+        + " "
+        + df[COLUMN_OPENING_TEXT].fillna("").astype(str)
+    )
+    signatures, has_shingles = minhash_signatures(texts.reset_index(drop=True))
+    rows = np.flatnonzero(has_shingles)
+    pairs = _candidate_pairs(signatures, rows, bands)
+    if pairs.size:
+        similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+        pairs = pairs[similarity >= threshold]
+    labels = _connected_labels(len(df), pairs)
+    sizes = np.bincount(labels, minlength=len(df))[labels]
+    return StoryClusters(labels, sizes, labels == np.arange(len(df)))
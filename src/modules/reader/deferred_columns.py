@@ -0,0 +1,89 @@
+"""Wide text columns held out of the resident dataframe and materialized on request.
+
+The columns are kept as Arrow arrays backed by a memory-mapped file: the shared
+dataset copy when the frame was mapped from one, otherwise a spill file written
+once after parsing (unlinked right after mapping where the OS allows it). Pages
+are only read in when a section actually asks for the text.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+
+def _spill(table: pa.Table, directory: str | None) -> pa.Table:
+    """Write table to an Arrow file and return it mapped read-only."""
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=directory, prefix="deferred-", suffix=".arrow")
+    try:
+        with os.fdopen(fd, "wb") as f, pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+        mapped = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    finally:
+        try:
+            os.remove(path)  # the mapping stays valid on POSIX
+        except OSError:
+            pass
+    return mapped
+
+
+class DeferredColumns:
+    """Columns split off a dataframe, restored into any of its row subsets."""
+
+    def __init__(self, table: pa.Table, order: list[str]) -> None:
+        self.table = table
+        self.order = order
+
+    @property
+    def names(self) -> list[str]:
+        """Return the deferred column names."""
+        return self.table.column_names
+
+    @classmethod
+    def split(
+        cls,
+        df: pd.DataFrame,
+        columns: tuple[str, ...] | list[str],
+        spill: bool = True,
+        directory: str | None = None,
+    ) -> tuple[pd.DataFrame, "DeferredColumns | None"]:
+        """Return (df without columns, their deferred copy); df unchanged if none can be split.
+
+        With spill false the columns are assumed to be backed by a mapped file
+        already (a shared dataset) and are referenced as they are.
+        """
+        names = [c for c in columns if c in df.columns]
+        if not names:
+            return df, None
+        try:
+            table = pa.Table.from_pandas(df[names], preserve_index=False)
+            if spill:
+                table = _spill(table, directory)
+        except (OSError, pa.ArrowException):
+            return df, None
+        return df.drop(columns=names), cls(table, list(df.columns))
+
+    def column(self, name: str) -> pd.Series:
+        """Return one deferred column over all rows."""
+        return self.table.column(name).to_pandas()
+
+    def restore(self, df: pd.DataFrame, rows: np.ndarray | None = None) -> pd.DataFrame:
+        """Return df with the deferred columns put back in their original places.
+
+        rows are the original row positions of df's rows (all rows, in order, if None).
+        """
+        out = df.copy(deep=False)
+        indices = None if rows is None else pa.array(np.asarray(rows, dtype=np.int64))
+        for name in self.names:
+            column = self.table.column(name)
+            if indices is not None:
+                column = column.take(indices)
+            values = column.to_pandas()
+            values.index = df.index
+            at = sum(1 for c in self.order[: self.order.index(name)] if c in out.columns)
+            out.insert(at, name, values)
+        return out
@@ -1,51 +1,639 @@
 """Excel file reading and dataset aggregation for media/sentiment analysis."""
 
+import copy
+import functools
+import hashlib
+import io
+import itertools
+import os
+import re
+import threading
 import warnings
-from typing import Any
+from typing import Any, Callable
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from ..constants import (
+    ANOMALY_METHOD,
+    ANOMALY_THRESHOLD,
+    ANOMALY_WINDOW,
     COLUMN_AVE,
+    COLUMN_CLUSTER_SIZE,
     COLUMN_DATE,
     COLUMN_HEADLINE,
     COLUMN_HIT_SENTENCE,
     COLUMN_INFLUENCER,
     COLUMN_KEYWORDS,
+    COLUMN_MEDIA_TYPE,
     COLUMN_OPENING_TEXT,
     COLUMN_REACH,
-    COLUMN_SENTIMENT,
     COLUMN_SOURCE,
     DATE_FORMAT_DISPLAY_PROMINENCE,
     DATE_FORMAT_DISPLAY_TREND,
-    DATE_FORMAT_READ,
     DEFAULT_SHEET_NAME,
+    DEFER_TEXT_COLUMNS,
+    DEFERRED_TEXT_COLUMNS,
+    DEFERRED_TEXT_DIR,
+    DISTRIBUTION_QUANTILES,
+    PROMINENCE_WEIGHTS,
+    REACH_AVE_BINS,
+    REACH_AVE_TOP_OUTLETS,
+    RESULT_MEMO_ENTRIES,
+    RESULT_STORE_DIR,
+    RESULT_STORE_MAX_BYTES,
+    RESULT_STORE_VERSION,
     SENTIMENT_VALUES,
+    SKETCH_CHUNK_ROWS,
+    TOP_TERMS_COUNT,
+    TOP_TERMS_MIN_ARTICLES,
 )
+from ..utils.disk_cache import DiskCache, file_fingerprint
+from ..utils.lru_cache import LRUCache
+from ..utils.sketches import KLLSketch
+from .anomalies import score_anomalies
+from .brands import Brand
+from .cube import AggregateCube
+from .dedup import StoryClusters, find_story_clusters
+from .deferred_columns import DeferredColumns
+from .filters import DatasetFilter, TimeIndex
+from .media_types import MediaTypeClassifier
+from .sampling import SampleDesign, estimate_ratios, estimate_totals
+from .shared_dataset import (
+    open_dataset,
+    open_text,
+    publish_dataset,
+    publish_text,
+    shared_dataset_path,
+)
+from .terms import TermMatrix
+from .text_scoring import TextColumns, lowered, score_levels
+
+_TEXT_COLUMNS = [COLUMN_HEADLINE, COLUMN_OPENING_TEXT, COLUMN_HIT_SENTENCE]
+_TERM_COLUMNS = [COLUMN_HEADLINE, COLUMN_HIT_SENTENCE]
+SHARE_OF_VOICE_WEIGHTS = ("count", "reach", "ave", "prominence")
+
+
+def _code_version() -> str:
+    """Hash the reader sources and constants, so stored results expire on deploy."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths = sorted(
+        os.path.join(here, name) for name in os.listdir(here) if name.endswith(".py")
+    )
+    paths.append(os.path.join(os.path.dirname(here), "constants.py"))
+    digest = hashlib.sha256(str(RESULT_STORE_VERSION).encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+_CODE_VERSION = _code_version()
+
+
+def _keyword_codes(df: pd.DataFrame) -> np.ndarray:
+    # Same factorization as the cube's keyword dimension, so cube codes apply.
+    return pd.factorize(df[COLUMN_KEYWORDS], use_na_sentinel=False)[0]
+
+
+def _text_column(
+    df: pd.DataFrame, deferred: DeferredColumns | None, prefix: str | None, name: str
+) -> pa.Array:
+    """Return one lower-cased scoring column, mapped from the shared copy when there is one."""
+    if prefix is not None:
+        mapped = open_text(prefix, name)
+        if mapped is not None:
+            return mapped
+    values = df[name] if deferred is None or name not in deferred.names else deferred.column(name)
+    array = lowered(values)
+    if prefix is None:
+        return array
+    try:
+        publish_text(prefix, name, array)
+    except (OSError, pa.ArrowException):
+        return array
+    mapped = open_text(prefix, name)
+    return array if mapped is None else mapped
+
+
+def open_result_store() -> DiskCache | None:
+    """Return the configured persistent results store, or None if disabled or unwritable."""
+    if not RESULT_STORE_DIR:
+        return None
+    try:
+        return DiskCache(RESULT_STORE_DIR, RESULT_STORE_MAX_BYTES)
+    except OSError:
+        return None
+
+
+def _freeze(value: Any) -> Any:
+    """Return value with lists (also nested) turned into tuples, so it can key a cache."""
+    if isinstance(value, list) or (isinstance(value, tuple) and not hasattr(value, "_fields")):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _keyword_terms(
+    keywords: str | list[str], extra_keywords: tuple[str, ...], case_sensitive: bool
+) -> list[str]:
+    """Return the keyword(s) as one list, lower-cased unless matching is case-sensitive."""
+    terms = [keywords] if isinstance(keywords, str) else list(keywords)
+    terms.extend(extra_keywords)
+    return terms if case_sensitive else [t.lower() for t in terms]
+
+
+def _rows_at(df: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+    """Return df's rows at sorted unique positions: a slice (no copy) if contiguous, else a copy."""
+    if len(positions) and positions[-1] - positions[0] + 1 == len(positions):
+        return df.iloc[positions[0] : positions[-1] + 1]
+    return df.take(positions)
+
+
+def _persisted(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Serve a query method through the handler's result caches, keyed by its arguments."""
+
+    @functools.wraps(method)
+    def wrapper(self: "ExcelFileHandler", *args: Any, **kwargs: Any) -> Any:
+        key = (_freeze(args), _freeze(tuple(sorted(kwargs.items()))))
+        return self._stored(method.__name__, key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
+
+
+def _persisted_by_keywords(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Like ``_persisted``, for case-insensitive keyword queries.
+
+    The key is the normalized keyword list, so ``"PAL"``, ``["pal"]`` and
+    ``("pal",)`` share one entry.
+    """
+
+    @functools.wraps(method)
+    def wrapper(
+        self: "ExcelFileHandler", keywords: str | list[str], *extra_keywords: str
+    ) -> Any:
+        key = tuple(self.normalize_keywords(keywords, *extra_keywords))
+        return self._stored(
+            method.__name__, key, lambda: method(self, keywords, *extra_keywords)
+        )
+
+    return wrapper
+
+
+class _Loaded:
+    """One loaded dataset and the indexes derived from it.
+
+    Shared by reference between a handler, its filtered views and its forks;
+    the lazily built parts (cube, story clusters, text, terms, …) are built
+    once under ``lock`` and then only read. Loading a new dataset replaces the
+    whole object, so views of the previous one keep a consistent copy.
+    """
+
+    def __init__(
+        self,
+        dataframe: pd.DataFrame,
+        deferred: DeferredColumns | None,
+        keyword_codes: np.ndarray | None,
+        fingerprint: str | None,
+        shared_prefix: str | None,
+    ) -> None:
+        self.generation = next(_GENERATIONS)
+        self.dataframe = dataframe
+        self.deferred = deferred
+        self.keyword_row_codes = keyword_codes
+        self.fingerprint = fingerprint
+        self.shared_prefix = shared_prefix
+        self.time_index: TimeIndex | None = None
+        self.cube: AggregateCube | None = None
+        self.story_clusters: StoryClusters | None = None
+        self.text: TextColumns | None = None
+        self.terms: TermMatrix | None = None
+        self.brand_bits: dict[tuple[Brand, ...], np.ndarray] = {}
+        self.sample_design: SampleDesign | None = None
+        self.lock = threading.RLock()
+        self.text_lock = threading.Lock()
+        self.terms_lock = threading.Lock()
+
+
+_GENERATIONS = itertools.count()
 
 
 class ExcelFileHandler:
-    """Handles reading and querying an Excel dataset (e.g. media coverage)."""
+    """Handles reading and querying an Excel dataset (e.g. media coverage).
 
-    def __init__(self, file: str | Any, sheet_name: str = DEFAULT_SHEET_NAME) -> None:
+    Queries run against the handler's filter, fixed when it is created:
+    ``filtered`` returns a new handler (a view) for another filter rather than
+    changing this one, so a query is always keyed and computed from the same
+    rows, cube and filter, whichever thread runs it.
+    """
+
+    def __init__(
+        self,
+        file: str | Any,
+        sheet_name: str = DEFAULT_SHEET_NAME,
+        store: DiskCache | None = None,
+        shared_dir: str | None = None,
+    ) -> None:
         self.file = file
         self.sheet_name = sheet_name
+        self.store = store
+        self.shared_dir = shared_dir
+        self._loaded: _Loaded | None = None
         self.dataframe: pd.DataFrame | None = None
+        self.filters = DatasetFilter()
+        self.cube: AggregateCube | None = None
+        self._positions: np.ndarray | None = None
+        self._sketches: dict[tuple[Any, ...], KLLSketch] = {}
+        self._term_sums: tuple[np.ndarray, np.ndarray] | None = None
+        self._last_view: ExcelFileHandler | None = None
+        self.memo = LRUCache(RESULT_MEMO_ENTRIES)
+
+    @property
+    def full_dataframe(self) -> pd.DataFrame | None:
+        """Return the whole loaded dataframe (None before loading)."""
+        return None if self._loaded is None else self._loaded.dataframe
+
+    @property
+    def fingerprint(self) -> str | None:
+        """Return the content hash of the loaded file (None if not computed)."""
+        return None if self._loaded is None else self._loaded.fingerprint
+
+    @property
+    def time_index(self) -> TimeIndex | None:
+        """Return the time index of the loaded dataset (None until ``build_indexes``)."""
+        return None if self._loaded is None else self._loaded.time_index
+
+    @property
+    def story_clusters(self) -> StoryClusters | None:
+        """Return the story clusters of the loaded dataset (None until built)."""
+        return None if self._loaded is None else self._loaded.story_clusters
+
+    def open_excel_file(
+        self, progress: Callable[[float], None] | None = None
+    ) -> pd.DataFrame:
+        """Load the Excel sheet into the internal dataframe and return it.
 
-    def open_excel_file(self) -> pd.DataFrame:
-        """Load the Excel sheet into the internal dataframe and return it."""
+        If progress is given it is called with the approximate fraction (0..1) of
+        the workbook consumed so far, from the thread doing the parsing.
+
+        With ``shared_dir`` set and a file path as source, the parsed sheet is
+        published there once and every handler maps that copy read-only.
+
+        The wide text columns (``DEFERRED_TEXT_COLUMNS``) are left out of the
+        returned dataframe; ``with_text`` adds them back where they are needed.
+        """
         try:
-            self.dataframe = pd.read_excel(
-                self.file, sheet_name=self.sheet_name, engine="openpyxl"
+            shared = self.shared_dir is not None and isinstance(self.file, (str, os.PathLike))
+            fingerprint = (
+                file_fingerprint(self.file) if self.store is not None or shared else None
             )
+            prefix = (
+                shared_dataset_path(self.shared_dir, fingerprint, self.sheet_name, _CODE_VERSION)
+                if shared
+                else None
+            )
+            mapped = open_dataset(prefix) if prefix else None
+            if mapped is None:
+                if progress is None:
+                    df = pd.read_excel(self.file, sheet_name=self.sheet_name, engine="openpyxl")
+                else:
+                    df = self._read_with_progress(progress)
+                if prefix:
+                    mapped = self._publish(prefix, df)
+            elif progress is not None:
+                progress(1.0)
+            df, keyword_codes = mapped if mapped is not None else (df, None)
+            deferred = None
+            if DEFER_TEXT_COLUMNS:
+                # A mapped frame's text is already file-backed; a parsed one is spilled.
+                df, deferred = DeferredColumns.split(
+                    df, DEFERRED_TEXT_COLUMNS, spill=mapped is None, directory=DEFERRED_TEXT_DIR
+                )
+            # The previous dataset is only dropped, not closed: forks and views may
+            # still use it, and its shared text segments are unlinked once the
+            # last of them lets go (``TextColumns.__del__``).
+            self._loaded = _Loaded(df, deferred, keyword_codes, fingerprint, prefix)
+            self.dataframe = df
+            self.filters = DatasetFilter()
+            self.cube = None
+            self._positions = None
+            self._sketches = {}
+            self._term_sums = None
+            self._last_view = None
+            self.memo.clear()
             return self.dataframe
         except Exception as e:
             raise RuntimeError(f"Failed to read Excel file: {e!s}") from e
 
+    @staticmethod
+    def _publish(prefix: str, df: pd.DataFrame) -> tuple[pd.DataFrame, np.ndarray] | None:
+        """Publish a freshly parsed sheet and map it back; None if it cannot be shared."""
+        try:
+            publish_dataset(prefix, df, _keyword_codes(df))
+        except (OSError, pa.ArrowException):
+            return None
+        return open_dataset(prefix)
+
+    def _read_with_progress(self, progress: Callable[[float], None]) -> pd.DataFrame:
+        owned = isinstance(self.file, (str, os.PathLike))
+        raw = open(self.file, "rb") if owned else self.file
+        try:
+            raw.seek(0, os.SEEK_END)
+            size = raw.tell()
+            raw.seek(0)
+            reader = io.BufferedReader(_ProgressReader(raw, size, progress))
+            df = pd.read_excel(reader, sheet_name=self.sheet_name, engine="openpyxl")
+        finally:
+            if owned:
+                raw.close()
+        progress(1.0)
+        return df
+
     def _ensure_loaded(self) -> None:
-        if self.dataframe is None:
+        if self._loaded is None:
             self.open_excel_file()
 
+    def build_indexes(self) -> None:
+        """Build the time index and aggregate cube (once per load)."""
+        self._ensure_loaded()
+        loaded = self._loaded
+        with loaded.lock:
+            if loaded.time_index is None:
+                loaded.time_index = TimeIndex(loaded.dataframe)
+            if loaded.keyword_row_codes is None:
+                loaded.keyword_row_codes = _keyword_codes(loaded.dataframe)
+        self.build_cube()
+
+    def _full_cube(self) -> AggregateCube:
+        """Return the unfiltered aggregate cube of the loaded dataset (built once per load)."""
+        self._ensure_loaded()
+        loaded = self._loaded
+        with loaded.lock:
+            if loaded.cube is None:
+                media_types = MediaTypeClassifier.from_config().classify(loaded.dataframe)
+                representative = (
+                    None if loaded.story_clusters is None else loaded.story_clusters.representative
+                )
+                loaded.cube = AggregateCube.build(loaded.dataframe, media_types, representative)
+            return loaded.cube
+
+    def build_cube(self) -> AggregateCube:
+        """Return the aggregate cube for this handler's filter, building it once per load."""
+        if self.cube is None:
+            self.cube = self._full_cube().restrict(self.filters)
+        return self.cube
+
+    def build_story_clusters(self) -> StoryClusters:
+        """Cluster syndicated copies of the same story (once per load).
+
+        Adds a Cluster Size column to the dataset and a story dimension to the
+        cube, so unique-story counts come from the same cube queries. Views
+        made earlier keep the dataframe and cube they were made with.
+        """
+        self._ensure_loaded()
+        loaded = self._loaded
+        with loaded.lock:
+            if loaded.story_clusters is None:
+                clusters = find_story_clusters(self.with_text(loaded.dataframe))
+                # A new frame rather than an added column: views share the old one.
+                loaded.dataframe = loaded.dataframe.assign(
+                    **{COLUMN_CLUSTER_SIZE: clusters.sizes}
+                )
+                loaded.story_clusters = clusters
+                loaded.cube = None
+                self._full_cube()
+            return loaded.story_clusters
+
+    def fork(self) -> "ExcelFileHandler":
+        """Return a handler sharing this one's loaded dataset and derived indexes.
+
+        The copy starts from this handler's filter and cached results but keeps
+        its own result memo, so a fully built handler can serve many sessions.
+        Indexes built later by any of them (text, terms, story clusters) are
+        shared by all.
+        """
+        self._ensure_loaded()
+        clone = copy.copy(self)
+        clone._sketches = dict(self._sketches)
+        clone._last_view = None
+        clone.memo = self.memo.copy()
+        return clone
+
+    def _stored(self, name: str, args: tuple[Any, ...], compute: Callable[[], Any]) -> Any:
+        """Return compute() through the in-memory memo and the persistent result store.
+
+        The memo (``memo``, bounded LRU with hit/miss counters) is keyed by the
+        loaded dataset, this handler's filter, method and arguments, and shared
+        with the handler's views, so repeated calls within and across reruns are
+        free. Misses go to the persistent store, when one is attached: its
+        entries carry dataset fingerprint, code version and sheet instead, so a
+        restart with the same file and code reads them back instead of recomputing.
+        """
+        self._ensure_loaded()
+        loaded = self._loaded
+        key = (self.filters, name, args)
+
+        def persisted() -> Any:
+            if self.store is None or loaded.fingerprint is None:
+                return compute()
+            stored_key = (loaded.fingerprint, _CODE_VERSION, self.sheet_name, *key)
+            return self.store.get_or_compute(stored_key, compute)
+
+        return self.memo.get_or_compute((loaded.generation, *key), persisted)
+
+    def filtered(self, flt: DatasetFilter | None = None) -> "ExcelFileHandler":
+        """Return a view of the dataset restricted to rows kept by the filter.
+
+        The view is a handler of its own whose filter, row positions, dataframe
+        and cube never change, so queries still running on an older view (e.g.
+        deferred sections of the previous rerun) are not affected by the new
+        one. Views share the loaded dataset, its indexes and the result memo
+        with this handler. The last view is reused while the filter is unchanged.
+
+        When the kept rows are one contiguous run (a date window over a
+        time-ordered sheet), the view's dataframe is a slice sharing the loaded
+        frame's buffers, mapped ones included; any other selection (sources,
+        sentiment, unique stories) copies the kept rows once per filter change.
+        """
+        self.build_indexes()
+        flt = flt or DatasetFilter()
+        loaded = self._loaded
+        last = self._last_view
+        if (
+            last is not None
+            and last.filters == flt
+            and last._loaded is loaded
+            and (not flt.unique_stories or loaded.story_clusters is not None)
+        ):
+            return last
+        if flt.unique_stories:
+            self.build_story_clusters()
+        view = copy.copy(self)
+        view.filters = flt
+        full = loaded.dataframe
+        cube = self._full_cube()
+        if flt.is_active():
+            positions = loaded.time_index.positions(flt)
+            if flt.unique_stories:
+                # The first placement of each story among the rows the other filters keep.
+                _, first = np.unique(
+                    loaded.story_clusters.labels[positions], return_index=True
+                )
+                positions = positions[np.sort(first)]
+            view._positions = positions
+            view.dataframe = _rows_at(full, positions)
+        else:
+            view._positions = None
+            view.dataframe = full
+        if flt.unique_stories and flt._replace(unique_stories=False).is_active():
+            view.cube = cube.over_rows(view._positions)
+        else:
+            view.cube = cube.restrict(flt)
+        view._sketches = {}
+        view._term_sums = None
+        view._last_view = None
+        self._last_view = view
+        return view
+
+    @_persisted
+    def keyword_mask(
+        self, keywords: str | list[str], *extra_keywords: str, case_sensitive: bool = False
+    ) -> np.ndarray:
+        """Return a boolean mask over the filtered rows whose Keywords match any keyword."""
+        self.build_indexes()
+        if case_sensitive:
+            kws = [keywords] if isinstance(keywords, str) else list(keywords)
+            kws.extend(extra_keywords)
+        else:
+            kws = self.normalize_keywords(keywords, *extra_keywords)
+        codes = self._full_cube().keyword_codes(kws, case_sensitive)
+        row_codes = self._loaded.keyword_row_codes
+        if self._positions is not None:
+            row_codes = row_codes[self._positions]
+        return np.isin(row_codes, codes)
+
+    def date_range(self) -> tuple[pd.Timestamp, pd.Timestamp] | None:
+        """Return the first and last timestamp among the filtered rows."""
+        self.build_indexes()
+        ts = self.time_index.timestamps
+        if self._positions is not None:
+            ts = ts[self._positions]
+        ts = ts[~np.isnat(ts)]
+        if len(ts) == 0:
+            return None
+        return pd.Timestamp(ts.min()), pd.Timestamp(ts.max())
+
+    def with_text(self, df: pd.DataFrame | None = None) -> pd.DataFrame:
+        """Return df (default: the filtered view) with the deferred text columns added back.
+
+        df must be the full dataframe or a row subset of it (its index labels are
+        the original row positions). The columns are read from their mapped Arrow
+        copy, so only the requested rows are materialized.
+        """
+        self._ensure_loaded()
+        df = self.dataframe if df is None else df
+        if self._loaded.deferred is None:
+            return df
+        rows = None if df is self.full_dataframe else df.index.to_numpy()
+        return self._loaded.deferred.restore(df, rows)
+
+    def text_columns(self) -> TextColumns:
+        """Return the lower-cased scoring text of the loaded dataset.
+
+        Each of Headline / Opening Text / Hit Sentence is built (or mapped from
+        the shared copy) when a query first reads it, and dropped with the
+        dataset when another one is loaded.
+        """
+        self._ensure_loaded()
+        loaded = self._loaded
+        with loaded.text_lock:
+            if loaded.text is None:
+                # Bound to the load's pieces, not to loaded: no reference cycle.
+                load = functools.partial(
+                    _text_column, loaded.dataframe, loaded.deferred, loaded.shared_prefix
+                )
+                loaded.text = TextColumns(load, len(loaded.dataframe))
+            return loaded.text
+
+    def term_matrix(self) -> TermMatrix:
+        """Return word and word-pair counts per row of Headline and Hit Sentence (built once)."""
+        text = self.text_columns()
+        loaded = self._loaded
+        with loaded.terms_lock:
+            if loaded.terms is None:
+                loaded.terms = TermMatrix.build([text.column(c) for c in _TERM_COLUMNS])
+            return loaded.terms
+
+    def _filtered_term_sums(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return ``column_sums`` of the term matrix over the filtered rows (once per filter)."""
+        sums = self._term_sums
+        if sums is None:
+            sums = self._term_sums = self.term_matrix().column_sums(self._positions)
+        return sums
+
+    @_persisted
+    def top_terms(
+        self,
+        keywords: str | list[str],
+        *extra_keywords: str,
+        by: str = "articles",
+        top: int = TOP_TERMS_COUNT,
+        min_articles: int = TOP_TERMS_MIN_ARTICLES,
+    ) -> pd.DataFrame:
+        """Return the top words and word pairs in Headline and Hit Sentence for a keyword group.
+
+        Columns: Term, Articles (group rows containing it), Mentions (occurrences),
+        Share (of group rows) and Lift (Share over the same share among the other
+        filtered rows, add-one smoothed). ``by="articles"`` ranks by Articles,
+        ``by="lift"`` by Lift among terms in at least min_articles group rows.
+        Terms made only of the keywords' own words are left out.
+        """
+        matrix = self.term_matrix()
+        filtered = np.arange(matrix.rows) if self._positions is None else self._positions
+        rows = filtered[self.keyword_mask(keywords, *extra_keywords)]
+        all_docs, _ = self._filtered_term_sums()
+        docs, total = matrix.column_sums(rows)
+        rest = len(filtered) - len(rows)
+        share = docs / max(len(rows), 1)
+        lift = share / ((all_docs - docs + 1) / (rest + 1))
+        if by == "lift":
+            candidates = np.flatnonzero(docs >= max(min_articles, 1))
+            order = candidates[np.lexsort((-docs[candidates], -lift[candidates]))]
+        elif by == "articles":
+            candidates = np.flatnonzero(docs > 0)
+            order = candidates[np.lexsort((-total[candidates], -docs[candidates]))]
+        else:
+            raise ValueError(f"unknown ranking: {by}")
+        own = {
+            word
+            for kw in self.normalize_keywords(keywords, *extra_keywords)
+            for word in re.findall(r"[^\W_]+", kw)
+        }
+        picked, labels = [], []
+        for column in order:
+            label = matrix.label(column)
+            if set(label.split()) <= own:
+                continue
+            picked.append(column)
+            labels.append(label)
+            if len(picked) == top:
+                break
+        picked = np.asarray(picked, dtype=np.int64)
+        return pd.DataFrame(
+            {
+                "Term": labels,
+                "Articles": docs[picked].astype(int),
+                "Mentions": total[picked].astype(int),
+                "Share": share[picked].round(4),
+                "Lift": lift[picked].round(2),
+            }
+        )
+
+    def _prominence_matrix(self, keyword_sets: list[str | list[str]]) -> np.ndarray:
+        """Return prominence scores [filtered rows × keyword sets] (0 where absent)."""
+        levels = score_levels(self.text_columns(), _TEXT_COLUMNS, keyword_sets, self._positions)
+        return np.append(PROMINENCE_WEIGHTS, 0.0)[levels]
+
     def normalize_keywords(
         self, keywords: str | list[str], *extra_keywords: str
     ) -> list[str]:
@@ -55,110 +643,478 @@ class ExcelFileHandler:
         out = list(keywords) + list(extra_keywords)
         return [k.lower() for k in out]
 
+    @_persisted_by_keywords
     def get_total_articles_keywords(
         self, keywords: str | list[str], *extra_keywords: str
     ) -> int:
         """Return total number of rows where Keywords contains any of the given keywords."""
-        self._ensure_loaded()
         kws = self.normalize_keywords(keywords, *extra_keywords)
-        return int(
-            self.dataframe[COLUMN_KEYWORDS]
-            .apply(lambda x: any(k in str(x).lower() for k in kws))
-            .sum()
-        )
+        return int(self.build_cube().total(kws))
 
+    @_persisted_by_keywords
     def count_mentions_headlines(
         self, keywords: str | list[str], *extra_keywords: str
     ) -> int:
         """Return count of rows where Headline contains any of the given keywords."""
-        self._ensure_loaded()
         kws = self.normalize_keywords(keywords, *extra_keywords)
-        return int(
-            self.dataframe[COLUMN_HEADLINE]
-            .apply(lambda x: any(k in str(x).lower() for k in kws))
-            .sum()
-        )
+        levels = score_levels(self.text_columns(), [COLUMN_HEADLINE], [kws], self._positions)
+        return int((levels[:, 0] == 0).sum())
 
+    @_persisted_by_keywords
     def get_reach_sum(self, keywords: str | list[str], *extra_keywords: str) -> float:
         """Return sum of Reach for rows matching the given keywords."""
-        self._ensure_loaded()
         kws = self.normalize_keywords(keywords, *extra_keywords)
-        mask = self.dataframe[COLUMN_KEYWORDS].apply(
-            lambda x: any(k in str(x).lower() for k in kws)
-        )
-        return float(self.dataframe.loc[mask, COLUMN_REACH].sum())
+        return float(self.build_cube().total(kws, "reach"))
 
+    @_persisted_by_keywords
     def get_ave_sum(self, keywords: str | list[str], *extra_keywords: str) -> float:
         """Return sum of AVE for rows matching the given keywords."""
-        self._ensure_loaded()
         kws = self.normalize_keywords(keywords, *extra_keywords)
-        mask = self.dataframe[COLUMN_KEYWORDS].apply(
-            lambda x: any(k in str(x).lower() for k in kws)
-        )
-        return float(self.dataframe.loc[mask, COLUMN_AVE].sum())
+        return float(self.build_cube().total(kws, "ave"))
 
+    @_persisted_by_keywords
     def get_sentiment_counts(
         self, keywords: str | list[str], *extra_keywords: str
     ) -> dict[str, int]:
         """Return counts of Positive, Neutral, Negative for rows matching the keywords."""
-        self._ensure_loaded()
         kws = self.normalize_keywords(keywords, *extra_keywords)
-        mask = self.dataframe[COLUMN_KEYWORDS].apply(
-            lambda x: any(k in str(x).lower() for k in kws)
-        )
-        filtered = self.dataframe[mask]
-        return {
-            "Positive": int((filtered[COLUMN_SENTIMENT] == "Positive").sum()),
-            "Neutral": int((filtered[COLUMN_SENTIMENT] == "Neutral").sum()),
-            "Negative": int((filtered[COLUMN_SENTIMENT] == "Negative").sum()),
-        }
+        counts = self.build_cube().sentiment_counts(kws)
+        return {s: int(counts.get(s, 0)) for s in SENTIMENT_VALUES}
 
+    @_persisted
     def count_daily_trendline(
-        self, keywords: str | list[str], *extra_keywords: str
+        self, keywords: str | list[str], *extra_keywords: str, case_sensitive: bool = True
     ) -> pd.DataFrame:
         """Return daily counts (Date, Count) for rows matching the keywords."""
-        self._ensure_loaded()
-        df_copy = self.dataframe.copy()
-        df_copy[COLUMN_DATE] = pd.to_datetime(df_copy[COLUMN_DATE], format=DATE_FORMAT_READ)
-        keyword_list = [keywords] if isinstance(keywords, str) else list(keywords)
-        keyword_list.extend(extra_keywords)
-        filtered = df_copy[
-            df_copy[COLUMN_KEYWORDS].apply(
-                lambda x: any(kw in str(x) for kw in keyword_list)
-            )
+        keyword_list = _keyword_terms(keywords, extra_keywords, case_sensitive)
+        counts = self.build_cube().daily_counts(keyword_list, case_sensitive)
+        daily = pd.DataFrame({COLUMN_DATE: counts.index, "Count": counts.to_numpy()})
+        daily[COLUMN_DATE] = daily[COLUMN_DATE].dt.strftime(DATE_FORMAT_DISPLAY_TREND)
+        daily = daily.sort_values(COLUMN_DATE)
+        return daily[[COLUMN_DATE, "Count"]]
+
+    def _brand_membership(self, brands: list[Brand]) -> np.ndarray:
+        """Return [Keywords value × brand] membership, labelled once per load and brand list."""
+        self.build_indexes()
+        key = tuple(brands)
+        bits = self._loaded.brand_bits
+        if key not in bits:
+            bits[key] = self._full_cube().keyword_membership([[b.keyword.lower()] for b in brands])
+        return bits[key]
+
+    def brand_totals(self, brands: list[Brand]) -> pd.DataFrame:
+        """Return Mentions, Reach, AVE and sentiment counts per brand in one pass over the cube."""
+        totals = self.build_cube().membership_totals(self._brand_membership(brands))
+        totals = totals.rename(columns={"count": "Mentions", "reach": "Reach", "ave": "AVE"})
+        for col in ["Mentions", *SENTIMENT_VALUES]:
+            totals[col] = totals[col].astype(int)
+        totals.insert(0, "Brand", [b.name for b in brands])
+        return totals
+
+    def brand_cooccurrence(
+        self, brands: list[Brand], sentiment: str | None = None
+    ) -> pd.DataFrame:
+        """Return the brand × brand matrix of rows whose Keywords match both brands.
+
+        Indexed and labelled by brand name; the diagonal is each brand's mentions.
+        With ``sentiment``, only rows of that sentiment are counted.
+        """
+        names = [b.name for b in brands]
+        matrix = self.build_cube().membership_cooccurrence(
+            self._brand_membership(brands), sentiment
+        )
+        return pd.DataFrame(matrix, index=pd.Index(names, name="Brand"), columns=names)
+
+    def sample_design(self) -> SampleDesign:
+        """Return the day × source sampling design of the dataset (built once per load)."""
+        self.build_indexes()
+        loaded = self._loaded
+        with loaded.lock:
+            if loaded.sample_design is None:
+                loaded.sample_design = SampleDesign.from_index(loaded.time_index)
+            return loaded.sample_design
+
+    def estimate_brand_totals(
+        self, brands: list[Brand], fraction: float
+    ) -> tuple[pd.DataFrame, int]:
+        """Estimate ``brand_totals`` from a stratified sample of the filtered rows.
+
+        Returns (estimates, sampled rows). Estimates has Brand, then Mentions,
+        Reach, AVE and each sentiment's share of the brand's mentions, each
+        followed by a ``± …`` column with the confidence interval half-width.
+        A fraction of 1 gives the exact values with zero margins.
+        """
+        sample = self.sample_design().sample(fraction, self._positions)
+        rows = sample.rows
+        member = self._brand_membership(brands)[self._loaded.keyword_row_codes[rows]].astype(np.float64)
+        frame = self.full_dataframe
+        measures = {
+            "Reach": pd.to_numeric(frame[COLUMN_REACH].take(rows), errors="coerce"),
+            "AVE": pd.to_numeric(frame[COLUMN_AVE].take(rows), errors="coerce"),
+        }
+        columns = [member] + [
+            member * np.nan_to_num(m.to_numpy(dtype=np.float64))[:, None]
+            for m in measures.values()
         ]
-        daily = (
-            filtered.groupby(filtered[COLUMN_DATE].dt.date)
-            .size()
-            .reset_index(name="Count")
+        totals = [estimate_totals(values, sample) for values in columns]
+        index = self.time_index
+        sentiment = index.sentiment_codes[rows]
+        shares = [
+            estimate_ratios(member * ((sentiment == code) & (code >= 0))[:, None], member, sample)
+            for code in index.sentiments.get_indexer(list(SENTIMENT_VALUES))
+        ]
+        out = pd.DataFrame({"Brand": [b.name for b in brands]})
+        for name, estimate in zip(["Mentions", *measures], totals):
+            out[name] = estimate.value
+            out[f"{name} ±"] = estimate.margin
+        for name, estimate in zip(SENTIMENT_VALUES, shares):
+            out[f"{name} share"] = estimate.value
+            out[f"{name} share ±"] = estimate.margin
+        return out, len(rows)
+
+    @_persisted
+    def brand_summary(self, brands: list[Brand]) -> pd.DataFrame:
+        """Return ``brand_totals`` plus Headline Mentions (keyword or any alias) per brand."""
+        totals = self.brand_totals(brands)
+        levels = score_levels(
+            self.text_columns(),
+            [COLUMN_HEADLINE],
+            [[t.lower() for t in b.terms] for b in brands],
+            self._positions,
         )
-        daily[COLUMN_DATE] = pd.to_datetime(daily[COLUMN_DATE]).dt.strftime(
-            DATE_FORMAT_DISPLAY_TREND
+        totals.insert(2, "Headline Mentions", (levels == 0).sum(axis=0).astype(int))
+        return totals
+
+    @_persisted
+    def share_of_voice(
+        self, brands: list[Brand], weight: str = "count", sentiment: str | None = None
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Return each brand's share of voice, weighted by articles, Reach, AVE or prominence.
+
+        weight is one of SHARE_OF_VOICE_WEIGHTS. Counts, Reach and AVE come from
+        one grouped pass over the cube's brand memberships; prominence scores
+        every filtered article's text once for all brands (keyword or alias).
+        With ``sentiment``, only articles of that sentiment count.
+
+        Returns (totals, daily): totals has Brand, Value, Share and the value per
+        sentiment; daily has Date, Brand, Value and Share of that day's voice.
+        """
+        if weight not in SHARE_OF_VOICE_WEIGHTS:
+            raise ValueError(f"unknown share of voice weight: {weight}")
+        self.build_indexes()
+        if weight == "prominence":
+            calendar, values = self._prominence_sentiment_daily(brands)
+        else:
+            calendar, values = self.build_cube().membership_sentiment_daily(
+                self._brand_membership(brands), weight
+            )
+        by_sentiment = values.sum(axis=0)
+        if sentiment is not None:
+            values = values[:, [list(SENTIMENT_VALUES).index(sentiment)]]
+        per_day = values.sum(axis=1)
+        value = per_day.sum(axis=0)
+        names = [b.name for b in brands]
+        share = value / value.sum() if value.sum() > 0 else np.zeros_like(value)
+        totals = pd.DataFrame(
+            {
+                "Brand": names,
+                "Value": value.round(2),
+                "Share": share.round(4),
+                **{s: by_sentiment[i].round(2) for i, s in enumerate(SENTIMENT_VALUES)},
+            }
         )
-        daily = daily.sort_values(COLUMN_DATE)
-        return daily[[COLUMN_DATE, "Count"]]
+        day_total = per_day.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            day_share = np.where(day_total > 0, per_day / day_total, 0.0)
+        daily = pd.DataFrame(
+            {
+                "Date": np.repeat(calendar.strftime(DATE_FORMAT_DISPLAY_TREND), len(names)),
+                "Brand": np.tile(names, len(calendar)),
+                "Value": per_day.ravel().round(2),
+                "Share": day_share.ravel().round(4),
+            }
+        )
+        return totals, daily
 
-    def get_top_publications(
-        self, keyword: str, *extra_keywords: str
+    def _prominence_sentiment_daily(
+        self, brands: list[Brand]
+    ) -> tuple[pd.DatetimeIndex, np.ndarray]:
+        """Return prominence per [calendar day × sentiment × brand], shaped as the cube's."""
+        slots = len(SENTIMENT_VALUES) + 1
+        scores = self._prominence_matrix([[t.lower() for t in b.terms] for b in brands])
+        index = self.time_index
+        rows = (
+            np.arange(len(index.timestamps)) if self._positions is None else self._positions
+        )
+        days = index.timestamps[rows].astype("datetime64[D]")
+        dated = ~np.isnat(days)
+        if not dated.any():
+            return pd.DatetimeIndex([]), np.zeros((0, slots, len(brands)))
+        codes = index.sentiments.get_indexer(list(SENTIMENT_VALUES))
+        slot_of = np.full(len(index.sentiments) + 1, slots - 1)
+        slot_of[codes[codes >= 0] + 1] = np.flatnonzero(codes >= 0)
+        slot = slot_of[index.sentiment_codes[rows] + 1][dated]
+        days = days[dated]
+        calendar = pd.date_range(days.min(), days.max(), freq="D")
+        out = np.zeros((len(calendar) * slots, len(brands)))
+        np.add.at(out, (days - days.min()).astype(np.int64) * slots + slot, scores[dated])
+        return calendar, out.reshape(len(calendar), slots, len(brands))
+
+    @_persisted
+    def brand_anomalies(
+        self,
+        brands: list[Brand],
+        method: str = ANOMALY_METHOD,
+        window: int = ANOMALY_WINDOW,
+        threshold: float = ANOMALY_THRESHOLD,
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """Score every brand's daily mentions for spikes in one vectorized pass.
+
+        Returns (daily, trends): daily has one row per calendar day and brand
+        with Date, Brand, Count, Baseline, Score and Spike; trends has Brand,
+        Slope (articles/day over the filtered range) and Spikes. See
+        ``score_anomalies`` for the scoring.
+        """
+        self.build_indexes()
+        counts = self.build_cube().membership_daily(self._brand_membership(brands))
+        scores = score_anomalies(counts.to_numpy(), method, window, threshold)
+        names = [b.name for b in brands]
+        days = counts.index.strftime(DATE_FORMAT_DISPLAY_TREND)
+        daily = pd.DataFrame(
+            {
+                "Date": np.repeat(days, len(names)),
+                "Brand": np.tile(names, len(days)),
+                "Count": counts.to_numpy().ravel().round().astype(int),
+                "Baseline": scores.baseline.ravel().round(1),
+                "Score": scores.score.ravel().round(2),
+                "Spike": scores.spikes.ravel(),
+            }
+        )
+        trends = pd.DataFrame(
+            {
+                "Brand": names,
+                "Slope": np.asarray(scores.slope).round(2),
+                "Spikes": scores.spikes.sum(axis=0).astype(int),
+            }
+        )
+        return daily, trends
+
+    def media_type_breakdown(
+        self, keyword_groups: list[str | list[str]]
     ) -> pd.DataFrame:
-        """Return top 5 sources by volume and AVE for the given keyword(s)."""
-        self._ensure_loaded()
-        keyword_list = [keyword] + list(extra_keywords)
-        filtered = self.dataframe[
-            self.dataframe[COLUMN_KEYWORDS].apply(
-                lambda x: any(kw in str(x) for kw in keyword_list)
+        """Return Count, Reach and AVE per media type for each keyword (or keyword group)."""
+        groups = {
+            (g if isinstance(g, str) else g[0]): self.normalize_keywords(g)
+            for g in keyword_groups
+            if g
+        }
+        totals = self.build_cube().media_type_totals(groups)
+        return totals.rename(
+            columns={
+                "group": "Keyword",
+                "media_type": COLUMN_MEDIA_TYPE,
+                "count": "Count",
+                "reach": "Reach",
+                "ave": "AVE",
+            }
+        ).reset_index(drop=True)
+
+    def distribution_sketches(
+        self, keyword_groups: list[str | list[str]], column: str
+    ) -> dict[str, KLLSketch]:
+        """Return a KLL sketch of a numeric column per keyword group, streamed in chunks.
+
+        Sketches are built chunk by chunk and merged, so no column is ever fully
+        sorted; they are kept until the data or filters change.
+        """
+        groups = {(g if isinstance(g, str) else g[0]): g for g in keyword_groups if g}
+        out = {}
+        for name, group in groups.items():
+            key = (column, name)
+            if key not in self._sketches:
+                values = pd.to_numeric(self.dataframe[column], errors="coerce").to_numpy()
+                mask = self.keyword_mask(group)
+                sketch = KLLSketch()
+                for start in range(0, len(values), SKETCH_CHUNK_ROWS):
+                    stop = start + SKETCH_CHUNK_ROWS
+                    sketch.merge(KLLSketch().update(values[start:stop][mask[start:stop]]))
+                self._sketches[key] = sketch
+            out[name] = self._sketches[key]
+        return out
+
+    def distribution_stats(
+        self,
+        keyword_groups: list[str | list[str]],
+        columns: tuple[str, ...] = (COLUMN_REACH, COLUMN_AVE),
+    ) -> pd.DataFrame:
+        """Return Count, p50, p90, p99 and Max of each column per keyword group."""
+        rows = []
+        for column in columns:
+            for name, sketch in self.distribution_sketches(keyword_groups, column).items():
+                p50, p90, p99 = sketch.quantile(list(DISTRIBUTION_QUANTILES))
+                rows.append(
+                    {
+                        "Keyword": name,
+                        "Measure": column,
+                        "Count": sketch.count,
+                        "p50": p50,
+                        "p90": p90,
+                        "p99": p99,
+                        "Max": sketch.max if sketch.count else np.nan,
+                    }
+                )
+        return pd.DataFrame(
+            rows, columns=["Keyword", "Measure", "Count", "p50", "p90", "p99", "Max"]
+        )
+
+    def distribution_histogram(
+        self, keyword_groups: list[str | list[str]], column: str, bins: int = 24
+    ) -> pd.DataFrame:
+        """Return approximate counts per log-spaced bin of a column, per keyword group."""
+        sketches = self.distribution_sketches(keyword_groups, column)
+        filled = [s for s in sketches.values() if s.count]
+        if not filled:
+            return pd.DataFrame(columns=["Keyword", "Bin Start", "Bin End", "Count"])
+        low = max(min(s.min for s in filled), 0.0)
+        high = max(s.max for s in filled)
+        edges = np.unique(np.expm1(np.linspace(np.log1p(low), np.log1p(high), bins + 1)))
+        if len(edges) < 2:
+            # Every value is the same (e.g. a single article): one bin [low, low].
+            edges = np.array([low, low])
+        parts = []
+        for name, sketch in sketches.items():
+            # First bin is closed on the left so the minimum is counted.
+            counts = np.diff(np.concatenate([[0.0], sketch.cdf(edges[1:])]))
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "Keyword": name,
+                        "Bin Start": edges[:-1],
+                        "Bin End": edges[1:],
+                        "Count": counts.round().astype(int),
+                    }
+                )
             )
-        ]
-        volume_counts = (
-            filtered.groupby(COLUMN_SOURCE).size().sort_values(ascending=False).head(5)
+        return pd.concat(parts, ignore_index=True)
+
+    def _reach_ave_cells(
+        self, keyword_groups: list[str | list[str]], bins: int
+    ) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return per-group row masks, log1p Reach/AVE and the shared log-spaced edges.
+
+        Rows without a usable (non-negative) Reach and AVE are left out of every mask.
+        """
+        reach = pd.to_numeric(self.dataframe[COLUMN_REACH], errors="coerce").to_numpy(float)
+        ave = pd.to_numeric(self.dataframe[COLUMN_AVE], errors="coerce").to_numpy(float)
+        valid = (reach >= 0) & (ave >= 0)  # False for NaN
+        masks = {
+            (g if isinstance(g, str) else g[0]): self.keyword_mask(g) & valid
+            for g in keyword_groups
+            if g
+        }
+        x = np.log1p(np.where(valid, reach, 0.0))
+        y = np.log1p(np.where(valid, ave, 0.0))
+        union = np.logical_or.reduce(list(masks.values())) if masks else valid[:0]
+
+        def edges(values: np.ndarray) -> np.ndarray:
+            low, high = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+            return np.linspace(low, high if high > low else low + 1.0, bins + 1)
+
+        return masks, x, y, edges(x[union]), edges(y[union])
+
+    def reach_ave_density(
+        self, keyword_groups: list[str | list[str]], bins: int = REACH_AVE_BINS
+    ) -> pd.DataFrame:
+        """Return article counts per (Reach, AVE) cell for each keyword group.
+
+        Rows are binned here with ``np.histogram2d`` on log1p scales, over edges
+        shared by all groups, so there are bins × bins cells per group (empty
+        ones included) however many rows match.
+        """
+        masks, x, y, x_edges, y_edges = self._reach_ave_cells(keyword_groups, bins)
+        reach_bin, ave_bin = np.meshgrid(np.arange(bins), np.arange(bins), indexing="ij")
+        reach_edges, ave_edges = np.expm1(x_edges), np.expm1(y_edges)
+        parts = []
+        for name, mask in masks.items():
+            counts, _, _ = np.histogram2d(x[mask], y[mask], bins=[x_edges, y_edges])
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "Keyword": name,
+                        "Reach Bin": reach_bin.ravel(),
+                        "AVE Bin": ave_bin.ravel(),
+                        "Reach Start": reach_edges[reach_bin.ravel()],
+                        "Reach End": reach_edges[reach_bin.ravel() + 1],
+                        "AVE Start": ave_edges[ave_bin.ravel()],
+                        "AVE End": ave_edges[ave_bin.ravel() + 1],
+                        "Count": counts.ravel().astype(int),
+                    }
+                )
+            )
+        if not parts:
+            return pd.DataFrame(
+                columns=[
+                    "Keyword", "Reach Bin", "AVE Bin", "Reach Start", "Reach End",
+                    "AVE Start", "AVE End", "Count",
+                ]
+            )
+        return pd.concat(parts, ignore_index=True)
+
+    def reach_ave_cell_outlets(
+        self,
+        keyword_groups: list[str | list[str]],
+        keyword: str,
+        reach_bin: int,
+        ave_bin: int,
+        bins: int = REACH_AVE_BINS,
+        top: int = REACH_AVE_TOP_OUTLETS,
+    ) -> pd.DataFrame:
+        """Return the top sources of one group's articles in one ``reach_ave_density`` cell.
+
+        keyword_groups and bins must match the density call so the edges agree.
+        Columns: Source, Articles, Reach, AVE and AVE per 1K Reach.
+        """
+        masks, x, y, x_edges, y_edges = self._reach_ave_cells(keyword_groups, bins)
+        columns = ["Source", "Articles", "Reach", "AVE", "AVE per 1K Reach"]
+        if keyword not in masks:
+            return pd.DataFrame(columns=columns)
+
+        def cell(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+            # histogram2d's rule: half-open bins, the last one closed on the right.
+            return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+
+        # The group's rows lie within the shared edges, which span every group.
+        inside = (
+            masks[keyword] & (cell(x, x_edges) == reach_bin) & (cell(y, y_edges) == ave_bin)
         )
-        top_5 = volume_counts.index.tolist()
-        ave_sums = (
-            filtered[filtered[COLUMN_SOURCE].isin(top_5)]
-            .groupby(COLUMN_SOURCE)[COLUMN_AVE]
-            .sum()
-            .round(2)
+        rows = self.dataframe.loc[inside, [COLUMN_SOURCE, COLUMN_REACH, COLUMN_AVE]]
+        outlets = (
+            rows.groupby(COLUMN_SOURCE)
+            .agg(
+                Articles=(COLUMN_REACH, "size"),
+                Reach=(COLUMN_REACH, "sum"),
+                AVE=(COLUMN_AVE, "sum"),
+            )
+            .sort_values(["Articles", "AVE"], ascending=False)
+            .head(top)
+            .reset_index()
+            .rename(columns={COLUMN_SOURCE: "Source"})
         )
+        reach_k = outlets["Reach"].where(outlets["Reach"] > 0) / 1000
+        outlets["AVE per 1K Reach"] = (outlets["AVE"] / reach_k).round(2)
+        outlets["AVE"] = outlets["AVE"].round(2)
+        return outlets[columns]
+
+    @_persisted
+    def get_top_publications(
+        self, keyword: str, *extra_keywords: str, case_sensitive: bool = True
+    ) -> pd.DataFrame:
+        """Return top 5 sources by volume and AVE for the given keyword(s)."""
+        keyword_list = _keyword_terms(keyword, extra_keywords, case_sensitive)
+        totals = self.build_cube().source_totals(keyword_list, case_sensitive)
+        volume_counts = totals["count"].sort_values(ascending=False).head(5)
+        top_5 = volume_counts.index.tolist()
+        ave_sums = totals["ave"].round(2)
         result = pd.DataFrame(
             {
                 "Rank": range(1, len(top_5) + 1),
@@ -171,18 +1127,13 @@ class ExcelFileHandler:
         result["Rank"] = range(1, len(result) + 1)
         return result
 
+    @_persisted
     def get_top_authors(
-        self, keywords: str | list[str], *extra_keywords: str
+        self, keywords: str | list[str], *extra_keywords: str, case_sensitive: bool = True
     ) -> pd.DataFrame:
         """Return top 5 influencers by volume and AVE for the given keyword(s)."""
-        self._ensure_loaded()
-        keyword_list = [keywords] if isinstance(keywords, str) else list(keywords)
-        keyword_list.extend(extra_keywords)
-        filtered = self.dataframe[
-            self.dataframe[COLUMN_KEYWORDS].apply(
-                lambda x: any(kw in str(x) for kw in keyword_list)
-            )
-        ]
+        keyword_list = _keyword_terms(keywords, extra_keywords, case_sensitive)
+        filtered = self.dataframe[self.keyword_mask(keyword_list, case_sensitive=case_sensitive)]
         if filtered.empty:
             return pd.DataFrame(columns=["Rank", "Influencer", "Volume", "AVE"])
         volume_counts = (
@@ -214,40 +1165,25 @@ class ExcelFileHandler:
         self, overview_keywords: list[str]
     ) -> pd.DataFrame:
         """Build a summary DataFrame of mention counts and sentiment for overview charts."""
-        self._ensure_loaded()
-        keywords = [kw for kw in overview_keywords if kw]
-        sentiment_data = self.get_sentiment_counts(keywords[0]) if keywords else {}
-        airline_mentions = {kw: self.get_total_articles_keywords(kw) for kw in keywords}
-        metric_names = list(airline_mentions.keys()) + list(SENTIMENT_VALUES)
-        values = list(airline_mentions.values()) + [
-            sentiment_data.get("Positive", 0),
-            sentiment_data.get("Neutral", 0),
-            sentiment_data.get("Negative", 0),
-        ]
+        keywords = list(dict.fromkeys(kw for kw in overview_keywords if kw))
+        totals = self.brand_totals([Brand(kw, kw) for kw in keywords])
+        metric_names = keywords + list(SENTIMENT_VALUES)
+        values = totals["Mentions"].tolist() + (
+            totals.loc[0, list(SENTIMENT_VALUES)].tolist() if keywords else [0, 0, 0]
+        )
         df = pd.DataFrame({"Metric": metric_names, "Value": values}).reset_index(drop=True)
         df["Metric"] = df["Metric"].str.ljust(25)
         return df
 
     def sentiment_overview(self, overview_keywords: list[str]) -> pd.DataFrame:
         """Return a DataFrame of sentiment counts per keyword."""
-        self._ensure_loaded()
         keywords = [kw for kw in overview_keywords if kw]
         if not keywords:
             return pd.DataFrame(
                 columns=["Keyword", "Positive", "Neutral", "Negative"]
             )
-        results = []
-        for kw in keywords:
-            counts = self.get_sentiment_counts(kw)
-            results.append(
-                {
-                    "Keyword": kw,
-                    "Positive": counts.get("Positive", 0),
-                    "Neutral": counts.get("Neutral", 0),
-                    "Negative": counts.get("Negative", 0),
-                }
-            )
-        summary = pd.DataFrame(results)
+        totals = self.brand_totals([Brand(kw, kw) for kw in keywords])
+        summary = totals[["Brand", *SENTIMENT_VALUES]].rename(columns={"Brand": "Keyword"})
         for col in SENTIMENT_VALUES:
             summary[col] = summary[col].astype(int)
         return summary
@@ -256,8 +1192,7 @@ class ExcelFileHandler:
         self, keywords: str | list[str] | list[list[str]], *extra_keywords: Any
     ) -> pd.DataFrame:
         """Return rows with prominence scores per keyword set; original columns plus score columns."""
-        self._ensure_loaded()
-        df = self.dataframe.copy()
+        df = self.with_text().copy()
         if isinstance(keywords, str):
             keywords = [keywords]
         all_keywords = list(keywords) + list(extra_keywords)
@@ -269,21 +1204,9 @@ class ExcelFileHandler:
         if not all_keywords:
             return pd.DataFrame(columns=df.columns)
 
-        def score_row(row: pd.Series, keyword_set: str | list[str]) -> float:
-            headline = str(row[COLUMN_HEADLINE]).lower()
-            opening = str(row[COLUMN_OPENING_TEXT]).lower()
-            hit = str(row[COLUMN_HIT_SENTENCE]).lower()
-            kset = [keyword_set] if isinstance(keyword_set, str) else keyword_set
-            if any(k in headline for k in kset):
-                return 1.0
-            if any(k in opening for k in kset):
-                return 0.7
-            if any(k in hit for k in kset):
-                return 0.1
-            return 0.0
-
-        for idx, kw in enumerate(all_keywords):
-            df[str(idx + 1)] = df.apply(lambda row: score_row(row, kw), axis=1)
+        scores = self._prominence_matrix(all_keywords)
+        for idx in range(len(all_keywords)):
+            df[str(idx + 1)] = scores[:, idx]
         score_cols = [str(i + 1) for i in range(len(all_keywords))]
         max_score = df[score_cols].max(axis=1)
         result_df = df[max_score > 0].copy()
@@ -304,6 +1227,7 @@ class ExcelFileHandler:
         result_df = result_df.rename(columns=rename)
         return result_df
 
+    @_persisted
     def prominence_score_extra(
         self, keywords: str | list[str] | list[list[str]], *extra_keywords: Any
     ) -> pd.DataFrame:
@@ -322,31 +1246,10 @@ class ExcelFileHandler:
                 columns=["Keyword", "Total Prominence", "Average Prominence"]
             )
 
-        def score(text_fields: tuple[Any, Any, Any], keyword_set: str | list[str]) -> float:
-            kset = [keyword_set] if isinstance(keyword_set, str) else keyword_set
-            headline, opening, hit = text_fields
-            headline, opening, hit = str(headline).lower(), str(opening).lower(), str(hit).lower()
-            if any(k in headline for k in kset):
-                return 1.0
-            if any(k in opening for k in kset):
-                return 0.7
-            if any(k in hit for k in kset):
-                return 0.1
-            return 0.0
-
+        matrix = self._prominence_matrix(all_keywords)
         results = []
-        for kw in all_keywords:
-            scores = [
-                score(
-                    (
-                        row[COLUMN_HEADLINE],
-                        row[COLUMN_OPENING_TEXT],
-                        row[COLUMN_HIT_SENTENCE],
-                    ),
-                    kw,
-                )
-                for _, row in self.dataframe.iterrows()
-            ]
+        for j, kw in enumerate(all_keywords):
+            scores = matrix[:, j].tolist()
             total = sum(scores)
             non_zero = [s for s in scores if s > 0]
             avg = round(total / len(non_zero), 2) if non_zero else 0
@@ -359,3 +1262,44 @@ class ExcelFileHandler:
                 }
             )
         return pd.DataFrame(results)
+
+
+class _ProgressReader(io.RawIOBase):
+    """Binary stream wrapper reporting bytes consumed as a fraction of the file size.
+
+    Only the worksheet and shared-string parts of a workbook are read, so the
+    fraction is capped below 1.0 until parsing finishes.
+    """
+
+    def __init__(
+        self, raw: Any, size: int, progress: Callable[[float], None]
+    ) -> None:
+        super().__init__()
+        self._raw = raw
+        self._size = max(size, 1)
+        self._consumed = 0
+        self._progress = progress
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._raw.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._raw.tell()
+
+    def readinto(self, buffer: Any) -> int:
+        data = self._raw.read(len(buffer))
+        n = len(data)
+        buffer[:n] = data
+        self._consumed += n
+        self._progress(min(self._consumed / self._size, 0.99))
+        return n
+
+    def close(self) -> None:
+        # The underlying stream belongs to the caller.
+        super().close()
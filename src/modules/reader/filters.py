@@ -0,0 +1,79 @@
+"""Dashboard-wide row filters backed by a time-sorted row index."""
+
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from ..constants import COLUMN_DATE, COLUMN_SENTIMENT, COLUMN_SOURCE, DATE_FORMAT_READ
+
+
+class DatasetFilter(NamedTuple):
+    """Date window (inclusive days), sources and sentiments to keep; None keeps all.
+
+    With unique_stories, only the first placement of each syndicated story among
+    the rows the other filters keep is kept.
+    """
+
+    start: date | None = None
+    end: date | None = None
+    sources: tuple[str, ...] | None = None
+    sentiments: tuple[str, ...] | None = None
+    unique_stories: bool = False
+
+    def is_active(self) -> bool:
+        """Return True if the filter removes anything."""
+        return self.unique_stories or any(
+            v is not None for v in (self.start, self.end, self.sources, self.sentiments)
+        )
+
+
+class TimeIndex:
+    """Row positions sorted by timestamp plus categorical codes for sources and sentiment.
+
+    A date window is two ``searchsorted`` calls over the sorted timestamps and a
+    slice of the permutation; source and sentiment filters are ``isin`` tests on
+    small integer codes. Undated rows sort last and drop out of any date window.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        timestamps = pd.to_datetime(df[COLUMN_DATE], format=DATE_FORMAT_READ, errors="coerce")
+        self.timestamps = timestamps.to_numpy()
+        self.order = np.argsort(self.timestamps, kind="stable")
+        self.sorted_timestamps = self.timestamps[self.order]
+        self.n_dated = int(timestamps.notna().sum())
+        self.source_codes, self.sources = pd.factorize(df[COLUMN_SOURCE], sort=True)
+        self.sentiment_codes, self.sentiments = pd.factorize(df[COLUMN_SENTIMENT])
+
+    def date_bounds(self) -> tuple[date, date] | None:
+        """Return the first and last dated day, or None if no row has a date."""
+        if self.n_dated == 0:
+            return None
+        first = pd.Timestamp(self.sorted_timestamps[0]).date()
+        last = pd.Timestamp(self.sorted_timestamps[self.n_dated - 1]).date()
+        return first, last
+
+    def window(self, start: date | None, end: date | None) -> slice:
+        """Return the slice of ``order`` covering [start, end] (whole days)."""
+        if start is None and end is None:
+            return slice(0, len(self.order))
+        dated = self.sorted_timestamps[: self.n_dated]
+        lo = 0 if start is None else int(np.searchsorted(dated, np.datetime64(start, "ns")))
+        hi = (
+            self.n_dated
+            if end is None
+            else int(np.searchsorted(dated, np.datetime64(end + timedelta(days=1), "ns")))
+        )
+        return slice(lo, hi)
+
+    def positions(self, flt: DatasetFilter) -> np.ndarray:
+        """Return original row positions kept by the filter, in original order."""
+        pos = self.order[self.window(flt.start, flt.end)]
+        if flt.sources is not None:
+            codes = self.sources.get_indexer(list(flt.sources))
+            pos = pos[np.isin(self.source_codes[pos], codes[codes >= 0])]
+        if flt.sentiments is not None:
+            codes = self.sentiments.get_indexer(list(flt.sentiments))
+            pos = pos[np.isin(self.sentiment_codes[pos], codes[codes >= 0])]
+        return np.sort(pos)
@@ -0,0 +1,84 @@
+"""Classify articles into media types (blog, broadcast, print, ...) from config."""
+
+import numpy as np
+import pandas as pd
+
+from ..constants import COLUMN_SOURCE, COLUMN_URL, MEDIA_TYPE_UNCLASSIFIED
+from .config_loader import get_keyword_media, get_keyword_media_sites
+
+_HOST_PATTERN = r"^(?:[a-zA-Z][a-zA-Z0-9+.-]*://)?(?:www\.)?([^/:?#\s]+)"
+
+
+class MediaTypeClassifier:
+    """Map Source (and URL host) to a media type through precompiled lookups.
+
+    Entries of the config ``media_types`` lists containing a dot are domain
+    suffixes (``inquirer.net`` also matches ``plus.inquirer.net``); any other
+    entry is an exact, case-insensitive Source name. A row is classified by its
+    Source name first, then by its URL host, then by its Source read as a host.
+    """
+
+    def __init__(
+        self, media_types: dict[str, list[str]], labels: list[str] | None = None
+    ) -> None:
+        self.labels = sorted(set(labels or []) | set(media_types)) + [MEDIA_TYPE_UNCLASSIFIED]
+        code = {label: i for i, label in enumerate(self.labels)}
+        self._names: dict[str, int] = {}
+        self._domains: dict[str, int] = {}
+        for media_type, sites in media_types.items():
+            for site in sites:
+                key = str(site).strip().lower()
+                target = self._domains if "." in key and " " not in key else self._names
+                target.setdefault(key, code[media_type])
+        self._unclassified = code[MEDIA_TYPE_UNCLASSIFIED]
+
+    @classmethod
+    def from_config(cls) -> "MediaTypeClassifier":
+        """Build the classifier from data/config.json (empty mapping if unavailable)."""
+        try:
+            return cls(get_keyword_media(), get_keyword_media_sites())
+        except (OSError, ValueError):
+            return cls({})
+
+    def _match_domains(self, hosts: pd.Series) -> np.ndarray:
+        """Return media-type codes for hosts by suffix (-1 where nothing matches)."""
+        codes = np.full(len(hosts), -1, dtype=np.int32)
+        if not self._domains or hosts.empty:
+            return codes
+        parts = hosts.str.lower().str.split(".")
+        depth = int(parts.str.len().max())
+        lookup = pd.Series(self._domains)
+        # Shortest suffix first so the most specific match is written last.
+        for k in range(1, depth + 1):
+            suffix = parts.str[-k:].str.join(".")
+            hit = suffix.map(lookup).to_numpy()
+            found = ~pd.isna(hit)
+            codes[found] = hit[found].astype(np.int32)
+        return codes
+
+    def classify(self, df: pd.DataFrame) -> pd.Categorical:
+        """Return one media-type label per row."""
+        src_codes, sources = pd.factorize(df[COLUMN_SOURCE])
+        source_keys = pd.Series(sources).astype(str).str.strip().str.lower()
+        by_name = source_keys.map(pd.Series(self._names, dtype="float64")).to_numpy()
+        by_source_host = self._match_domains(
+            source_keys.str.extract(_HOST_PATTERN, expand=False).fillna("")
+        )
+        per_source = np.where(~np.isnan(by_name), by_name, -1).astype(np.int32)
+        codes = np.full(len(df), -1, dtype=np.int32)
+        has_source = src_codes >= 0
+        codes[has_source] = per_source[src_codes[has_source]]
+
+        if COLUMN_URL in df.columns:
+            pending = codes < 0
+            url_codes, urls = pd.factorize(df.loc[pending, COLUMN_URL])
+            hosts = pd.Series(urls).astype(str).str.extract(_HOST_PATTERN, expand=False)
+            per_host = self._match_domains(hosts.fillna(""))
+            pending_idx = np.flatnonzero(pending)
+            has_url = url_codes >= 0
+            codes[pending_idx[has_url]] = per_host[url_codes[has_url]]
+
+        pending = (codes < 0) & has_source
+        codes[pending] = by_source_host[src_codes[pending]]
+        codes[codes < 0] = self._unclassified
+        return pd.Categorical.from_codes(codes, categories=self.labels)
@@ -0,0 +1,125 @@
+"""Stratified row samples and design-based estimates of totals and shares.
+
+Rows are split into strata by day and source (sources outside the largest
+``APPROX_STRATA_SOURCES`` share one stratum per day). Every row gets a fixed
+random key, and a sample of fraction f takes the ``ceil(f · N_h)`` rows with
+the smallest keys in each stratum, so a larger fraction extends a smaller one.
+Totals use the stratified expansion estimator ``Σ N_h · ȳ_h`` with variance
+``Σ N_h² (1 − n_h / N_h) s_h² / n_h``; shares are ratios of two totals with a
+linearized variance. At fraction 1 every stratum is complete, so the estimates
+are exact and their margins zero.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from ..constants import APPROX_CONFIDENCE_Z, APPROX_SAMPLE_SEED, APPROX_STRATA_SOURCES
+from .filters import TimeIndex
+
+
+class Sample(NamedTuple):
+    """Sampled row positions (grouped by stratum) and per-stratum population and sample sizes."""
+
+    rows: np.ndarray
+    stratum: np.ndarray
+    population: np.ndarray
+    size: np.ndarray
+
+
+class Estimate(NamedTuple):
+    """Point estimates and the half-widths of their confidence intervals."""
+
+    value: np.ndarray
+    margin: np.ndarray
+
+
+class SampleDesign:
+    """Day × source strata and a fixed random order of the rows within each stratum."""
+
+    def __init__(self, strata: np.ndarray, seed: int = APPROX_SAMPLE_SEED) -> None:
+        self.strata, _ = pd.factorize(strata, sort=True)
+        keys = np.random.default_rng(seed).random(len(self.strata))
+        # Rows by stratum, then key: each stratum's sample is a prefix of its run.
+        self.order = np.lexsort((keys, self.strata))
+        self.sorted_strata = self.strata[self.order]
+        self.n_strata = int(self.strata.max()) + 1 if len(self.strata) else 0
+        self.starts = np.searchsorted(self.sorted_strata, np.arange(self.n_strata))
+
+    @classmethod
+    def from_index(
+        cls,
+        index: TimeIndex,
+        top_sources: int = APPROX_STRATA_SOURCES,
+        seed: int = APPROX_SAMPLE_SEED,
+    ) -> "SampleDesign":
+        """Stratify the indexed rows by day and source (undated rows form their own days)."""
+        days, _ = pd.factorize(pd.DatetimeIndex(index.timestamps).normalize())
+        sources = np.asarray(index.source_codes)
+        volume = np.bincount(sources + 1, minlength=len(index.sources) + 1)[1:]
+        top = np.argsort(-volume, kind="stable")[:top_sources]
+        source_stratum = np.full(len(index.sources) + 1, len(top))
+        source_stratum[top + 1] = np.arange(len(top))
+        return cls(days.astype(np.int64) * (len(top) + 1) + source_stratum[sources + 1], seed)
+
+    def sample(self, fraction: float, positions: np.ndarray | None = None) -> Sample:
+        """Sample a fraction of the rows at positions (all rows if None) in every stratum."""
+        if positions is None:
+            kept = np.ones(len(self.order), dtype=bool)
+        else:
+            kept = np.zeros(len(self.order), dtype=bool)
+            kept[positions] = True
+        kept = kept[self.order]
+        running = np.cumsum(kept)
+        before = running[self.starts] - kept[self.starts]
+        rank = running - 1 - before[self.sorted_strata]
+        population = np.bincount(self.sorted_strata[kept], minlength=self.n_strata)
+        size = np.minimum(population, np.maximum(np.ceil(population * fraction), 1)).astype(
+            np.int64
+        )
+        chosen = kept & (rank < size[self.sorted_strata])
+        return Sample(self.order[chosen], self.sorted_strata[chosen], population, size)
+
+
+def estimate_totals(
+    values: np.ndarray, sample: Sample, z: float = APPROX_CONFIDENCE_Z
+) -> Estimate:
+    """Estimate the population total of each column of values ([sampled rows × k])."""
+    values = np.asarray(values, dtype=np.float64).reshape(len(sample.rows), -1)
+    present = np.flatnonzero(sample.size)
+    n = sample.size[present].astype(np.float64)[:, None]
+    big_n = sample.population[present].astype(np.float64)[:, None]
+    if len(values):
+        # Sampled rows are grouped by stratum, in the order of present.
+        starts = np.concatenate([[0], np.cumsum(sample.size[present])[:-1]])
+        sums = np.add.reduceat(values, starts, axis=0)
+        squares = np.add.reduceat(values * values, starts, axis=0)
+    else:
+        sums = squares = np.zeros((len(present), values.shape[1]))
+    mean = sums / n
+    # A stratum with a single sampled row has no variance estimate of its own;
+    # it borrows the variance of the whole sample (common with small strata).
+    pooled = values.var(axis=0, ddof=1) if len(values) > 1 else np.zeros(values.shape[1])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spread = np.where(n > 1, (squares - n * mean * mean) / (n - 1), pooled)
+    variance = (big_n * big_n * (1 - n / big_n) * np.maximum(spread, 0.0) / n).sum(axis=0)
+    return Estimate((big_n * mean).sum(axis=0), z * np.sqrt(variance))
+
+
+def estimate_ratios(
+    numerators: np.ndarray,
+    denominators: np.ndarray,
+    sample: Sample,
+    z: float = APPROX_CONFIDENCE_Z,
+) -> Estimate:
+    """Estimate column-wise ratios of two population totals (e.g. a sentiment's share)."""
+    numerators = np.asarray(numerators, dtype=np.float64).reshape(len(sample.rows), -1)
+    denominators = np.asarray(denominators, dtype=np.float64).reshape(len(sample.rows), -1)
+    top = estimate_totals(numerators, sample, z).value
+    bottom = estimate_totals(denominators, sample, z).value
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.where(bottom > 0, top / bottom, 0.0)
+        residual = estimate_totals(numerators - ratio * denominators, sample, z)
+        margin = np.where(bottom > 0, residual.margin / bottom, 0.0)
+    return Estimate(ratio, margin)
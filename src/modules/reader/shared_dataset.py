@@ -0,0 +1,105 @@
+"""Parsed datasets published as memory-mapped Arrow files shared by worker processes.
+
+The first process to load a workbook writes its normalized dataframe as an
+uncompressed Arrow IPC file, plus the keyword row codes as ``.npy`` and, once
+first needed, each lower-cased scoring text column. Every process (including the
+writer) maps them read-only, so the text and index live once in the page
+cache however many workers serve them.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+_DATA_SUFFIX = ".arrow"
+_CODES_SUFFIX = ".keywords.npy"
+
+
+def shared_dataset_path(directory: str, fingerprint: str, sheet_name: str, version: str) -> str:
+    """Return the path prefix of the shared copy of one sheet of one dataset version."""
+    sheet = "".join(c if c.isalnum() else "_" for c in sheet_name)
+    return os.path.join(directory, f"{fingerprint[:32]}-{sheet}-{version}")
+
+
+def _replace_atomically(target: str, write) -> None:
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(target), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def publish_dataset(prefix: str, df: pd.DataFrame, keyword_codes: np.ndarray) -> None:
+    """Write df and its keyword codes under prefix (each file renamed into place).
+
+    The data file is renamed last, so its presence means both files are complete.
+    Raises pa.ArrowException if a column cannot be represented in Arrow.
+    """
+    os.makedirs(os.path.dirname(prefix), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    def write_table(f) -> None:
+        with pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+
+    _replace_atomically(
+        prefix + _CODES_SUFFIX,
+        lambda f: np.save(f, np.ascontiguousarray(keyword_codes), allow_pickle=False),
+    )
+    _replace_atomically(prefix + _DATA_SUFFIX, write_table)
+
+
+def open_dataset(prefix: str) -> tuple[pd.DataFrame, np.ndarray] | None:
+    """Map a published dataset read-only; return (dataframe, keyword codes) or None.
+
+    String columns stay backed by the mapped Arrow buffers, as do numeric
+    columns without nulls (``split_blocks``); only columns with nulls are copied.
+    """
+    try:
+        source = pa.memory_map(prefix + _DATA_SUFFIX, "r")
+        table = pa.ipc.open_file(source).read_all()
+        codes = np.load(prefix + _CODES_SUFFIX, mmap_mode="r", allow_pickle=False)
+    except (FileNotFoundError, pa.ArrowInvalid, ValueError):
+        return None
+    df = table.to_pandas(split_blocks=True)
+    if len(codes) != len(df):
+        return None
+    return df, codes
+
+
+def _text_path(prefix: str, name: str) -> str:
+    slug = "".join(c if c.isalnum() else "_" for c in name)
+    return f"{prefix}.text-{slug}.arrow"
+
+
+def publish_text(prefix: str, name: str, array: pa.Array) -> None:
+    """Write one lower-cased text column used for keyword scoring under prefix."""
+    table = pa.table({name: array})
+
+    def write_table(f) -> None:
+        with pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+
+    _replace_atomically(_text_path(prefix, name), write_table)
+
+
+def open_text(prefix: str, name: str) -> pa.Array | None:
+    """Map one published text column read-only; None if it is not published."""
+    try:
+        table = pa.ipc.open_file(pa.memory_map(_text_path(prefix, name), "r")).read_all()
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    if name not in table.column_names:
+        return None
+    column = table.column(name)
+    # A single chunk is used as-is so it stays backed by the mapping.
+    return column.chunk(0) if column.num_chunks == 1 else column.combine_chunks()
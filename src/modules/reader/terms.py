@@ -0,0 +1,173 @@
+"""Hashed sparse document-term counts (words and word pairs) for top-term queries.
+
+Text is tokenized once per dataset with Arrow kernels, block by block. Each
+unigram and bigram is hashed into a fixed bucket space, and the per-row counts
+are stored as a CSR matrix (plain numpy ``indptr`` / ``indices`` / ``data``) over
+the buckets that occur. Any subset of rows (a brand under the active filter)
+is then a sparse row-subset sum; nothing is re-tokenized.
+"""
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ..constants import TOP_TERMS_BLOCK_ROWS, TOP_TERMS_HASH_BITS
+
+_SPLIT = r"[^\p{L}\p{N}]+"
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+# Common English function words plus "nan", which lower-cased missing cells become.
+STOP_WORDS = frozenset(
+    """
+    a about above after again against all also am an and any are as at be because been
+    before being below between both but by can could did do does doing down during each
+    few for from further had has have having he her here hers herself him himself his
+    how i if in into is it its itself just me more most my myself no nor not now of off
+    on once only or other our ours ourselves out over own same she should so some such
+    than that the their theirs them themselves then there these they this those through
+    to too under until up very was we were what when where which while who whom why
+    will with would you your yours yourself yourselves nan none says said via amid per
+    """.split()
+)
+
+
+class TermMatrix:
+    """Per-row unigram and bigram counts as a CSR matrix over hashed term buckets.
+
+    Column j is one hash bucket; ``label(j)`` spells the first term seen in it
+    (collisions are rare at the configured width and merge two terms' counts).
+    """
+
+    def __init__(
+        self,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+        first_terms: np.ndarray,
+        vocab: list[str],
+    ) -> None:
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.first_terms = first_terms
+        self.vocab = vocab
+        self.rows = len(indptr) - 1
+        self.columns = len(first_terms)
+
+    @classmethod
+    def build(
+        cls,
+        arrays: list[pa.Array],
+        hash_bits: int = TOP_TERMS_HASH_BITS,
+        block_rows: int = TOP_TERMS_BLOCK_ROWS,
+    ) -> "TermMatrix":
+        """Tokenize lower-cased text arrays (one per column, equal length) into counts.
+
+        Tokens are runs of letters and digits; stop words, single characters and
+        pure numbers are dropped, and bigrams only join tokens that were adjacent
+        in the same column.
+        """
+        rows = len(arrays[0]) if arrays else 0
+        vocab: dict[str, int] = {}
+        keep: list[bool] = []
+        parts = []
+        for start in range(0, rows, block_rows):
+            block = [a.slice(start, block_rows) for a in arrays]
+            parts.append(_block_features(block, start, vocab, keep, hash_bits))
+        docs, buckets, counts, terms = (
+            [np.concatenate(p) for p in zip(*parts)] if parts else _no_features()
+        )
+        _, first, indices = np.unique(buckets, return_index=True, return_inverse=True)
+        indptr = np.zeros(rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(docs, minlength=rows), out=indptr[1:])
+        names = [None] * len(vocab)
+        for term, i in vocab.items():
+            names[i] = term
+        return cls(indptr, indices.astype(np.int32), counts, terms[first], names)
+
+    def label(self, column: int) -> str:
+        """Return the term spelled by a column's first occurrence."""
+        a, b = self.first_terms[column]
+        return self.vocab[a] if b < 0 else f"{self.vocab[a]} {self.vocab[b]}"
+
+    def column_sums(self, rows: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Return (rows containing each term, total occurrences) over rows (all if None)."""
+        if rows is None:
+            indices, data = self.indices, self.data
+        else:
+            starts = self.indptr[rows]
+            lengths = self.indptr[np.asarray(rows) + 1] - starts
+            offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+            take = offsets + np.arange(int(lengths.sum()))
+            indices, data = self.indices[take], self.data[take]
+        docs = np.bincount(indices, minlength=self.columns)
+        total = np.bincount(indices, weights=data, minlength=self.columns).astype(np.int64)
+        return docs, total
+
+
+def _no_features() -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return (
+        np.empty(0, np.int64),
+        np.empty(0, np.uint64),
+        np.empty(0, np.int32),
+        np.empty((0, 2), np.int64),
+    )
+
+
+def _token_id(token: str, vocab: dict[str, int], keep: list[bool]) -> int:
+    if token not in vocab:
+        vocab[token] = len(vocab)
+        keep.append(len(token) > 1 and not token.isdigit() and token not in STOP_WORDS)
+    return vocab[token]
+
+
+def _block_features(
+    block: list[pa.Array], start: int, vocab: dict[str, int], keep: list[bool], hash_bits: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Return one block's (row, bucket, count, term ids) entries, sorted by row and bucket.
+
+    Rows are numbered from start. vocab and keep (whether a vocabulary token
+    counts as a term) grow across blocks.
+    """
+    lists = [pc.split_pattern_regex(a, _SPLIT) for a in block]
+    flat = [pc.list_flatten(values) for values in lists]
+    if not any(len(f) for f in flat):
+        return _no_features()
+    encoded = pa.concat_arrays([f.cast(pa.large_string()) for f in flat]).dictionary_encode()
+    global_ids = np.fromiter(
+        (_token_id(t, vocab, keep) for t in encoded.dictionary.to_pylist()), dtype=np.int64
+    )
+    ids = global_ids[encoded.indices.to_numpy()]
+    kept = np.asarray(keep, dtype=bool)[ids]
+    doc_parts, first_parts, second_parts = [], [], []
+    offset = 0
+    for values in lists:
+        lengths = np.diff(values.offsets.to_numpy())
+        n = int(lengths.sum())
+        doc = np.repeat(np.arange(start, start + len(values)), lengths)
+        tok, ok = ids[offset : offset + n], kept[offset : offset + n]
+        offset += n
+        doc_parts.append(doc[ok])
+        first_parts.append(tok[ok])
+        second_parts.append(np.full(int(ok.sum()), -1, dtype=np.int64))
+        pair = ok[:-1] & ok[1:] & (doc[:-1] == doc[1:])
+        doc_parts.append(doc[:-1][pair])
+        first_parts.append(tok[:-1][pair])
+        second_parts.append(tok[1:][pair])
+    doc = np.concatenate(doc_parts)
+    first = np.concatenate(first_parts)
+    second = np.concatenate(second_parts)
+    key = (first.astype(np.uint64) + np.uint64(1)) * _MIX
+    key = (key ^ (second + 1).astype(np.uint64)) * _MIX
+    bucket = key >> np.uint64(64 - hash_bits)
+    # One entry per (row, bucket): sort on the packed pair, then count runs.
+    packed = ((doc - start).astype(np.uint64) << np.uint64(hash_bits)) | bucket
+    order = np.argsort(packed)
+    packed = packed[order]
+    new = np.ones(len(packed), dtype=bool)
+    new[1:] = packed[1:] != packed[:-1]
+    heads = np.flatnonzero(new)
+    counts = np.diff(np.append(heads, len(packed))).astype(np.int32)
+    first_at = order[heads]
+    terms = np.stack([first[first_at], second[first_at]], axis=1)
+    return doc[first_at], bucket[first_at], counts, terms
@@ -0,0 +1,210 @@
+"""Vectorized keyword scoring over text columns, optionally on a process pool.
+
+Text columns are lower-cased once per dataset, each when first needed, and held
+as Arrow ``large_string`` arrays. For parallel scoring their offset and data buffers are copied into
+shared memory, so worker processes rebuild zero-copy Arrow views instead of
+receiving pickled text; each task only carries its row range (or positions)
+and returns a small matrix of match levels.
+"""
+
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, shared_memory
+from typing import Callable, NamedTuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from ..constants import PARALLEL_SCORING_MIN_ROWS, SCORING_CHUNK_ROWS, SCORING_WORKERS
+
+KeywordSet = str | list[str]
+
+
+class _SharedColumn(NamedTuple):
+    name: str
+    rows: int
+    offsets_nbytes: int
+    data_nbytes: int
+
+
+def lowered(values: pd.Series) -> pa.Array:
+    """Return ``str(value).lower()`` of every value as an Arrow ``large_string`` array."""
+    return pa.array([str(v).lower() for v in values.tolist()], type=pa.large_string())
+
+
+class TextColumns:
+    """Lower-cased text columns (``str(value).lower()``) as Arrow arrays, loaded on first use.
+
+    ``load(name)`` returns one column's array; it is called once per column,
+    when a query first reads it, so headline-only queries never load the long
+    text columns. ``share(columns)`` publishes those columns' buffers in
+    shared memory once each. They are unlinked when the object is garbage
+    collected, i.e. once no handler (template, fork or view) references it;
+    ``close()`` does it early and is only safe for an object nothing else shares.
+    """
+
+    def __init__(self, load: Callable[[str], pa.Array], rows: int) -> None:
+        self._load = load
+        self.rows = rows
+        self.arrays: dict[str, pa.Array] = {}
+        self._segments: dict[str, shared_memory.SharedMemory] = {}
+        self._layout: dict[str, _SharedColumn] = {}
+        self._lock = threading.RLock()
+
+    def column(self, name: str) -> pa.Array:
+        """Return one column, loading it on first use."""
+        with self._lock:
+            if name not in self.arrays:
+                self.arrays[name] = self._load(name)
+            return self.arrays[name]
+
+    def share(self, columns: list[str]) -> dict[str, _SharedColumn]:
+        """Copy the columns' buffers into shared memory (once each) and return their layout."""
+        with self._lock:
+            for col in columns:
+                if col in self._layout:
+                    continue
+                arr = self.column(col)
+                # Arrays built by pa.array or read from IPC start at offset 0, so buffers
+                # copy as-is.
+                _, offsets, data = arr.buffers()
+                offsets_nbytes = (len(arr) + 1) * 8
+                data_nbytes = data.size if data is not None else 0
+                shm = shared_memory.SharedMemory(
+                    create=True, size=max(offsets_nbytes + data_nbytes, 1)
+                )
+                self._segments[col] = shm
+                shm.buf[:offsets_nbytes] = memoryview(offsets).cast("B")[:offsets_nbytes]
+                if data_nbytes:
+                    shm.buf[offsets_nbytes : offsets_nbytes + data_nbytes] = memoryview(
+                        data
+                    ).cast("B")
+                self._layout[col] = _SharedColumn(shm.name, len(arr), offsets_nbytes, data_nbytes)
+            return {col: self._layout[col] for col in columns}
+
+    def close(self) -> None:
+        """Unlink the shared-memory segments, if any."""
+        for shm in self._segments.values():
+            shm.close()
+            shm.unlink()
+        self._segments = {}
+        self._layout = {}
+
+    def __del__(self) -> None:
+        self.close()
+
+
+def match_levels(
+    arrays: list[pa.Array], keyword_sets: list[KeywordSet]
+) -> np.ndarray:
+    """Return, per row and keyword set, the index of the first array containing a term.
+
+    Rows where no array matches get ``len(arrays)``. Terms must be lower-case.
+    """
+    n = len(arrays[0]) if arrays else 0
+    levels = np.full((n, len(keyword_sets)), len(arrays), dtype=np.int8)
+    for j, keyword_set in enumerate(keyword_sets):
+        terms = [keyword_set] if isinstance(keyword_set, str) else list(keyword_set)
+        # Walk fields from last to first so the earliest matching field wins.
+        for level in range(len(arrays) - 1, -1, -1):
+            hit = np.zeros(n, dtype=bool)
+            for term in terms:
+                hit |= pc.match_substring(arrays[level], term).to_numpy(zero_copy_only=False)
+            levels[hit, j] = level
+    return levels
+
+
+_ATTACHED: dict[str, tuple[shared_memory.SharedMemory, pa.Array]] = {}
+
+
+def _release(name: str) -> None:
+    shm, arr = _ATTACHED.pop(name)
+    del arr
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+
+@atexit.register
+def _release_all() -> None:
+    # Drop the Arrow views first so the segments can be closed before teardown.
+    for name in list(_ATTACHED):
+        _release(name)
+
+
+def _attach(column: _SharedColumn) -> pa.Array:
+    """Return a zero-copy Arrow view of a shared column (cached per worker)."""
+    if column.name not in _ATTACHED:
+        shm = shared_memory.SharedMemory(name=column.name)
+        offsets = pa.py_buffer(shm.buf[: column.offsets_nbytes])
+        data = pa.py_buffer(
+            shm.buf[column.offsets_nbytes : column.offsets_nbytes + column.data_nbytes]
+        )
+        arr = pa.Array.from_buffers(pa.large_string(), column.rows, [None, offsets, data])
+        _ATTACHED[column.name] = (shm, arr)
+    return _ATTACHED[column.name][1]
+
+
+def _score_chunk(
+    columns: list[_SharedColumn],
+    rows: np.ndarray | tuple[int, int],
+    keyword_sets: list[KeywordSet],
+) -> np.ndarray:
+    """Worker task: match levels for a row range (lo, hi) or an array of positions."""
+    for stale in set(_ATTACHED) - {c.name for c in columns}:
+        _release(stale)
+    arrays = [_attach(c) for c in columns]
+    if isinstance(rows, tuple):
+        lo, hi = rows
+        arrays = [a.slice(lo, hi - lo) for a in arrays]
+    else:
+        index = pa.array(rows)
+        arrays = [a.take(index) for a in arrays]
+    return match_levels(arrays, keyword_sets)
+
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            # spawn: forking a process that runs Streamlit's threads is unsafe.
+            _POOL = ProcessPoolExecutor(SCORING_WORKERS, mp_context=get_context("spawn"))
+        return _POOL
+
+
+def score_levels(
+    text: TextColumns,
+    columns: list[str],
+    keyword_sets: list[KeywordSet],
+    rows: np.ndarray | None = None,
+    workers: int = SCORING_WORKERS,
+) -> np.ndarray:
+    """Return match levels (see ``match_levels``) for the given rows (all if None).
+
+    Large inputs are split into chunks scored by worker processes over the shared
+    columns; the partial matrices are concatenated in row order.
+    """
+    n = text.rows if rows is None else len(rows)
+    if workers <= 1 or n < PARALLEL_SCORING_MIN_ROWS:
+        arrays = [text.column(c) for c in columns]
+        if rows is not None:
+            index = pa.array(rows)
+            arrays = [a.take(index) for a in arrays]
+        return match_levels(arrays, keyword_sets)
+
+    layout = text.share(columns)
+    shared = [layout[c] for c in columns]
+    size = max(SCORING_CHUNK_ROWS, -(-n // (workers * 4)))
+    bounds = [(lo, min(lo + size, n)) for lo in range(0, n, size)]
+    tasks = bounds if rows is None else [rows[lo:hi] for lo, hi in bounds]
+    pool = _pool()
+    parts = pool.map(_score_chunk, [shared] * len(tasks), tasks, [keyword_sets] * len(tasks))
+    return np.concatenate(list(parts))
@@ -1,5 +1,17 @@
 """Utility functions."""
 
-from .helpers import format_number
+from .disk_cache import DiskCache, file_fingerprint
+from .helpers import brand_palette, format_number
+from .lru_cache import LRUCache
+from .memory_trace import MemoryTracer
+from .sketches import KLLSketch
 
-__all__ = ["format_number"]
+__all__ = [
+    "DiskCache",
+    "KLLSketch",
+    "LRUCache",
+    "MemoryTracer",
+    "brand_palette",
+    "file_fingerprint",
+    "format_number",
+]
@@ -0,0 +1,209 @@
+"""Size-capped on-disk result cache shared by processes, with atomic writes."""
+
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import threading
+from collections.abc import Hashable
+from typing import IO, Any, Callable
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+_SUFFIX = ".bin"
+
+# One-byte tags for the entry payload encoding.
+_FRAME, _BITS, _ARRAY, _PICKLE = b"F", b"B", b"N", b"P"
+
+
+def file_fingerprint(file: str | os.PathLike | IO[bytes], chunk_bytes: int = 1 << 20) -> str:
+    """Return the SHA-256 of a file's bytes (a path or a seekable binary stream)."""
+    digest = hashlib.sha256()
+    if isinstance(file, (str, os.PathLike)):
+        with open(file, "rb") as f:
+            while chunk := f.read(chunk_bytes):
+                digest.update(chunk)
+        return digest.hexdigest()
+    start = file.tell()
+    file.seek(0)
+    while chunk := file.read(chunk_bytes):
+        digest.update(chunk)
+    file.seek(start)
+    return digest.hexdigest()
+
+
+def _encode(value: Any) -> bytes:
+    """Serialize a value: dataframes as compressed Arrow IPC, bool arrays bit-packed."""
+    buf = io.BytesIO()
+    if isinstance(value, pd.DataFrame):
+        buf.write(_FRAME)
+        table = pa.Table.from_pandas(value)
+        options = pa.ipc.IpcWriteOptions(
+            compression="zstd" if pa.Codec.is_available("zstd") else None
+        )
+        with pa.ipc.new_file(buf, table.schema, options=options) as writer:
+            writer.write_table(table)
+    elif isinstance(value, np.ndarray) and value.dtype == bool and value.ndim == 1:
+        buf.write(_BITS)
+        buf.write(len(value).to_bytes(8, "little"))
+        buf.write(np.packbits(value, bitorder="little").tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        buf.write(_ARRAY)
+        np.save(buf, value, allow_pickle=False)
+    else:
+        buf.write(_PICKLE)
+        pickle.dump(value, buf, protocol=pickle.HIGHEST_PROTOCOL)
+    return buf.getvalue()
+
+
+def _decode(data: bytes) -> Any:
+    tag, body = data[:1], memoryview(data)[1:]
+    if tag == _FRAME:
+        return pa.ipc.open_file(pa.py_buffer(body)).read_all().to_pandas()
+    if tag == _BITS:
+        n = int.from_bytes(body[:8], "little")
+        packed = np.frombuffer(body[8:], dtype=np.uint8)
+        return np.unpackbits(packed, count=n, bitorder="little").astype(bool)
+    if tag == _ARRAY:
+        return np.load(io.BytesIO(body), allow_pickle=False)
+    if tag == _PICKLE:
+        return pickle.loads(body)
+    raise ValueError(f"unknown cache entry tag: {tag!r}")
+
+
+class DiskCache:
+    """Persistent key/value cache of computed results in one directory.
+
+    Keys are hashed (SHA-256 of their ``repr``) into file names. Entries are
+    written to a temporary file and renamed into place, so readers in other
+    threads or processes never see a partial entry. Reads refresh the file's
+    mtime; once the directory grows past ``max_bytes`` the least recently used
+    entries are deleted. Unreadable entries count as misses and are removed.
+    The directory should be private to the app: non-array values are pickled.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: Hashable) -> str:
+        name = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, name + _SUFFIX)
+
+    def _entries(self) -> list[tuple[str, int, int]]:
+        """Return (path, size, mtime_ns) for every entry currently on disk."""
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        return entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the stored value (marking it recently used) or default."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            value = _decode(data)
+        except FileNotFoundError:
+            return self._miss(default)
+        except Exception:
+            self._discard(path)  # truncated or from an incompatible version
+            return self._miss(default)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def _miss(self, default: Any) -> Any:
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value atomically, then evict old entries if over the size cap."""
+        data = _encode(value)
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            self._discard(tmp)
+            raise
+        with self._lock:
+            self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the stored value, computing and storing it on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            try:
+                self.put(key, value)
+            except (OSError, TypeError, ValueError, pickle.PicklingError, pa.ArrowException):
+                pass  # caching is best effort; the computed value is still returned
+        return value
+
+    def _evict(self) -> None:
+        # Rescan: other processes write to the same directory.
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if self._discard(path):
+                self.evictions += 1
+            total -= size
+        self._bytes = total
+
+    @staticmethod
+    def _discard(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self) -> None:
+        """Delete every entry (counters are kept)."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._discard(path)
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return entry count, bytes on disk and hit/miss/eviction counters."""
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -1,5 +1,9 @@
 """Utility helpers for formatting and display."""
 
+import colorsys
+
+from ..constants import BRAND_PALETTE
+
 
 def format_number(num: int | float) -> str:
     """Format large numbers with K/M/B/T suffix."""
@@ -12,3 +16,18 @@ def format_number(num: int | float) -> str:
     if num >= 1e3:
         return f"{num / 1e3:.2f}K"
     return f"{num:.2f}"
+
+
+def brand_palette(n: int) -> list[str]:
+    """Return n distinct brand colors: BRAND_PALETTE, then golden-angle hues past its end."""
+    colors = BRAND_PALETTE[:n]
+    step = 0
+    while len(colors) < n:
+        hue = (0.1 + step * 0.618033988749895) % 1.0
+        lightness = (0.4, 0.55, 0.3)[step // 12 % 3]
+        r, g, b = colorsys.hls_to_rgb(hue, lightness, 0.75)
+        color = f"#{round(r * 255):02x}{round(g * 255):02x}{round(b * 255):02x}"
+        if color not in colors:
+            colors.append(color)
+        step += 1
+    return colors
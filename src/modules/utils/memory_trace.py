@@ -0,0 +1,167 @@
+"""Opt-in tracemalloc instrumentation for handler methods and display calls.
+
+tracemalloc is process-wide: its peak is reset per step and tracing is
+stopped afterwards, so one session's run would corrupt another's report.
+Tracing is therefore exclusive: while one tracer is active, tracers created
+by other sessions are disabled (``busy``).
+"""
+
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Iterator
+
+import pandas as pd
+
+_OWNER_LOCK = threading.Lock()
+_owner: "MemoryTracer | None" = None
+
+
+class MemoryTracer:
+    """Record peak and retained allocation bytes per named step.
+
+    Steps may nest (a display call invoking handler methods); each step reports
+    its own peak, and the peak is propagated to the enclosing step. Only one
+    tracer in the process is enabled at a time, from creation to ``finish``.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        global _owner
+        self.busy = False
+        if enabled:
+            with _OWNER_LOCK:
+                if _owner is None:
+                    _owner = self
+                else:
+                    enabled, self.busy = False, True
+        self.enabled = enabled
+        self.steps: list[dict[str, Any]] = []
+        self.columns: list[dict[str, Any]] = []
+        self._stack: list[dict[str, int]] = []
+        self._started_tracing = False
+
+    @contextmanager
+    def _trace(self, name: str) -> Iterator[None]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"base": current, "peak": current}
+        self._stack.append(frame)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            current, peak = tracemalloc.get_traced_memory()
+            self._stack.pop()
+            frame["peak"] = max(frame["peak"], peak)
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], frame["peak"])
+            self.steps.append(
+                {
+                    "step": name,
+                    "depth": len(self._stack),
+                    "peak_bytes": frame["peak"] - frame["base"],
+                    "retained_bytes": current - frame["base"],
+                    "seconds": round(elapsed, 4),
+                }
+            )
+
+    def step(self, name: str):
+        """Context manager tracing one named step (no-op when disabled)."""
+        return self._trace(name) if self.enabled else nullcontext()
+
+    def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call func inside a step named after it."""
+        with self.step(getattr(func, "__name__", repr(func))):
+            return func(*args, **kwargs)
+
+    def instrument(self, handler: Any) -> Any:
+        """Return a proxy of handler whose public method calls are traced as steps."""
+        if not self.enabled:
+            return handler
+        return _TracedProxy(handler, self)
+
+    def record_dataframe(self, df: pd.DataFrame | None) -> None:
+        """Store deep memory usage per column of the loaded dataframe."""
+        if not self.enabled or df is None:
+            return
+        usage = df.memory_usage(deep=True, index=True)
+        self.columns = [
+            {
+                "column": str(col),
+                "dtype": str(df[col].dtype) if col in df.columns else "",
+                "bytes": int(b),
+            }
+            for col, b in usage.sort_values(ascending=False).items()
+        ]
+
+    def finish(self) -> None:
+        """Stop tracemalloc if this tracer started it and let another tracer take over.
+
+        The tracer is disabled from then on, so calls through its proxies after
+        the run (e.g. a download callback) are not traced.
+        """
+        global _owner
+        self.enabled = False
+        with _OWNER_LOCK:
+            if self._started_tracing and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            self._started_tracing = False
+            if _owner is self:
+                _owner = None
+
+    def steps_dataframe(self) -> pd.DataFrame:
+        """Return recorded steps as a DataFrame (in completion order)."""
+        return pd.DataFrame(
+            self.steps,
+            columns=["step", "depth", "peak_bytes", "retained_bytes", "seconds"],
+        )
+
+    def columns_dataframe(self) -> pd.DataFrame:
+        """Return per-column deep memory usage as a DataFrame."""
+        return pd.DataFrame(self.columns, columns=["column", "dtype", "bytes"])
+
+    def to_json(self) -> str:
+        """Serialize the report (steps and column usage) as JSON."""
+        return json.dumps(
+            {
+                "steps": self.steps,
+                "columns": self.columns,
+                "dataframe_bytes": sum(c["bytes"] for c in self.columns),
+            },
+            indent=2,
+        )
+
+
+class _TracedProxy:
+    """Delegate attribute access to a wrapped object, tracing public method calls."""
+
+    def __init__(self, target: Any, tracer: MemoryTracer) -> None:
+        self._target = target
+        self._tracer = tracer
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        prefix = f"{type(self._target).__name__}.{name}"
+
+        @functools.wraps(attr)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self._tracer.step(f"{prefix}({_short_args(args, kwargs)})"):
+                return attr(*args, **kwargs)
+
+        return wrapper
+
+
+def _short_args(args: tuple[Any, ...], kwargs: dict[str, Any], limit: int = 60) -> str:
+    text = ", ".join([repr(a) for a in args] + [f"{k}={v!r}" for k, v in kwargs.items()])
+    return text if len(text) <= limit else text[: limit - 3] + "..."
@@ -0,0 +1,96 @@
+"""Mergeable streaming quantile sketch (KLL) for Reach/AVE distributions."""
+
+import numpy as np
+
+
+class KLLSketch:
+    """KLL quantile sketch: bounded-size summary with mergeable, incremental updates.
+
+    Values are kept in compactors; level h holds items of weight 2**h. When a
+    level overflows, its items are sorted and every other one (random offset)
+    is promoted, so only the small compactor buffers are ever sorted. Count,
+    min and max are exact; quantiles have rank error of roughly 1/k.
+    """
+
+    def __init__(self, k: int = 256, seed: int | None = 0) -> None:
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels: list[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self) -> None:
+        while True:
+            over = [
+                h for h in range(len(self.levels)) if len(self.levels[h]) > self._capacity(h)
+            ]
+            if not over:
+                return
+            h = over[0]
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(self.levels[h])
+            odd = items.size % 2
+            promoted = items[odd:][int(self._rng.integers(2)) :: 2]
+            self.levels[h] = items[:odd]
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def update(self, values: np.ndarray) -> "KLLSketch":
+        """Add a chunk of values (NaNs are ignored)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.count += int(values.size)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Fold another sketch (e.g. from another chunk or file) into this one."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _weighted(self) -> tuple[np.ndarray, np.ndarray]:
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(items), 2**h, dtype=np.float64) for h, items in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def quantile(self, q: float | list[float]) -> np.ndarray:
+        """Return approximate value(s) at quantile(s) q in [0, 1] (exact min/max at 0/1)."""
+        qs = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        if self.count == 0:
+            return np.full(qs.shape, np.nan)
+        values, cum = self._weighted()
+        idx = np.searchsorted(cum, qs * cum[-1], side="left").clip(0, len(values) - 1)
+        out = values[idx]
+        out[qs <= 0] = self.min
+        out[qs >= 1] = self.max
+        return out
+
+    def cdf(self, points: np.ndarray) -> np.ndarray:
+        """Return the approximate number of values <= each point."""
+        points = np.asarray(points, dtype=np.float64)
+        if self.count == 0:
+            return np.zeros(points.shape)
+        values, cum = self._weighted()
+        idx = np.searchsorted(values, points, side="right")
+        ranks = np.where(idx > 0, cum[np.maximum(idx - 1, 0)], 0.0)
+        return ranks * (self.count / cum[-1])
@@ -0,0 +1,131 @@
+"""Warm start: load the default dataset and warm chart code before serving traffic.
+
+``preload`` runs in the Streamlit server process before it starts listening.
+It keeps a fully built handler for the default workbook as a template, and the
+app forks it for each new session, so the first visitor after a deploy finds
+the same parsed data, indexes and cached results as later ones.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable
+
+import matplotlib.pyplot as plt
+
+from .chart_creator import ChartCreator
+from .constants import COLUMN_AVE, COLUMN_REACH, DEFAULT_DATA_PATH, DEFAULT_SHEET_NAME
+from .reader import Brand, DatasetFilter, ExcelFileHandler, get_brands, open_result_store
+
+_TEMPLATES: dict[tuple[str, str], tuple[float, ExcelFileHandler]] = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def preloaded_handler(
+    path: str, sheet_name: str = DEFAULT_SHEET_NAME, mtime: float | None = None
+) -> ExcelFileHandler | None:
+    """Return a fork of the preloaded handler for path, or None if there is no current one.
+
+    The template must have been loaded from the file version with the given
+    mtime (the file's current one if None, which costs a stat).
+    """
+    with _TEMPLATES_LOCK:
+        entry = _TEMPLATES.get((os.path.abspath(path), sheet_name))
+    if entry is None:
+        return None
+    loaded_mtime, template = entry
+    if mtime is None:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+    if mtime != loaded_mtime:
+        return None
+    return template.fork()
+
+
+def forget_preloaded(path: str, sheet_name: str = DEFAULT_SHEET_NAME) -> None:
+    """Drop the template for path; sessions already using a fork keep it."""
+    with _TEMPLATES_LOCK:
+        _TEMPLATES.pop((os.path.abspath(path), sheet_name), None)
+
+
+def _warm_queries(handler: ExcelFileHandler, brands: list[Brand]) -> None:
+    """Run the dataset queries of the unfiltered dashboard page once."""
+    if not brands:
+        return
+    keywords = [b.keyword for b in brands]
+    groups = [b.terms for b in brands]
+    handler.brand_summary(brands)
+    handler.brand_anomalies(brands)
+    handler.brand_cooccurrence(brands)
+    handler.share_of_voice(brands)
+    handler.media_type_breakdown(groups)
+    handler.distribution_stats(groups)
+    for column in (COLUMN_REACH, COLUMN_AVE):
+        handler.distribution_histogram(groups, column)
+    handler.reach_ave_density(groups)
+    handler.create_summary_dataframe(keywords)
+    handler.sentiment_overview(keywords)
+    handler.prominence_score_extra(groups[0], *groups[1:])
+    handler.prominence_score(groups[0], *groups[1:])
+    for brand in brands:
+        handler.get_top_publications(brand.keyword)
+        handler.get_top_authors(brand.keyword)
+        for by in ("articles", "lift"):
+            handler.top_terms(brand.keyword, *brand.aliases, by=by)
+
+
+def _warm_charts(handler: ExcelFileHandler, brands: list[Brand]) -> None:
+    """Build and serialize representative charts (Altair schema validation, Matplotlib fonts)."""
+    if not brands:
+        return
+    colors = [b.color for b in brands]
+    daily, _ = handler.brand_anomalies(brands)
+    ChartCreator.create_alerts_chart(daily, colors).to_dict()
+    trend = daily.loc[daily["Brand"] == brands[0].name, ["Date", "Count"]]
+    ChartCreator.create_daily_trendline_chart(trend, brands[0].color).to_dict()
+    ChartCreator.create_cooccurrence_heatmap(handler.brand_cooccurrence(brands)).to_dict()
+    values = handler.create_summary_dataframe([b.keyword for b in brands])["Value"].tolist()
+    fig = ChartCreator.create_side_by_side_pie_charts(
+        values[: len(brands)], values, [b.keyword for b in brands], colors
+    )
+    fig.canvas.draw()
+    plt.close(fig)
+
+
+def preload(
+    path: str = DEFAULT_DATA_PATH,
+    sheet_name: str = DEFAULT_SHEET_NAME,
+    shared_dir: str | None = None,
+    log: Callable[[str], Any] = print,
+    mtime: float | None = None,
+) -> dict[str, float]:
+    """Load path, build its indexes, run the default queries and warm the charts.
+
+    Each phase is logged with its duration; the durations (seconds) are returned.
+    The handler becomes the template for ``preloaded_handler``, recorded for the
+    file version with the given mtime (the file's current one if None). Story clusters
+    are left to the first Unique stories request, as in a normal session.
+    """
+    timings: dict[str, float] = {}
+
+    def phase(name: str, step: Callable[[], Any]) -> None:
+        start = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - start
+        log(f"preload: {name} took {timings[name]:.2f} s")
+
+    brands = get_brands()
+    if mtime is None:
+        mtime = os.path.getmtime(path)
+    handler = ExcelFileHandler(path, sheet_name, store=open_result_store(), shared_dir=shared_dir)
+    phase("parse workbook", handler.open_excel_file)
+    phase("build indexes", handler.build_indexes)
+    phase("build text and term indexes", handler.term_matrix)
+    view = handler.filtered(DatasetFilter())
+    phase("run default queries", lambda: _warm_queries(view, brands))
+    phase("warm charts", lambda: _warm_charts(view, brands))
+    with _TEMPLATES_LOCK:
+        _TEMPLATES[(os.path.abspath(path), sheet_name)] = (mtime, handler)
+    return timings
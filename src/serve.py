@@ -0,0 +1,124 @@
+"""Warm-start server: preload the default dataset and chart code, then serve the dashboard.
+
+The workbook at DEFAULT_DATA_PATH is parsed, indexed and queried, and the chart
+libraries are imported and exercised, in this process before Streamlit starts
+listening; each phase is logged with its duration. Until then the server's
+health endpoint (``/_stcore/health``) does not answer, so it doubles as the
+readiness probe. With ``--ready-file`` (or DASHBOARD_READY_FILE) a JSON status
+with the phase timings is also written there once the server answers, and
+removed on exit.
+
+    python run.py --preload [--ready-file /tmp/dashboard.ready] [streamlit options]
+"""
+
+import argparse
+import atexit
+import importlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+if _script_dir not in sys.path:
+    sys.path.insert(0, _script_dir)
+
+APP_PATH = os.path.join(_script_dir, "app.py")
+
+
+def log(message: str) -> None:
+    """Print a timestamped status line (stdout, unbuffered)."""
+    print(f"{time.strftime('%Y-%m-%d %H:%M:%S')} {message}", flush=True)
+
+
+def health_url() -> str:
+    """Return the local health endpoint of the configured Streamlit server."""
+    from streamlit import config
+
+    host = config.get_option("server.address") or "127.0.0.1"
+    port = config.get_option("server.port")
+    base = (config.get_option("server.baseUrlPath") or "").strip("/")
+    return f"http://{host}:{port}/{base + '/' if base else ''}_stcore/health"
+
+
+def write_ready_file(path: str, status: dict) -> None:
+    """Write status as JSON to path atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(status, f, indent=2)
+    os.replace(tmp, path)
+
+
+def signal_ready(
+    ready_file: str | None, timings: dict[str, float], timeout: float = 120.0
+) -> None:
+    """Wait until the server answers its health check, then log and write the ready file."""
+    from streamlit.runtime import Runtime
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not Runtime.exists():  # command-line options are applied by then
+            time.sleep(0.2)
+            continue
+        try:
+            with urllib.request.urlopen(health_url(), timeout=2) as response:
+                if response.status == 200:
+                    break
+        except OSError:
+            pass
+        time.sleep(0.2)
+    else:
+        log("server did not answer its health check; not marking ready")
+        return
+    log(f"ready: serving at {health_url().rsplit('_stcore', 1)[0]}")
+    if ready_file:
+        write_ready_file(
+            ready_file,
+            {"status": "ready", "pid": os.getpid(), "preload_s": timings, "at": time.time()},
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Preload, then hand the remaining arguments to ``streamlit run`` in this process."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--ready-file",
+        default=os.environ.get("DASHBOARD_READY_FILE") or None,
+        help="write a JSON readiness status here once the server answers",
+    )
+    args, streamlit_args = parser.parse_known_args(argv)
+    if args.ready_file:
+        if os.path.exists(args.ready_file):
+            os.remove(args.ready_file)
+        atexit.register(lambda: os.path.exists(args.ready_file) and os.remove(args.ready_file))
+
+    start = time.perf_counter()
+    from streamlit.web import cli
+
+    importlib.import_module("modules.display_components")  # Altair, Matplotlib, Streamlit
+    from modules.constants import DEFAULT_DATA_PATH, SHARED_DATASET_DIR
+    from modules.warm_start import preload
+
+    timings = {"import modules": time.perf_counter() - start}
+    log(f"preload: import modules took {timings['import modules']:.2f} s")
+    if os.path.isfile(DEFAULT_DATA_PATH):
+        try:
+            timings.update(preload(DEFAULT_DATA_PATH, shared_dir=SHARED_DATASET_DIR, log=log))
+        except Exception as e:  # serve anyway; sessions load the data themselves
+            log(f"preload failed: {e!s}")
+    else:
+        log(f"preload: default data file not found: {DEFAULT_DATA_PATH}")
+    log(f"preload: finished in {time.perf_counter() - start:.2f} s; starting server")
+
+    threading.Thread(
+        target=signal_ready, args=(args.ready_file, timings), daemon=True
+    ).start()
+    cli.main(["run", APP_PATH, *streamlit_args], prog_name="streamlit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""Shared fixtures: the sample workbook loaded once per test session."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src"))
+
+from modules.constants import DEFAULT_DATA_PATH, DEFAULT_SHEET_NAME  # noqa: E402
+from modules.reader import ExcelFileHandler  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def handler() -> ExcelFileHandler:
+    """Return a handler over the sample workbook with indexes and story clusters built."""
+    handler = ExcelFileHandler(DEFAULT_DATA_PATH, DEFAULT_SHEET_NAME)
+    handler.build_indexes()
+    handler.build_story_clusters()
+    return handler
@@ -0,0 +1,40 @@
+"""Dashboard downloads include the deferred text columns."""
+
+import io
+from contextlib import nullcontext
+from types import SimpleNamespace
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from modules import display_components
+from modules.constants import DEFERRED_TEXT_COLUMNS
+from modules.reader.filters import DatasetFilter
+
+
+def _downloads(monkeypatch, table, restore):
+    """Render the download menu and return {label: file bytes} of its buttons."""
+    buttons = {}
+    fake_st = SimpleNamespace(
+        popover=lambda label: nullcontext(),
+        download_button=lambda label, data, **kwargs: buttons.setdefault(label, data),
+    )
+    monkeypatch.setattr(display_components, "st", fake_st)
+    display_components.display_download_menu(table, "filtered articles", restore=restore)
+    return {label: data().read() for label, data in buttons.items()}
+
+
+def test_filtered_articles_download_restores_text(handler, monkeypatch):
+    view = handler.filtered(DatasetFilter(sentiments=("Negative",)))
+    assert not set(DEFERRED_TEXT_COLUMNS) & set(view.dataframe.columns)
+    files = _downloads(monkeypatch, view.dataframe, view.with_text)
+    expected = view.with_text()
+
+    csv = pd.read_csv(io.BytesIO(files["CSV"]))
+    parquet = pd.read_parquet(io.BytesIO(files["PARQUET"]))
+    header = next(load_workbook(io.BytesIO(files["XLSX"]), read_only=True).active.values)
+    for columns in (list(csv.columns), list(parquet.columns), list(header)):
+        assert columns == list(expected.columns)
+    for column in DEFERRED_TEXT_COLUMNS:
+        assert parquet[column].tolist() == expected[column].tolist()
+    assert len(csv) == len(parquet) == len(expected)
@@ -0,0 +1,24 @@
+"""Unique-story counting combined with the other dashboard filters."""
+
+import numpy as np
+
+from modules.reader.filters import DatasetFilter
+
+
+def test_unique_stories_within_source_filter(handler):
+    labels = handler.story_clusters.labels
+    for source in handler.full_dataframe["Source"].value_counts().index[:10]:
+        flt = DatasetFilter(sources=(source,))
+        stories = np.unique(labels[handler.filtered(flt)._positions])
+        view = handler.filtered(flt._replace(unique_stories=True))
+        # One row per story placed in this source, even when its first placement is elsewhere.
+        assert np.array_equal(np.sort(labels[view._positions]), stories)
+        assert view.cube.cells["count"].sum() == len(stories)
+        assert np.isclose(view.cube.cells["reach"].sum(), view.dataframe["Reach"].sum())
+
+
+def test_unique_stories_alone_keeps_first_placements(handler):
+    view = handler.filtered(DatasetFilter(unique_stories=True))
+    labels = handler.story_clusters.labels
+    assert np.array_equal(view._positions, np.unique(labels))
+    assert view.cube.cells["count"].sum() == len(view.dataframe)